@@ -7,6 +7,7 @@ from oslo.config import cfg
 from st2common import log as logging
 from st2common.models.db import db_setup
 from st2common.models.db import db_teardown
+from st2common.services import retention
 from st2common.constants.logging import DEFAULT_LOGGING_CONF_PATH
 from st2actions import config
 from st2actions import history
@@ -40,6 +41,9 @@ def _setup():
     db_setup(cfg.CONF.database.db_name, cfg.CONF.database.host, cfg.CONF.database.port,
              username=username, password=password)
 
+    # Purge expired executions, history and trigger instances.
+    retention.start_purger()
+
 
 def _teardown():
     db_teardown()
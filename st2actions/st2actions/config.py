@@ -81,13 +81,24 @@ CONF.register_opts(mistral_opts, group='mistral')
 
 history_opts = [
     cfg.StrOpt('logging', default='conf/logging.history.conf',
-               help='Location of the logging configuration file.')
+               help='Location of the logging configuration file.'),
+    cfg.IntOpt('batch_size', default=1,
+               help='Maximum number of executions recorded with a single bulk write. 1 '
+                    'records each execution as soon as it is received.'),
+    cfg.FloatOpt('batch_interval', default=1.0,
+                 help='Maximum number of seconds an execution waits for its batch to fill up.')
 ]
 CONF.register_opts(history_opts, group='history')
 
 resultstracker_opts = [
     cfg.StrOpt('logging', default='conf/logging.resultstracker.conf',
-               help='Location of the logging configuration file.')
+               help='Location of the logging configuration file.'),
+    cfg.BoolOpt('sharding', default=False,
+                help='Share the pending executions between multiple results trackers. Each '
+                     'tracker claims the executions it queries with a lease.'),
+    cfg.IntOpt('lease_ttl', default=60,
+               help='Seconds after which executions claimed by a tracker which stopped '
+                    'renewing its leases are claimed by the other trackers.')
 ]
 CONF.register_opts(resultstracker_opts, group='resultstracker')
 
@@ -25,8 +25,8 @@ from st2common.constants.action import (ACTIONEXEC_STATUS_SUCCEEDED,
 from st2common.models.db.action import ActionExecutionStateDB
 from st2common.persistence.action import ActionExecutionState
 from st2common.services import access
-from st2common.util.action_db import (get_action_by_ref, get_runnertype_by_name)
-from st2common.util.action_db import (update_actionexecution_status, get_actionexec_by_id)
+from st2common.services import metadata
+from st2common.util.action_db import update_actionexecution_status
 
 from st2actions.container import actionsensor
 from st2actions.container.service import RunnerContainerService
@@ -44,10 +44,10 @@ class RunnerContainer(object):
         self._pending = []
 
     def dispatch(self, actionexec_db):
-        action_db = get_action_by_ref(actionexec_db.action)
+        action_db = metadata.get_action_by_ref(actionexec_db.action)
         if not action_db:
             raise Exception('Action %s not found in dB.' % actionexec_db.action)
-        runnertype_db = get_runnertype_by_name(action_db.runner_type['name'])
+        runnertype_db = metadata.get_runnertype_by_name(action_db.runner_type['name'])
         runner_type = runnertype_db.name
 
         LOG.info('Dispatching Action to runner \n%s',
@@ -117,7 +117,7 @@ class RunnerContainer(object):
             result = {'message': str(ex), 'traceback': ''.join(traceback.format_tb(tb, 20))}
         finally:
             # Always clean-up the auth_token
-            updated_actionexec_db = self._update_action_execution_db(actionexec_db.id, status,
+            updated_actionexec_db = self._update_action_execution_db(actionexec_db, status,
                                                                      result)
             LOG.debug('Updated ActionExecution after run: %s', updated_actionexec_db)
             try:
@@ -131,9 +131,7 @@ class RunnerContainer(object):
 
         return updated_actionexec_db
 
-    def _update_action_execution_db(self, actionexec_id, status, result):
-        actionexec_db = get_actionexec_by_id(actionexec_id)
-
+    def _update_action_execution_db(self, actionexec_db, status, result):
         if status in DONE_STATES:
             end_timestamp = isotime.add_utc_tz(datetime.datetime.utcnow())
         else:
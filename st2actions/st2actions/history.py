@@ -35,20 +35,26 @@ from oslo.config import cfg
 
 from st2common.util import reference
 import st2common.util.action_db as action_utils
+from st2common.transport import action as action_transport
 from st2common.transport import actionexecution, publishers
+from st2common.transport import reactor as reactor_transport
 from st2common.util.greenpooldispatch import BufferedDispatcher
 from st2common.persistence.history import ActionExecutionHistory
-from st2common.persistence.action import RunnerType, ActionExecution
+from st2common.persistence.action import RunnerType
 from st2common.persistence.reactor import TriggerType, Trigger, TriggerInstance, Rule
 from st2common.models.api.action import RunnerTypeAPI, ActionAPI, ActionExecutionAPI
 from st2common.models.api.reactor import TriggerTypeAPI, TriggerAPI, TriggerInstanceAPI
 from st2common.models.api.rule import RuleAPI
-from st2common.models.db.history import ActionExecutionHistoryDB
+from st2common.util.cache import ExpiringCache
 from st2common import log as logging
 
 
 LOG = logging.getLogger(__name__)
 
+# Seconds for which the snapshots of actions, runners, rules and triggers are reused.
+SNAPSHOT_TTL = 10
+SNAPSHOT_CACHE_SIZE = 1000
+
 QUEUES = {
     'create': actionexecution.get_queue('st2.hist.exec.create', routing_key=publishers.CREATE_RK),
     'update': actionexecution.get_queue('st2.hist.exec.update', routing_key=publishers.UPDATE_RK)
@@ -57,24 +63,53 @@ QUEUES = {
 
 class Historian(ConsumerMixin):
 
-    def __init__(self, connection, timeout=60, wait=3):
-        self.wait = wait
-        self.timeout = timeout
+    def __init__(self, connection, batch_size=1, batch_interval=1):
         self.connection = connection
         self._dispatcher = BufferedDispatcher()
+        # API snapshots of the models referenced by executions.
+        self._snapshots = ExpiringCache(ttl=SNAPSHOT_TTL, max_size=SNAPSHOT_CACHE_SIZE)
+        # Executions waiting to be recorded with a single bulk write.
+        self._batch_size = batch_size
+        self._batch_interval = batch_interval
+        self._batch = []
+        self._batch_timer = None
 
     def shutdown(self):
+        self._flush()
         self._dispatcher.shutdown()
 
     def get_consumers(self, Consumer, channel):
         return [Consumer(queues=[QUEUES['create']], accept=['pickle'],
                          callbacks=[self.process_create]),
                 Consumer(queues=[QUEUES['update']], accept=['pickle'],
-                         callbacks=[self.process_update])]
+                         callbacks=[self.process_update]),
+                Consumer(queues=[action_transport.get_action_queue(
+                                 routing_key=publishers.ANY_RK, exclusive=True)],
+                         accept=['pickle'],
+                         callbacks=[self.process_action]),
+                Consumer(queues=[action_transport.get_runnertype_queue(
+                                 routing_key=publishers.ANY_RK, exclusive=True)],
+                         accept=['pickle'],
+                         callbacks=[self.process_runnertype]),
+                Consumer(queues=[reactor_transport.get_trigger_cud_queue(
+                                 name=None, routing_key=publishers.ANY_RK, exclusive=True)],
+                         accept=['pickle'],
+                         callbacks=[self.process_trigger]),
+                Consumer(queues=[reactor_transport.get_triggertype_cud_queue(
+                                 routing_key=publishers.ANY_RK, exclusive=True)],
+                         accept=['pickle'],
+                         callbacks=[self.process_triggertype]),
+                Consumer(queues=[reactor_transport.get_rule_cud_queue(
+                                 routing_key=publishers.ANY_RK, exclusive=True)],
+                         accept=['pickle'],
+                         callbacks=[self.process_rule])]
 
     def process_create(self, body, message):
         try:
-            self._dispatcher.dispatch(self.record_action_execution, body)
+            if self._batch_size > 1:
+                self._add_to_batch(body)
+            else:
+                self._dispatcher.dispatch(self.record_action_execution, body)
         finally:
             message.ack()
 
@@ -84,77 +119,150 @@ class Historian(ConsumerMixin):
         finally:
             message.ack()
 
+    def process_action(self, body, message):
+        self._invalidate_snapshots(message, ActionAPI, body.get_reference().ref)
+
+    def process_runnertype(self, body, message):
+        self._invalidate_snapshots(message, RunnerTypeAPI, body.name)
+
+    def process_trigger(self, body, message):
+        self._invalidate_snapshots(message, TriggerAPI, body.get_reference().ref)
+
+    def process_triggertype(self, body, message):
+        self._invalidate_snapshots(message, TriggerTypeAPI, body.get_reference().ref)
+
+    def process_rule(self, body, message):
+        # Executions reference rules either by id or by name.
+        self._invalidate_snapshots(message, RuleAPI, str(body.id), body.name)
+
     def record_action_execution(self, body):
         try:
-            execution = ActionExecution.get_by_id(str(body.id))
-            action_db = action_utils.get_action_by_ref(execution.action)
-            runner = RunnerType.get_by_name(action_db.runner_type['name'])
-
-            attrs = {
-                'action': vars(ActionAPI.from_model(action_db)),
-                'runner': vars(RunnerTypeAPI.from_model(runner)),
-                'execution': vars(ActionExecutionAPI.from_model(execution))
-            }
-
-            if 'rule' in execution.context:
-                rule = reference.get_model_from_ref(Rule, execution.context.get('rule', {}))
-                attrs['rule'] = vars(RuleAPI.from_model(rule))
-
-            if 'trigger_instance' in execution.context:
-                trigger_instance_id = execution.context.get('trigger_instance', {})
-                trigger_instance_id = trigger_instance_id.get('id', None)
-                trigger_instance = TriggerInstance.get_by_id(trigger_instance_id)
-                trigger = reference.get_model_by_resource_ref(db_api=Trigger,
-                                                              ref=trigger_instance.trigger)
-                trigger_type = reference.get_model_by_resource_ref(db_api=TriggerType,
-                                                                   ref=trigger.type)
-                trigger_instance = reference.get_model_from_ref(
-                    TriggerInstance, execution.context.get('trigger_instance', {}))
-                attrs['trigger_instance'] = vars(TriggerInstanceAPI.from_model(trigger_instance))
-                attrs['trigger'] = vars(TriggerAPI.from_model(trigger))
-                attrs['trigger_type'] = vars(TriggerTypeAPI.from_model(trigger_type))
-
-            parent = ActionExecutionHistory.get(execution__id=execution.context.get('parent', ''))
-            if parent:
-                attrs['parent'] = str(parent.id)
-
-            history = ActionExecutionHistoryDB(**attrs)
-            history = ActionExecutionHistory.add_or_update(history)
-
-            if parent:
-                if str(history.id) not in parent.children:
-                    parent.children.append(str(history.id))
-                    ActionExecutionHistory.add_or_update(parent)
+            execution = body
+            history = ActionExecutionHistory.record(vars(ActionExecutionAPI.from_model(execution)),
+                                                    self._get_attrs(execution))
+            self._link_parent(execution, history)
         except:
             LOG.exception('An unexpected error occurred while creating the '
                           'action execution history.')
             raise
 
-    def update_action_execution_history(self, body):
+    def record_action_executions(self, bodies):
         try:
-            count = self.timeout / self.wait
-            # Allow up to 1 minute for the post event to create the history record.
-            for i in range(count):
-                history = ActionExecutionHistory.get(execution__id=str(body.id))
+            records = []
+            for execution in bodies:
+                try:
+                    records.append((vars(ActionExecutionAPI.from_model(execution)),
+                                    self._get_attrs(execution)))
+                except:
+                    LOG.exception('Failed to build the history of execution %s.', execution.id)
+
+            histories = ActionExecutionHistory.record_many(records)
+
+            for execution in bodies:
+                history = histories.get(str(execution.id), None)
                 if history:
-                    execution = ActionExecution.get_by_id(str(body.id))
-                    history.execution = vars(ActionExecutionAPI.from_model(execution))
-                    history = ActionExecutionHistory.add_or_update(history)
-                    return
-                if i >= count:
-                    # If wait failed, create the history record regardless.
-                    self.record_action_execution(body)
-                    return
-                eventlet.sleep(self.wait)
+                    self._link_parent(execution, history)
+        except:
+            LOG.exception('An unexpected error occurred while creating the '
+                          'action execution histories.')
+            raise
+
+    def _get_attrs(self, execution):
+        """
+        Return the attributes of the record of an execution other than the execution itself.
+        """
+        action = self._get_snapshot(ActionAPI, execution.action,
+                                    lambda: action_utils.get_action_by_ref(execution.action))
+        # The runner type of the action API is the name of the runner.
+        runner_name = action['runner_type']
+
+        attrs = {
+            'action': action,
+            'runner': self._get_snapshot(RunnerTypeAPI, runner_name,
+                                         lambda: RunnerType.get_by_name(runner_name))
+        }
+
+        if 'rule' in execution.context:
+            rule_ref = execution.context.get('rule', {})
+            attrs['rule'] = self._get_snapshot(
+                RuleAPI, rule_ref.get('id', None) or rule_ref.get('name', None),
+                lambda: reference.get_model_from_ref(Rule, rule_ref))
+
+        if 'trigger_instance' in execution.context:
+            trigger_instance = reference.get_model_from_ref(
+                TriggerInstance, execution.context.get('trigger_instance', {}))
+            trigger = self._get_snapshot(
+                TriggerAPI, trigger_instance.trigger,
+                lambda: reference.get_model_by_resource_ref(db_api=Trigger,
+                                                            ref=trigger_instance.trigger))
+            trigger_type = self._get_snapshot(
+                TriggerTypeAPI, trigger['type'],
+                lambda: reference.get_model_by_resource_ref(db_api=TriggerType,
+                                                            ref=trigger['type']))
+            attrs['trigger_instance'] = vars(TriggerInstanceAPI.from_model(trigger_instance))
+            attrs['trigger'] = trigger
+            attrs['trigger_type'] = trigger_type
+
+        return attrs
+
+    def _link_parent(self, execution, history):
+        parent_execution_id = execution.context.get('parent', None)
+        if parent_execution_id:
+            # Creates the record of the parent if it wasn't recorded yet.
+            parent = ActionExecutionHistory.add_child(parent_execution_id, str(history.id))
+            if history.parent != str(parent.id):
+                ActionExecutionHistory.update(history, parent=str(parent.id))
+
+    def update_action_execution_history(self, body):
+        try:
+            # The record is created if the execution wasn't recorded yet.
+            ActionExecutionHistory.update_execution(vars(ActionExecutionAPI.from_model(body)))
         except:
             LOG.exception('An unexpected error occurred while updating the '
                           'action execution history.')
             raise
 
+    def _get_snapshot(self, api_cls, ref, get_model):
+        """
+        Return the API snapshot of a model, building it with get_model only if it isn't cached.
+        The snapshot is shared by the records, which escape their fields without modifying
+        them, so it must not be modified.
+        """
+        key = (api_cls.__name__, ref)
+        snapshot = self._snapshots.get(key)
+        if snapshot is None:
+            snapshot = self._snapshots.set(key, vars(api_cls.from_model(get_model())))
+        return snapshot
+
+    def _invalidate_snapshots(self, message, api_cls, *refs):
+        try:
+            for ref in refs:
+                self._snapshots.invalidate((api_cls.__name__, ref))
+        except:
+            LOG.exception('Failed to invalidate the %s snapshot.', api_cls.__name__)
+        finally:
+            message.ack()
+
+    def _add_to_batch(self, body):
+        self._batch.append(body)
+        if len(self._batch) >= self._batch_size:
+            self._flush()
+        elif not self._batch_timer:
+            self._batch_timer = eventlet.spawn_after(self._batch_interval, self._flush)
+
+    def _flush(self):
+        if self._batch_timer:
+            self._batch_timer.cancel()
+            self._batch_timer = None
+        if self._batch:
+            batch, self._batch = self._batch, []
+            self._dispatcher.dispatch(self.record_action_executions, batch)
+
 
 def work():
     with Connection(cfg.CONF.messaging.url) as conn:
-        worker = Historian(conn)
+        worker = Historian(conn, batch_size=cfg.CONF.history.batch_size,
+                           batch_interval=cfg.CONF.history.batch_interval)
         try:
             worker.run()
         except:
@@ -15,7 +15,8 @@
 
 import abc
 import eventlet
-import Queue
+import heapq
+import itertools
 import six
 import time
 
@@ -25,7 +26,7 @@ from st2common import log as logging
 from st2common.constants.action import (ACTIONEXEC_STATUS_FAILED,
                                         ACTIONEXEC_STATUS_SUCCEEDED)
 from st2common.persistence.action import (ActionExecution, ActionExecutionState)
-from st2common.util.action_db import (get_action_by_ref, get_runnertype_by_name)
+from st2common.services import metadata
 
 
 LOG = logging.getLogger(__name__)
@@ -35,13 +36,31 @@ DONE_STATES = [ACTIONEXEC_STATUS_FAILED, ACTIONEXEC_STATUS_SUCCEEDED]
 @six.add_metaclass(abc.ABCMeta)
 class Querier(object):
     def __init__(self, threads_pool_size=10, query_interval=1, empty_q_sleep_time=5,
-                 no_workers_sleep_time=1, container_service=None):
+                 no_workers_sleep_time=1, container_service=None, max_query_interval=10,
+                 query_backoff_factor=1.5):
+        """
+        :param query_interval: Seconds between the first queries for an execution.
+        :type query_interval: ``float``
+
+        :param max_query_interval: Upper bound of the seconds between queries for an execution.
+                                   The interval grows by query_backoff_factor after each query
+                                   so long running executions are queried less often.
+        :type max_query_interval: ``float``
+
+        :param query_backoff_factor: Factor the interval grows by after each query.
+        :type query_backoff_factor: ``float``
+        """
         self._query_threads_pool_size = threads_pool_size
-        self._query_contexts = Queue.Queue()
+        # Heap of (next query time, sequence, query context, queries so far).
+        self._query_contexts = []
+        self._query_sequence = itertools.count()
+        self._query_added = eventlet.event.Event()
         self._thread_pool = eventlet.GreenPool(self._query_threads_pool_size)
         self._empty_q_sleep_time = empty_q_sleep_time
         self._no_workers_sleep_time = no_workers_sleep_time
         self._query_interval = query_interval
+        self._max_query_interval = max(max_query_interval, query_interval)
+        self._query_backoff_factor = query_backoff_factor
         if not container_service:
             container_service = RunnerContainerService()
         self.container_service = container_service
@@ -50,35 +69,72 @@ class Querier(object):
     def start(self):
         self._started = True
         while True:
-            while self._query_contexts.empty():
-                eventlet.greenthread.sleep(self._empty_q_sleep_time)
             while self._thread_pool.free() <= 0:
                 eventlet.greenthread.sleep(self._no_workers_sleep_time)
             self._fire_queries()
+            self._wait_for_next_query()
 
     def add_queries(self, query_contexts=[]):
         LOG.debug('Adding queries to querier: %s' % query_contexts)
         for query_context in query_contexts:
-            self._query_contexts.put((time.time(), query_context))
+            self._schedule_query(query_context)
 
     def is_started(self):
         return self._started
 
+    def get_pending_count(self):
+        """
+        Return the number of queries scheduled, excluding the ones in progress.
+        """
+        return len(self._query_contexts)
+
+    def get_overdue_count(self):
+        """
+        Return the number of queries which are due but haven't started yet.
+        """
+        now = time.time()
+        return len([entry for entry in self._query_contexts if entry[0] <= now])
+
+    def _get_query_interval(self, queries):
+        interval = self._query_interval * (self._query_backoff_factor ** queries)
+        return min(interval, self._max_query_interval)
+
+    def _schedule_query(self, query_context, queries=0):
+        next_query_time = time.time() + self._get_query_interval(queries)
+        heapq.heappush(self._query_contexts,
+                       (next_query_time, next(self._query_sequence), query_context, queries))
+        # wake up the loop since this query might be due before the one it waits for.
+        if not self._query_added.ready():
+            self._query_added.send()
+
+    def _wait_for_next_query(self):
+        if self._query_contexts:
+            timeout = self._query_contexts[0][0] - time.time()
+            if timeout <= 0:
+                return
+        else:
+            timeout = self._empty_q_sleep_time
+
+        with eventlet.Timeout(timeout, False):
+            self._query_added.wait()
+        if self._query_added.ready():
+            self._query_added.reset()
+
     def _fire_queries(self):
-        if self._thread_pool.free() <= 0:
-            return
-        while not self._query_contexts.empty() and self._thread_pool.free() > 0:
-            (last_query_time, query_context) = self._query_contexts.get_nowait()
-            if time.time() - last_query_time < self._query_interval:
-                self._query_contexts.put((last_query_time, query_context))
-                continue
-            else:
-                self._thread_pool.spawn(self._query_and_save_results, query_context)
-
-    def _query_and_save_results(self, query_context):
+        now = time.time()
+        while self._query_contexts and self._thread_pool.free() > 0:
+            if self._query_contexts[0][0] > now:
+                return
+            (_, _, query_context, queries) = heapq.heappop(self._query_contexts)
+            self._thread_pool.spawn(self._query_and_save_results, query_context, queries)
+
+    def _query_and_save_results(self, query_context, queries=0):
         execution_id = query_context.execution_id
         actual_query_context = query_context.query_context
 
+        if not self._renew_lease(query_context):
+            return
+
         LOG.debug('Querying external service for results. Context: %s' % actual_query_context)
         try:
             (status, results) = self.query(execution_id, actual_query_context)
@@ -89,6 +145,11 @@ class Querier(object):
 
         done = (status in DONE_STATES)
 
+        # Another tracker might have taken over while querying, only one of them may save the
+        # results and invoke post run.
+        if not self._renew_lease(query_context):
+            return
+
         actionexec_db = ActionExecution.get_by_id(execution_id)
         if not actionexec_db:
             LOG.exception('Action execution %s no longer exists.' % execution_id)
@@ -98,7 +159,7 @@ class Querier(object):
         actionexec_db = self._update_action_results(actionexec_db, status, results)
 
         if done:
-            action_db = get_action_by_ref(actionexec_db.action)
+            action_db = metadata.get_action_by_ref(actionexec_db.action)
             if not action_db:
                 LOG.exception('Unable to invoke post run. Action %s '
                               'no longer exists.' % actionexec_db.action)
@@ -108,7 +169,29 @@ class Querier(object):
             self._delete_state_object(query_context)
             return
 
-        self._query_contexts.put((time.time(), query_context))
+        self._schedule_query(query_context, queries + 1)
+
+    def _renew_lease(self, query_context):
+        """
+        Return whether the state of the provided query is still claimed by the tracker which
+        added it, renewing the lease. Queries of states taken over by another tracker are
+        dropped.
+        """
+        if not query_context.claimed_by:
+            return True
+
+        try:
+            renewed = ActionExecutionState.renew_lease(query_context.id,
+                                                       query_context.claimed_by,
+                                                       query_context.lease_ttl)
+        except:
+            LOG.exception('Failed renewing the lease on state %s.', query_context.id)
+            renewed = False
+
+        if not renewed:
+            LOG.info('State %s is no longer claimed by tracker %s, dropping its query.',
+                     query_context.id, query_context.claimed_by)
+        return renewed
 
     def _update_action_results(self, actionexec_db, status, results):
         actionexec_db.result = results
@@ -121,7 +204,7 @@ class Querier(object):
                  actionexec_db.id, action_db.name, action_db.runner_type['name'])
 
         # Get an instance of the action runner.
-        runnertype_db = get_runnertype_by_name(action_db.runner_type['name'])
+        runnertype_db = metadata.get_runnertype_by_name(action_db.runner_type['name'])
         runner = get_runner(runnertype_db.runner_module)
 
         # Configure the action runner.
@@ -158,21 +241,32 @@ class Querier(object):
         pass
 
     def print_stats(self):
-        LOG.info('\t --- Name: %s, pending queuries: %d', self.__class__.__name__,
-                 self._query_contexts.qsize())
+        LOG.info('\t --- Name: %s, pending queuries: %d, overdue queries: %d',
+                 self.__class__.__name__, self.get_pending_count(), self.get_overdue_count())
 
 
 class QueryContext(object):
-    def __init__(self, obj_id, execution_id, query_context, query_module):
+    def __init__(self, obj_id, execution_id, query_context, query_module, claimed_by=None,
+                 lease_ttl=None):
+        """
+        :param claimed_by: Id of the results tracker which claimed the state. None unless the
+                           states are sharded across trackers.
+        :type claimed_by: ``str``
+
+        :param lease_ttl: Seconds the lease on the state is renewed for.
+        :type lease_ttl: ``int``
+        """
         self.id = obj_id
         self.execution_id = execution_id
         self.query_context = query_context
         self.query_module = query_module
+        self.claimed_by = claimed_by
+        self.lease_ttl = lease_ttl
 
     @classmethod
-    def from_model(cls, model):
+    def from_model(cls, model, claimed_by=None, lease_ttl=None):
         return QueryContext(str(model.id), str(model.execution_id), model.query_context,
-                            model.query_module)
+                            model.query_module, claimed_by=claimed_by, lease_ttl=lease_ttl)
 
     def __repr__(self):
         return ('<QueryContext id=%s,execution_id=%s,query_context=%s>' %
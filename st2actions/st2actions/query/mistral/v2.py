@@ -5,6 +5,7 @@ import requests
 
 from st2actions.query.base import Querier
 from st2common.util import jsonify
+from st2common.util.cache import ExpiringCache
 from st2common import log as logging
 from st2common.constants.action import (ACTIONEXEC_STATUS_SUCCEEDED, ACTIONEXEC_STATUS_FAILED,
                                         ACTIONEXEC_STATUS_RUNNING)
@@ -23,6 +24,15 @@ class MistralResultsQuerier(Querier):
         super(MistralResultsQuerier, self).__init__(*args, **kwargs)
         self._base_url = cfg.CONF.mistral.v2_base_url
 
+        # Reuse connections to mistral across queries.
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=self._query_threads_pool_size)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+
+        # Mistral execution id -> ((state, updated_at), tasks) as of the last tasks query.
+        self._tasks = ExpiringCache(max_size=10000)
+
     def query(self, execution_id, query_context):
         """
         Queries mistral for workflow results using v2 APIs.
@@ -42,7 +52,8 @@ class MistralResultsQuerier(Querier):
                             str(query_context))
 
         try:
-            status, output = self._get_workflow_result(exec_id)
+            execution = self._get_execution(exec_id)
+            status, output = self._get_workflow_result(exec_id, execution)
             if output and 'tasks' in output:
                 LOG.warn('Key conflict with tasks in the workflow output.')
         except:
@@ -51,7 +62,7 @@ class MistralResultsQuerier(Querier):
             raise
 
         result = output or {}
-        result['tasks'] = self._get_workflow_tasks(exec_id)
+        result['tasks'] = self._get_workflow_tasks(exec_id, execution)
 
         LOG.debug('Mistral query results: %s' % result)
 
@@ -63,7 +74,19 @@ class MistralResultsQuerier(Querier):
     def _get_execution_url(self, exec_id):
         return self._base_url + 'executions/' + exec_id
 
-    def _get_workflow_result(self, exec_id):
+    def _get_execution(self, exec_id):
+        """
+        Returns the mistral workflow execution.
+
+        :param exec_id: Mistral execution ID
+        :type exec_id: ``str``
+
+        :rtype: ``dict``
+        """
+        resp = self._session.get(self._get_execution_url(exec_id))
+        return resp.json()
+
+    def _get_workflow_result(self, exec_id, execution):
         """
         Returns the workflow status and output. Mistral workflow status will be converted
         to st2 action status.
@@ -71,12 +94,11 @@ class MistralResultsQuerier(Querier):
         :param exec_id: Mistral execution ID
         :type exec_id: ``str``
 
+        :param execution: Mistral execution.
+        :type execution: ``dict``
+
         :rtype: (``str``, ``dict``)
         """
-        url = self._get_execution_url(exec_id)
-        resp = requests.get(url)
-        execution = resp.json()
-
         workflow_state = execution.get('state', None)
 
         if not workflow_state:
@@ -88,17 +110,26 @@ class MistralResultsQuerier(Querier):
 
         return (ACTIONEXEC_STATUS_RUNNING, None)
 
-    def _get_workflow_tasks(self, exec_id):
+    def _get_workflow_tasks(self, exec_id, execution):
         """
-        Returns the list of tasks for a workflow execution.
+        Returns the list of tasks for a workflow execution. Tasks are only retrieved again
+        when the execution changed since the last query.
 
         :param exec_id: Mistral execution ID
         :type exec_id: ``str``
 
+        :param execution: Mistral execution.
+        :type execution: ``dict``
+
         :rtype: ``list``
         """
+        version = (execution.get('state', None), execution.get('updated_at', None))
+        cached = self._tasks.get(exec_id)
+        if cached and cached[0] == version:
+            return cached[1]
+
         url = self._get_execution_tasks_url(exec_id)
-        resp = requests.get(url)
+        resp = self._session.get(url)
         result = resp.json()
         tasks = result.get('tasks', [])
 
@@ -106,6 +137,12 @@ class MistralResultsQuerier(Querier):
             for attr in ['result', 'input', 'output']:
                 task[attr] = jsonify.try_loads(task.get(attr, None))
 
+        if version[0] in DONE_STATES:
+            # No more queries for this execution.
+            self._tasks.invalidate(exec_id)
+        else:
+            self._tasks.set(exec_id, (version, tasks))
+
         return tasks
 
 
@@ -13,10 +13,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from collections import defaultdict
-
 import eventlet
 import importlib
+import os
+import socket
+
 from kombu import Connection
 from kombu.mixins import ConsumerMixin
 from oslo.config import cfg
@@ -69,22 +70,40 @@ class ActionStateQueueConsumer(ConsumerMixin):
             LOG.exception('Add query_context failed. Message body : %s', body)
 
     def _add_to_querier(self, body):
+        if not self._tracker.claim(body):
+            LOG.debug('State %s is claimed by another tracker.', body.id)
+            return
         querier = self._tracker.get_querier(body.query_module)
-        context = QueryContext.from_model(body)
+        context = self._tracker.get_query_context(body)
         querier.add_queries(query_contexts=[context])
         return
 
 
 class ResultsTracker(object):
-    def __init__(self, q_connection=None):
+    def __init__(self, q_connection=None, sharding=False, lease_ttl=60, tracker_id=None):
+        """
+        :param sharding: Share the pending states with other trackers. States are only
+                         tracked once claimed and states of trackers which stop renewing their
+                         leases are claimed by the remaining trackers.
+        :type sharding: ``bool``
+
+        :param lease_ttl: Seconds for which claims are valid unless renewed.
+        :type lease_ttl: ``int``
+        """
         self._queue_consumer = ActionStateQueueConsumer(q_connection, self)
         self._consumer_thread = None
+        self._lease_thread = None
         self._queriers = {}
         self._query_threads = []
         self._failed_imports = set()
+        self._sharding = sharding
+        self._lease_ttl = lease_ttl
+        self._tracker_id = tracker_id or '%s-%s' % (socket.gethostname(), os.getpid())
 
     def start(self):
         self._bootstrap()
+        if self._sharding:
+            self._lease_thread = eventlet.spawn(self._maintain_leases)
         self._consumer_thread = eventlet.spawn(self._queue_consumer.run)
         self._consumer_thread.wait()
         for thread in self._query_threads():
@@ -94,6 +113,33 @@ class ResultsTracker(object):
         LOG.info('Tracker shutting down. Stats from queriers:')
         self._print_stats()
         self._queue_consumer.shutdown()
+        if self._sharding:
+            if self._lease_thread:
+                self._lease_thread.kill()
+            # Let the other trackers take over right away.
+            ActionExecutionState.release(self._tracker_id)
+
+    def claim(self, state_db):
+        """
+        Claim a state for this tracker. Without sharding all the states belong to this tracker.
+
+        :rtype: ``bool``
+        """
+        if not self._sharding:
+            return True
+        return ActionExecutionState.claim(state_db, self._tracker_id, self._lease_ttl)
+
+    def get_query_context(self, state_db):
+        """
+        Return the query context of a state. With sharding the queriers check that the state is
+        still claimed by this tracker before querying and invoking post run.
+
+        :rtype: :class:`QueryContext`
+        """
+        if not self._sharding:
+            return QueryContext.from_model(state_db)
+        return QueryContext.from_model(state_db, claimed_by=self._tracker_id,
+                                       lease_ttl=self._lease_ttl)
 
     def _print_stats(self):
         for name, querier in six.iteritems(self._queriers):
@@ -101,25 +147,47 @@ class ResultsTracker(object):
                 querier.print_stats()
 
     def _bootstrap(self):
-        all_states = ActionExecutionState.get_all()
-        LOG.info('Found %d pending states in db.' % len(all_states))
+        # Claiming the states takes a while so the cursor must not time out.
+        if self._sharding:
+            states = ActionExecutionState.query_claimable(stream=True)
+        else:
+            states = ActionExecutionState.stream(no_cursor_timeout=True)
+        count = self._add_states(states)
+        LOG.info('Found %d pending states in db.', count)
+
+    def _maintain_leases(self):
+        while True:
+            eventlet.sleep(self._lease_ttl / 3.0)
+            try:
+                ActionExecutionState.renew_leases(self._tracker_id, self._lease_ttl)
+                # Take over the states of trackers which went away.
+                count = self._add_states(ActionExecutionState.query_claimable(stream=True))
+                if count:
+                    LOG.info('Claimed %d pending states from other trackers.', count)
+            except:
+                LOG.exception('Failed to maintain leases of tracker %s.', self._tracker_id)
+
+    def _add_states(self, states):
+        """
+        Claim the provided states and add them to their queriers.
 
-        query_contexts_dict = defaultdict(list)
-        for state_db in all_states:
+        :rtype: ``int``
+        """
+        count = 0
+        for state_db in states:
             try:
-                context = QueryContext.from_model(state_db)
+                context = self.get_query_context(state_db)
             except:
                 LOG.exception('Invalid state object: %s', state_db)
                 continue
-            query_module_name = state_db.query_module
-            querier = self.get_querier(query_module_name)
 
-            if querier is not None:
-                query_contexts_dict[querier].append(context)
+            querier = self.get_querier(state_db.query_module)
+            if querier is None or not self.claim(state_db):
+                continue
 
-        for querier, contexts in six.iteritems(query_contexts_dict):
-            LOG.info('Found %d pending actions for query module %s', len(contexts), querier)
-            querier.add_queries(query_contexts=contexts)
+            querier.add_queries(query_contexts=[context])
+            count += 1
+        return count
 
     def get_querier(self, query_module_name):
         if (query_module_name not in self._queriers and
@@ -143,5 +211,6 @@ class ResultsTracker(object):
 
 def get_tracker():
     with Connection(cfg.CONF.messaging.url) as conn:
-        tracker = ResultsTracker(q_connection=conn)
+        tracker = ResultsTracker(q_connection=conn, sharding=cfg.CONF.resultstracker.sharding,
+                                 lease_ttl=cfg.CONF.resultstracker.lease_ttl)
         return tracker
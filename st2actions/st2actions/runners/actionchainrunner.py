@@ -17,6 +17,7 @@ import ast
 import eventlet
 import jinja2
 import json
+import os
 import six
 import traceback
 import uuid
@@ -30,38 +31,65 @@ from st2common.exceptions import actionrunner as runnerexceptions
 from st2common.models.db.action import ActionExecutionDB
 from st2common.models.system import actionchain
 from st2common.services import action as action_service
+from st2common.services import completion
+from st2common.services import metadata
 from st2common.services.keyvalues import KeyValueLookup
-from st2common.util import action_db as action_db_util
+from st2common.util.cache import ExpiringCache
 
 
 LOG = logging.getLogger(__name__)
 RESULTS_KEY = '__results'
 
 
-def render_values(values, context):
-    env = jinja2.Environment(undefined=jinja2.StrictUndefined)
-    rendered_values = {}
-    for k, v in six.iteritems(values):
-        # jinja2 works with string so transform list and dict to strings.
-        reverse_json_dumps = False
-        if isinstance(v, dict) or isinstance(v, list):
-            v = json.dumps(v)
-            reverse_json_dumps = True
-        else:
-            v = str(v)
-        rendered_v = env.from_string(v).render(context)
-        # no change therefore no templatization so pick params from original to retain
-        # original type
-        if rendered_v == v:
-            rendered_values[k] = values[k]
-            continue
-        if reverse_json_dumps:
-            rendered_v = json.loads(rendered_v)
-        rendered_values[k] = rendered_v
-    return rendered_values
+# Templates don't carry any state between renders so they are shared.
+JINJA_ENV = jinja2.Environment(undefined=jinja2.StrictUndefined)
+
+# Compiled chains keyed by (entry point, mtime, size) so a modified chain is reloaded.
+CHAINS = ExpiringCache(max_size=100)
+
+# Action ref -> (parameters schema, {param name: (type, cast)}) for the parameters to cast.
+PARAM_CASTS = ExpiringCache(max_size=1000)
+
+
+class TemplatedValues(object):
+    """
+    Values of a dict compiled into jinja templates once and rendered many times. Values which
+    are not templated are rendered as is and therefore retain their original type.
+    """
+
+    def __init__(self, values):
+        self._values = values or {}
+        self._templates = {}
+        for k, v in six.iteritems(self._values):
+            # jinja2 works with string so transform list and dict to strings.
+            reverse_json_dumps = False
+            if isinstance(v, dict) or isinstance(v, list):
+                v = json.dumps(v)
+                reverse_json_dumps = True
+            else:
+                v = str(v)
+            self._templates[k] = (v, reverse_json_dumps, JINJA_ENV.from_string(v))
+
+    def render(self, context):
+        rendered_values = {}
+        for k, (v, reverse_json_dumps, template) in six.iteritems(self._templates):
+            rendered_v = template.render(context)
+            # no change therefore no templatization so pick params from original to retain
+            # original type
+            if rendered_v == v:
+                rendered_values[k] = self._values[k]
+                continue
+            if reverse_json_dumps:
+                rendered_v = json.loads(rendered_v)
+            rendered_values[k] = rendered_v
+        return rendered_values
 
 
 class ChainHolder(object):
+    """
+    Compiled action chain. Instances are cached and shared by all the executions of a chain
+    so they must not be modified once created.
+    """
 
     def __init__(self, chainspec, chainname):
         self.actionchain = actionchain.ActionChain(**chainspec)
@@ -72,8 +100,15 @@ class ChainHolder(object):
         LOG.debug('Using %s as default for %s.', self.actionchain.default, self.chainname)
         if not self.actionchain.default:
             raise Exception('Failed to find default node in %s.' % (self.chainname))
-        # finalize the vars and save them around to be used at execution time.
-        self.vars = self._get_rendered_vars(self.actionchain.vars) if self.actionchain.vars else {}
+        self._nodes = dict([(node.name, node) for node in self.actionchain.chain])
+        # pre-compile all the templates of the chain.
+        self._vars = TemplatedValues(self.actionchain.vars)
+        self._params = {}
+        self._publish = {}
+        for node in self.actionchain.chain:
+            for action_node in (node.parallel or [node]):
+                self._params[action_node.name] = TemplatedValues(action_node.params)
+                self._publish[action_node.name] = TemplatedValues(action_node.publish)
 
     @staticmethod
     def _get_default(_actionchain):
@@ -98,18 +133,24 @@ class ChainHolder(object):
         # If no node is found assume the first node in the chain list to be default.
         return _actionchain.chain[0].name
 
-    @staticmethod
-    def _get_rendered_vars(vars):
-        if not vars:
+    def get_rendered_vars(self):
+        """
+        Render the vars of the chain. Vars are rendered for each execution since they can
+        refer to the datastore.
+        """
+        if not self.actionchain.vars:
             return {}
         context = {SYSTEM_KV_PREFIX: KeyValueLookup()}
-        return render_values(vars, context)
+        return self._vars.render(context)
+
+    def get_params(self, action_node):
+        return self._params[action_node.name]
+
+    def get_publish(self, action_node):
+        return self._publish[action_node.name]
 
     def get_node(self, node_name=None):
-        for node in self.actionchain.chain:
-            if node.name == node_name:
-                return node
-        return None
+        return self._nodes.get(node_name, None)
 
     def get_next_node(self, curr_node_name=None, condition='on-success'):
         if not curr_node_name:
@@ -127,49 +168,47 @@ class ActionChainRunner(ActionRunner):
     def __init__(self, runner_id):
         super(ActionChainRunner, self).__init__(runner_id=runner_id)
         self.chain_holder = None
+        self.chain_vars = None
         self._meta_loader = MetaLoader()
 
     def pre_run(self):
         chainspec_file = self.entry_point
-        LOG.debug('Reading action chain from %s for action %s.', chainspec_file,
-                  self.action)
         try:
-            chainspec = self._meta_loader.load(chainspec_file)
-            self.chain_holder = ChainHolder(chainspec, self.action_name)
+            self.chain_holder = self._get_chain_holder(chainspec_file)
+            # finalize the vars and save them around to be used at execution time.
+            self.chain_vars = self.chain_holder.get_rendered_vars()
         except Exception as e:
             LOG.exception('Failed to instantiate ActionChain.')
             raise runnerexceptions.ActionRunnerPreRunError(e.message)
 
+    def _get_chain_holder(self, chainspec_file):
+        stat = os.stat(chainspec_file)
+        key = (chainspec_file, stat.st_mtime, stat.st_size)
+        chain_holder = CHAINS.get(key)
+        if not chain_holder:
+            LOG.debug('Reading action chain from %s for action %s.', chainspec_file,
+                      self.action)
+            chainspec = self._meta_loader.load(chainspec_file)
+            chain_holder = CHAINS.set(key, ChainHolder(chainspec, self.action_name))
+        return chain_holder
+
     def run(self, action_parameters):
         action_node = self.chain_holder.get_next_node()
         results = {}
         fail = True
         while action_node:
-            actionexec = None
-            fail = False
-            try:
-                resolved_params = ActionChainRunner._resolve_params(action_node, action_parameters,
-                                                                    results, self.chain_holder.vars)
-                actionexec = ActionChainRunner._run_action(action_node.ref,
-                                                           self.action_execution_id,
-                                                           resolved_params)
-            except:
-                LOG.exception('Failure in running action %s.', action_node.name)
-                # Save the traceback and error message.
-                results[action_node.name] = {'error': traceback.format_exc(10)}
+            if action_node.parallel:
+                succeeded = self._run_parallel_node(action_node, action_parameters, results)
             else:
+                succeeded, result, published_vars = self._run_node(
+                    action_node, action_parameters, results, self.chain_vars)
                 # Append full result under the node_name
-                results[action_node.name] = actionexec.result
-                rendered_publish_vars = ActionChainRunner._render_publish_vars(
-                    action_node, actionexec.result, results, self.chain_holder.vars)
-                if rendered_publish_vars:
-                    self.chain_holder.vars.update(rendered_publish_vars)
-            finally:
-                if not actionexec or actionexec.status == ACTIONEXEC_STATUS_FAILED:
-                    fail = True
-                    action_node = self.chain_holder.get_next_node(action_node.name, 'on-failure')
-                elif actionexec.status == ACTIONEXEC_STATUS_SUCCEEDED:
-                    action_node = self.chain_holder.get_next_node(action_node.name, 'on-success')
+                results[action_node.name] = result
+                self.chain_vars.update(published_vars)
+
+            fail = not succeeded
+            condition = 'on-success' if succeeded else 'on-failure'
+            action_node = self.chain_holder.get_next_node(action_node.name, condition)
 
         status = None
         if fail:
@@ -178,8 +217,60 @@ class ActionChainRunner(ActionRunner):
             status = ACTIONEXEC_STATUS_SUCCEEDED
         return (status, results)
 
+    def _run_node(self, action_node, action_parameters, results, chain_vars):
+        """
+        Run the action of a node. Neither results nor chain_vars are modified.
+
+        :return: (succeeded, result, published_vars)
+        :rtype: ``tuple``
+        """
+        try:
+            resolved_params = ActionChainRunner._resolve_params(
+                self.chain_holder.get_params(action_node), action_parameters, results,
+                chain_vars)
+            actionexec = ActionChainRunner._run_action(action_node.ref,
+                                                       self.action_execution_id,
+                                                       resolved_params)
+        except:
+            LOG.exception('Failure in running action %s.', action_node.name)
+            # Save the traceback and error message.
+            return (False, {'error': traceback.format_exc(10)}, {})
+
+        published_vars = ActionChainRunner._render_publish_vars(
+            action_node, self.chain_holder.get_publish(action_node), actionexec.result, results,
+            chain_vars)
+        return (actionexec.status == ACTIONEXEC_STATUS_SUCCEEDED, actionexec.result,
+                published_vars)
+
+    def _run_parallel_node(self, action_node, action_parameters, results):
+        """
+        Run the branches of a parallel node, at most action_node.concurrency at a time. Results
+        of the branches are available under their own name as well as under the name of the
+        parallel node.
+
+        :return: True if all the branches succeeded.
+        :rtype: ``bool``
+        """
+        branches = action_node.parallel
+        pool = eventlet.GreenPool(action_node.concurrency or len(branches))
+        # All the branches see the chain as it was when the parallel node was reached.
+        chain_vars = dict(self.chain_vars)
+        branch_outcomes = list(pool.imap(
+            lambda branch: self._run_node(branch, action_parameters, results, chain_vars),
+            branches))
+
+        succeeded = True
+        branch_results = {}
+        for branch, (branch_succeeded, result, published_vars) in zip(branches, branch_outcomes):
+            succeeded = succeeded and branch_succeeded
+            branch_results[branch.name] = result
+            results[branch.name] = result
+            self.chain_vars.update(published_vars)
+        results[action_node.name] = branch_results
+        return succeeded
+
     @staticmethod
-    def _render_publish_vars(action_node, execution_result, previous_execution_results,
+    def _render_publish_vars(action_node, publish, execution_result, previous_execution_results,
                              chain_vars):
         """
         If no output is specified on the action_node the output is the entire execution_result.
@@ -196,11 +287,11 @@ class ActionChainRunner(ActionRunner):
         context.update(chain_vars)
         context.update({RESULTS_KEY: previous_execution_results})
         context.update({SYSTEM_KV_PREFIX: KeyValueLookup()})
-        rendered_result = render_values(action_node.publish, context)
+        rendered_result = publish.render(context)
         return rendered_result
 
     @staticmethod
-    def _resolve_params(action_node, original_parameters, results, chain_vars):
+    def _resolve_params(params, original_parameters, results, chain_vars):
         # setup context with original parameters and the intermediate results.
         context = {}
         context.update(original_parameters)
@@ -208,7 +299,7 @@ class ActionChainRunner(ActionRunner):
         context.update(chain_vars)
         context.update({RESULTS_KEY: results})
         context.update({SYSTEM_KV_PREFIX: KeyValueLookup()})
-        rendered_params = render_values(action_node.params, context)
+        rendered_params = params.render(context)
         LOG.debug('Rendered params: %s: Type: %s', rendered_params, type(rendered_params))
         return rendered_params
 
@@ -218,60 +309,71 @@ class ActionChainRunner(ActionRunner):
         execution.parameters = ActionChainRunner._cast_params(action_ref, params)
         execution.context = {'parent': str(parent_execution_id)}
         execution = action_service.schedule(execution)
-        while (wait_for_completion and
-               execution.status != ACTIONEXEC_STATUS_SUCCEEDED and
-               execution.status != ACTIONEXEC_STATUS_FAILED):
-            eventlet.sleep(1)
-            execution = action_db_util.get_actionexec_by_id(execution.id)
+        if wait_for_completion:
+            execution = completion.wait_for_completion(execution)
         return execution
 
     @staticmethod
     def _cast_params(action_ref, params):
-        def cast_object(x):
-            if isinstance(x, str) or isinstance(x, unicode):
-                try:
-                    return json.loads(x)
-                except:
-                    return ast.literal_eval(x)
-            else:
-                return x
-
-        casts = {
-            'array': (lambda x: ast.literal_eval(x) if isinstance(x, str) or isinstance(x, unicode)
-                      else x),
-            'boolean': (lambda x: ast.literal_eval(x.capitalize())
-                        if isinstance(x, str) or isinstance(x, unicode) else x),
-            'integer': int,
-            'number': float,
-            'object': cast_object,
-            'string': str
-        }
-
-        action_db = action_db_util.get_action_by_ref(action_ref)
-        action_parameters_schema = action_db.parameters
-        runnertype_db = action_db_util.get_runnertype_by_name(action_db.runner_type['name'])
-        runner_parameters_schema = runnertype_db.runner_parameters
-        # combine into 1 list of parameter schemas
-        parameters_schema = {}
-        if runner_parameters_schema:
-            parameters_schema.update(runner_parameters_schema)
-        if action_parameters_schema:
-            parameters_schema.update(action_parameters_schema)
+        casts = ActionChainRunner._get_param_casts(action_ref)
         # cast each param individually
         for k, v in six.iteritems(params):
-            parameter_schema = parameters_schema.get(k, None)
-            if not parameter_schema:
-                continue
-            parameter_type = parameter_schema.get('type', None)
-            if not parameter_type:
+            if k not in casts:
                 continue
-            cast = casts.get(parameter_type, None)
+            parameter_type, cast = casts[k]
             LOG.debug('Casting param: %s of type %s to type: %s', v, type(v), parameter_type)
-            if not cast:
-                continue
             params[k] = cast(v)
         return params
 
+    @staticmethod
+    def _get_param_casts(action_ref):
+        action_db = metadata.get_action_by_ref(action_ref)
+        # combined runner and action parameter schemas
+        parameters_schema = metadata.get_parameter_schema(action_db)
+        entry = PARAM_CASTS.get(action_ref)
+        # the schema is a new object whenever the action or its runner change.
+        if not entry or entry[0] is not parameters_schema:
+            casts = {}
+            for k, parameter_schema in six.iteritems(parameters_schema.get('properties', {})):
+                parameter_type = parameter_schema.get('type', None)
+                cast = CASTS.get(parameter_type, None)
+                if cast:
+                    casts[k] = (parameter_type, cast)
+            entry = PARAM_CASTS.set(action_ref, (parameters_schema, casts))
+        return entry[1]
+
+
+def _is_str(x):
+    return isinstance(x, str) or isinstance(x, unicode)
+
+
+def cast_array(x):
+    return ast.literal_eval(x) if _is_str(x) else x
+
+
+def cast_boolean(x):
+    return ast.literal_eval(x.capitalize()) if _is_str(x) else x
+
+
+def cast_object(x):
+    if _is_str(x):
+        try:
+            return json.loads(x)
+        except:
+            return ast.literal_eval(x)
+    else:
+        return x
+
+
+CASTS = {
+    'array': cast_array,
+    'boolean': cast_boolean,
+    'integer': int,
+    'number': float,
+    'object': cast_object,
+    'string': str
+}
+
 
 def get_runner():
     return ActionChainRunner(str(uuid.uuid4()))
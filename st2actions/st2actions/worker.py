@@ -22,6 +22,7 @@ from st2common import log as logging
 from st2common.exceptions.db import StackStormDBObjectNotFoundError
 from st2common.constants.action import (ACTIONEXEC_STATUS_RUNNING, ACTIONEXEC_STATUS_FAILED)
 from st2common.exceptions.actionrunner import ActionRunnerException
+from st2common.models.db import profiler
 from st2common.transport import actionexecution, publishers
 from st2common.util.action_db import (get_actionexec_by_id, update_actionexecution_status)
 from st2common.util.greenpooldispatch import BufferedDispatcher
@@ -63,10 +64,14 @@ class Worker(ConsumerMixin):
             message.ack()
 
     def _do_process_task(self, body):
-        try:
-            self.execute_action(body)
-        except:
-            LOG.exception('execute_action failed. Message body : %s', body)
+        with profiler.counter('execution %s' % body.id) as db_counter:
+            try:
+                self.execute_action(body)
+            except:
+                LOG.exception('execute_action failed. Message body : %s', body)
+
+        LOG.debug('Action execution %s made %s database round trips in %.1fms.', body.id,
+                  db_counter.round_trips, db_counter.duration_ms)
 
     def execute_action(self, actionexecution):
         try:
@@ -76,9 +81,10 @@ class Worker(ConsumerMixin):
                           actionexecution.id)
             raise
 
-        # Update ActionExecution status to "running"
+        # Update ActionExecution status to "running". The execution is only read once, all
+        # subsequent status transitions are applied to this instance.
         actionexec_db = update_actionexecution_status(status=ACTIONEXEC_STATUS_RUNNING,
-                                                      actionexec_id=actionexec_db.id)
+                                                      actionexec_db=actionexec_db)
         # Launch action
         LOG.audit('Launching action execution.',
                   extra={'actionexec': actionexec_db.to_serializable_dict()})
@@ -88,7 +94,7 @@ class Worker(ConsumerMixin):
             LOG.debug('Runner dispatch produced result: %s', result)
         except Exception:
             actionexec_db = update_actionexecution_status(status=ACTIONEXEC_STATUS_FAILED,
-                                                          actionexec_id=actionexec_db.id)
+                                                          actionexec_db=actionexec_db)
             raise
 
         if not result:
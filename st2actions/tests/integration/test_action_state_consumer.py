@@ -37,7 +37,7 @@ class ActionStateConsumerTests(EventletTestCase, DbTestCase):
                 ActionStateConsumerTests.executions['execution1.json'])
             consumer._do_process_task(state)
             querier = tracker.get_querier('tests.resources.test_querymodule')
-            self.assertEqual(querier._query_contexts.qsize(), 1)
+            self.assertEqual(querier.get_pending_count(), 1)
 
     @classmethod
     def get_state(cls, exec_db):
@@ -13,8 +13,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import eventlet
+import json
 import mock
+import os
 import six
+import tempfile
 
 from st2actions.runners import actionchainrunner as acr
 from st2actions.container.service import RunnerContainerService
@@ -25,6 +29,7 @@ from st2common.constants.action import ACTIONEXEC_STATUS_FAILED
 from st2common.models.db.datastore import KeyValuePairDB
 from st2common.persistence.datastore import KeyValuePair
 from st2common.services import action as action_service
+from st2common.services import metadata
 from st2common.util import action_db as action_db_util
 from st2tests import DbTestCase
 from st2tests.fixturesloader import FixturesLoader
@@ -74,12 +79,21 @@ CHAIN_VARS = FixturesLoader().get_fixture_file_path_abs(
     FIXTURES_PACK, 'actionchains', 'chain_vars.json')
 CHAIN_WITH_PUBLISH = FixturesLoader().get_fixture_file_path_abs(
     FIXTURES_PACK, 'actionchains', 'chain_with_publish.json')
+CHAIN_PARALLEL = FixturesLoader().get_fixture_file_path_abs(
+    FIXTURES_PACK, 'actionchains', 'chain_parallel.json')
+CHAIN_PARALLEL_NO_REF = FixturesLoader().get_fixture_file_path_abs(
+    FIXTURES_PACK, 'actionchains', 'chain_parallel_no_ref.json')
 
 
 @mock.patch.object(action_db_util, 'get_runnertype_by_name',
                    mock.MagicMock(return_value=RUNNER))
 class TestActionChainRunner(DbTestCase):
 
+    def setUp(self):
+        super(TestActionChainRunner, self).setUp()
+        # Tests mock action lookups with different models for the same reference.
+        metadata.clear()
+
     def test_runner_creation(self):
         runner = acr.get_runner()
         self.assertTrue(runner)
@@ -362,6 +376,119 @@ class TestActionChainRunner(DbTestCase):
         mock_args, _ = schedule.call_args
         self.assertEqual(mock_args[0].parameters, expected_value)
 
+    @mock.patch.object(action_db_util, 'get_action_by_ref',
+                       mock.MagicMock(return_value=ACTION_2))
+    @mock.patch.object(action_service, 'schedule',
+                       return_value=DummyActionExecution(result={'raw_out': 'published'}))
+    def test_chain_runner_parallel(self, schedule):
+        chain_runner = acr.get_runner()
+        chain_runner.entry_point = CHAIN_PARALLEL
+        chain_runner.action = ACTION_2
+        chain_runner.container_service = RunnerContainerService()
+        chain_runner.pre_run()
+        status, results = chain_runner.run({})
+        self.assertEqual(status, ACTIONEXEC_STATUS_SUCCEEDED)
+        # 3 branches and the join node.
+        self.assertEqual(schedule.call_count, 4)
+        branch_params = [args[0].parameters for args, _ in schedule.call_args_list[:3]]
+        self.assertItemsEqual(branch_params, [{'inttype': 1}, {'inttype': 2}, {'inttype': 3}])
+        # The join node sees the results of all the branches.
+        expected_branch_results = {'b1': {'raw_out': 'published'},
+                                   'b2': {'raw_out': 'published'},
+                                   'b3': {'raw_out': 'published'}}
+        self.assertEqual(results['c1'], expected_branch_results)
+        mock_args, _ = schedule.call_args
+        self.assertEqual(mock_args[0].parameters, {'strtype': 'published',
+                                                   'objtype': expected_branch_results})
+
+    @mock.patch.object(action_db_util, 'get_action_by_ref',
+                       mock.MagicMock(return_value=ACTION_2))
+    @mock.patch.object(action_service, 'schedule')
+    def test_chain_runner_parallel_concurrency(self, schedule):
+        running = []
+        max_running = []
+
+        def mock_schedule(execution):
+            running.append(execution)
+            max_running.append(len(running))
+            # yield to the other branches.
+            eventlet.sleep(0)
+            running.remove(execution)
+            return DummyActionExecution(result={'raw_out': 'published'})
+
+        schedule.side_effect = mock_schedule
+        chain_runner = acr.get_runner()
+        chain_runner.entry_point = CHAIN_PARALLEL
+        chain_runner.action = ACTION_2
+        chain_runner.container_service = RunnerContainerService()
+        chain_runner.pre_run()
+        chain_runner.run({})
+        self.assertEqual(schedule.call_count, 4)
+        self.assertEqual(max(max_running), 2)
+
+    @mock.patch.object(action_db_util, 'get_action_by_ref',
+                       mock.MagicMock(return_value=ACTION_2))
+    @mock.patch.object(action_service, 'schedule')
+    def test_chain_runner_parallel_branch_failure(self, schedule):
+        def mock_schedule(execution):
+            if execution.parameters['inttype'] == 2:
+                return DummyActionExecution(status=ACTIONEXEC_STATUS_FAILED)
+            return DummyActionExecution(result={'raw_out': 'published'})
+
+        schedule.side_effect = mock_schedule
+        chain_runner = acr.get_runner()
+        chain_runner.entry_point = CHAIN_PARALLEL
+        chain_runner.action = ACTION_2
+        chain_runner.container_service = RunnerContainerService()
+        chain_runner.pre_run()
+        status, results = chain_runner.run({})
+        self.assertEqual(status, ACTIONEXEC_STATUS_FAILED)
+        # All the branches run but the join node doesn't.
+        self.assertEqual(schedule.call_count, 3)
+        self.assertItemsEqual(results['c1'].keys(), ['b1', 'b2', 'b3'])
+
+    def test_chain_runner_parallel_node_without_ref(self):
+        chain_runner = acr.get_runner()
+        chain_runner.entry_point = CHAIN_PARALLEL_NO_REF
+        chain_runner.action = ACTION_2
+        chain_runner.container_service = RunnerContainerService()
+        self.assertRaises(runnerexceptions.ActionRunnerPreRunError, chain_runner.pre_run)
+
+    def test_chain_holder_is_cached(self):
+        chain_holders = []
+        for _ in range(2):
+            chain_runner = acr.get_runner()
+            chain_runner.entry_point = CHAIN_1_PATH
+            chain_runner.action = ACTION_1
+            chain_runner.container_service = RunnerContainerService()
+            chain_runner.pre_run()
+            chain_holders.append(chain_runner.chain_holder)
+        self.assertTrue(chain_holders[0] is chain_holders[1])
+
+    def test_chain_holder_reloaded_on_change(self):
+        with open(CHAIN_1_PATH, 'r') as fd:
+            chainspec = json.load(fd)
+        _, chain_path = tempfile.mkstemp(suffix='.json')
+        try:
+            with open(chain_path, 'w') as fd:
+                json.dump(chainspec, fd)
+            chain_runner = acr.get_runner()
+            chain_runner.entry_point = chain_path
+            chain_runner.action = ACTION_1
+            chain_runner.container_service = RunnerContainerService()
+            chain_runner.pre_run()
+            self.assertEqual(chain_runner.chain_holder.actionchain.default, 'c1')
+
+            chainspec['default'] = 'c2'
+            with open(chain_path, 'w') as fd:
+                json.dump(chainspec, fd)
+            stat = os.stat(chain_path)
+            os.utime(chain_path, (stat.st_atime, stat.st_mtime + 10))
+            chain_runner.pre_run()
+            self.assertEqual(chain_runner.chain_holder.actionchain.default, 'c2')
+        finally:
+            os.remove(chain_path)
+
     @classmethod
     def tearDownClass(cls):
         FixturesLoader().delete_models_from_db(MODELS)
@@ -36,13 +36,14 @@ from st2common.models.api.rule import RuleAPI
 from st2common.models.api.action import RunnerTypeAPI, ActionAPI, ActionExecutionAPI
 import st2common.util.action_db as action_utils
 from st2common.constants.action import ACTIONEXEC_STATUS_FAILED
+from st2common.constants.action import ACTIONEXEC_STATUS_RUNNING
 from st2common.persistence.reactor import TriggerType, Trigger, TriggerInstance, Rule
 from st2common.persistence.action import RunnerType, Action, ActionExecution
 from st2common.persistence.history import ActionExecutionHistory
 
 
 CHAMPION = worker.Worker(None)
-HISTORIAN = history.Historian(None, timeout=1, wait=1)
+HISTORIAN = history.Historian(None)
 MOCK_FAIL_HISTORY_CREATE = False
 
 
@@ -104,6 +105,18 @@ class TestActionExecutionHistoryWorker(DbTestCase):
         MOCK_FAIL_HISTORY_CREATE = True     # noqa
         self.test_basic_execution()
 
+    def test_stale_update_not_applied(self):
+        execution = ActionExecutionDB(action='core.local', parameters={'cmd': 'uname -a'})
+        execution = action_service.schedule(execution)
+        execution = ActionExecution.get_by_id(str(execution.id))
+        self.assertEqual(execution.status, ACTIONEXEC_STATUS_FAILED)
+
+        # An update which was delivered late must not overwrite the completed execution.
+        execution.status = ACTIONEXEC_STATUS_RUNNING
+        HISTORIAN.update_action_execution_history(execution)
+        history = ActionExecutionHistory.get(execution__id=str(execution.id), raise_exception=True)
+        self.assertEqual(history.execution['status'], ACTIONEXEC_STATUS_FAILED)
+
     def test_chained_executions(self):
         execution = ActionExecutionDB(action='core.chain')
         execution = action_service.schedule(execution)
@@ -159,3 +172,41 @@ class TestActionExecutionHistoryWorker(DbTestCase):
         self.assertDictEqual(history.runner, vars(RunnerTypeAPI.from_model(runner)))
         execution = ActionExecution.get_by_id(str(execution.id))
         self.assertDictEqual(history.execution, vars(ActionExecutionAPI.from_model(execution)))
+
+    def test_batched_executions(self):
+        executions = []
+        for i in range(3):
+            execution = ActionExecutionDB(action='core.local', parameters={'cmd': 'uname -a'})
+            executions.append(ActionExecution.add_or_update(execution, publish=False))
+
+        # The executions are recorded with a single bulk write.
+        HISTORIAN.record_action_executions(executions)
+        action = action_utils.get_action_by_ref('core.local')
+        for execution in executions:
+            history = ActionExecutionHistory.get(execution__id=str(execution.id),
+                                                 raise_exception=True)
+            self.assertDictEqual(history.action, vars(ActionAPI.from_model(action)))
+            self.assertDictEqual(history.execution,
+                                 vars(ActionExecutionAPI.from_model(execution)))
+
+    def test_cached_snapshots_not_loaded(self):
+        execution = ActionExecutionDB(action='core.local', parameters={'cmd': 'uname -a'},
+                                      context={})
+        HISTORIAN._get_attrs(execution)
+        with mock.patch.object(action_utils, 'get_action_by_ref') as get_action_by_ref, \
+                mock.patch.object(RunnerType, 'get_by_name') as get_by_name:
+            attrs = HISTORIAN._get_attrs(execution)
+        self.assertFalse(get_action_by_ref.called)
+        self.assertFalse(get_by_name.called)
+        action = action_utils.get_action_by_ref('core.local')
+        self.assertDictEqual(attrs['action'], vars(ActionAPI.from_model(action)))
+
+    def test_snapshot_invalidated_on_update(self):
+        action = action_utils.get_action_by_ref('core.local')
+        HISTORIAN._get_snapshot(ActionAPI, 'core.local', lambda: action)
+        self.assertIn(('ActionAPI', 'core.local'), HISTORIAN._snapshots)
+
+        message = mock.MagicMock()
+        HISTORIAN.process_action(action, message)
+        self.assertNotIn(('ActionAPI', 'core.local'), HISTORIAN._snapshots)
+        message.ack.assert_called_once_with()
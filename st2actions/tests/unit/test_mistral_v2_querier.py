@@ -0,0 +1,83 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import mock
+from oslo.config import cfg
+import requests
+from unittest2 import TestCase
+
+import st2tests.config as tests_config
+tests_config.parse_args()
+
+from st2actions.query.mistral import v2 as mistral_v2
+from st2common.constants.action import (ACTIONEXEC_STATUS_RUNNING, ACTIONEXEC_STATUS_SUCCEEDED)
+from st2tests import http
+
+BASE_URL = cfg.CONF.mistral.v2_base_url
+
+MISTRAL_RUNNING = {'id': 'e1', 'state': 'RUNNING', 'updated_at': '2015-01-01 00:00:00'}
+MISTRAL_RUNNING_UPDATED = {'id': 'e1', 'state': 'RUNNING', 'updated_at': '2015-01-01 00:00:05'}
+MISTRAL_SUCCEEDED = {'id': 'e1', 'state': 'SUCCESS', 'updated_at': '2015-01-01 00:00:10',
+                     'output': json.dumps({'k1': 'v1'})}
+MISTRAL_TASKS = {'tasks': [{'name': 't1', 'state': 'SUCCESS', 'result': '{"k1": "v1"}'}]}
+
+
+def _get_response(body):
+    return http.FakeResponse(json.dumps(body), 200, 'OK')
+
+
+class MistralQuerierTestCase(TestCase):
+
+    def _get_querier(self, *executions):
+        querier = mistral_v2.get_instance()
+        responses = {BASE_URL + 'executions/e1/tasks': _get_response(MISTRAL_TASKS)}
+        executions = list(executions)
+
+        def mock_get(url):
+            if url in responses:
+                return responses[url]
+            return _get_response(executions.pop(0))
+
+        querier._session = mock.MagicMock()
+        querier._session.get.side_effect = mock_get
+        return querier
+
+    def _get_urls(self, querier):
+        return [args[0] for args, _ in querier._session.get.call_args_list]
+
+    def test_query_reuses_session(self):
+        querier = self._get_querier(MISTRAL_SUCCEEDED)
+        status, result = querier.query('st2-e1', {'mistral_execution_id': 'e1'})
+        self.assertEqual(status, ACTIONEXEC_STATUS_SUCCEEDED)
+        self.assertEqual(result['k1'], 'v1')
+        self.assertEqual(result['tasks'][0]['result'], {'k1': 'v1'})
+        self.assertEqual(self._get_urls(querier),
+                         [BASE_URL + 'executions/e1', BASE_URL + 'executions/e1/tasks'])
+        self.assertTrue(isinstance(mistral_v2.get_instance()._session, requests.Session))
+
+    def test_tasks_only_queried_when_execution_changed(self):
+        querier = self._get_querier(MISTRAL_RUNNING, MISTRAL_RUNNING, MISTRAL_RUNNING_UPDATED,
+                                    MISTRAL_SUCCEEDED)
+        for _ in range(3):
+            status, result = querier.query('st2-e1', {'mistral_execution_id': 'e1'})
+            self.assertEqual(status, ACTIONEXEC_STATUS_RUNNING)
+            self.assertEqual(len(result['tasks']), 1)
+        status, _ = querier.query('st2-e1', {'mistral_execution_id': 'e1'})
+        self.assertEqual(status, ACTIONEXEC_STATUS_SUCCEEDED)
+        tasks_url = BASE_URL + 'executions/e1/tasks'
+        self.assertEqual(self._get_urls(querier).count(tasks_url), 3)
+        self.assertEqual(len(querier._tasks), 0)
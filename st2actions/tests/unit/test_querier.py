@@ -0,0 +1,109 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+import mock
+from unittest2 import TestCase
+
+from st2actions.query.base import QueryContext
+from st2common.persistence.action import (ActionExecution, ActionExecutionState)
+from tests.resources.test_querymodule import TestQuerier
+
+
+def _get_query_context(obj_id):
+    return QueryContext(obj_id, 'execution-%s' % obj_id, {'id': obj_id},
+                        'tests.resources.test_querymodule')
+
+
+class QuerierTestCase(TestCase):
+
+    def test_backoff(self):
+        querier = TestQuerier(query_interval=1, max_query_interval=5, query_backoff_factor=2)
+        intervals = [querier._get_query_interval(queries) for queries in range(5)]
+        self.assertEqual(intervals, [1, 2, 4, 5, 5])
+
+    @mock.patch.object(time, 'time', mock.MagicMock(return_value=100))
+    def test_queries_fired_in_due_order(self):
+        querier = TestQuerier(query_interval=1)
+        querier._thread_pool = mock.MagicMock()
+        querier._thread_pool.free.return_value = 10
+
+        long_running = _get_query_context('1')
+        new = _get_query_context('2')
+        querier._schedule_query(long_running, queries=3)
+        querier.add_queries(query_contexts=[new])
+        self.assertEqual(querier.get_pending_count(), 2)
+        self.assertEqual(querier.get_overdue_count(), 0)
+
+        # Only the new context is due.
+        time.time.return_value = 101
+        self.assertEqual(querier.get_overdue_count(), 1)
+        querier._fire_queries()
+        querier._thread_pool.spawn.assert_called_once_with(querier._query_and_save_results,
+                                                           new, 0)
+        self.assertEqual(querier.get_pending_count(), 1)
+
+        time.time.return_value = 110
+        querier._fire_queries()
+        querier._thread_pool.spawn.assert_called_with(querier._query_and_save_results,
+                                                      long_running, 3)
+        self.assertEqual(querier.get_pending_count(), 0)
+
+    @mock.patch.object(time, 'time', mock.MagicMock(return_value=100))
+    def test_no_queries_fired_without_free_workers(self):
+        querier = TestQuerier(query_interval=1)
+        querier._thread_pool = mock.MagicMock()
+        querier._thread_pool.free.return_value = 0
+        querier.add_queries(query_contexts=[_get_query_context('1')])
+
+        time.time.return_value = 101
+        querier._fire_queries()
+        self.assertFalse(querier._thread_pool.spawn.called)
+        self.assertEqual(querier.get_overdue_count(), 1)
+
+    @mock.patch.object(ActionExecution, 'get_by_id')
+    @mock.patch.object(ActionExecutionState, 'renew_lease', mock.MagicMock(return_value=False))
+    def test_query_dropped_once_taken_over(self, get_by_id):
+        querier = TestQuerier()
+        querier.query = mock.MagicMock()
+        context = QueryContext('1', 'execution-1', {'id': '1'}, 'tests.resources.test_querymodule',
+                               claimed_by='t1', lease_ttl=30)
+        querier._query_and_save_results(context)
+        ActionExecutionState.renew_lease.assert_called_once_with('1', 't1', 30)
+        self.assertFalse(querier.query.called)
+        self.assertEqual(querier.get_pending_count(), 0)
+
+    @mock.patch.object(ActionExecution, 'get_by_id')
+    @mock.patch.object(ActionExecutionState, 'renew_lease')
+    def test_results_not_saved_once_taken_over_while_querying(self, renew_lease, get_by_id):
+        renew_lease.side_effect = [True, False]
+        querier = TestQuerier()
+        querier.query = mock.MagicMock(return_value=('succeeded', {}))
+        querier._invoke_post_run = mock.MagicMock()
+        context = QueryContext('1', 'execution-1', {'id': '1'}, 'tests.resources.test_querymodule',
+                               claimed_by='t1', lease_ttl=30)
+        querier._query_and_save_results(context)
+        self.assertTrue(querier.query.called)
+        self.assertFalse(get_by_id.called)
+        self.assertFalse(querier._invoke_post_run.called)
+
+    def test_wait_for_next_query_woken_up_by_new_query(self):
+        querier = TestQuerier(empty_q_sleep_time=10)
+        querier._query_added.send()
+        start = time.time()
+        querier._wait_for_next_query()
+        self.assertTrue(time.time() - start < 1)
+        self.assertFalse(querier._query_added.ready())
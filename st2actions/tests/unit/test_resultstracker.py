@@ -0,0 +1,98 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import bson
+import mock
+from unittest2 import TestCase
+
+from st2actions.resultstracker import (ActionStateQueueConsumer, ResultsTracker)
+from st2common.models.db.action import ActionExecutionStateDB
+from st2common.persistence.action import ActionExecutionState
+from st2tests import DbTestCase
+
+QUERY_MODULE = 'tests.resources.test_querymodule'
+
+
+def _get_state():
+    return ActionExecutionStateDB(id=bson.ObjectId(), execution_id=bson.ObjectId(),
+                                  query_context={'id': 'foo'}, query_module=QUERY_MODULE)
+
+
+class ResultsTrackerTestCase(TestCase):
+
+    def _get_tracker(self, **kwargs):
+        tracker = ResultsTracker(**kwargs)
+        querier = mock.MagicMock()
+        tracker.get_querier = mock.MagicMock(return_value=querier)
+        return tracker, querier
+
+    @mock.patch.object(ActionExecutionState, 'claim', mock.MagicMock())
+    @mock.patch.object(ActionExecutionState, 'stream')
+    def test_bootstrap(self, stream):
+        stream.return_value = iter([_get_state(), _get_state()])
+        tracker, querier = self._get_tracker()
+        tracker._bootstrap()
+        stream.assert_called_once_with(no_cursor_timeout=True)
+        self.assertEqual(querier.add_queries.call_count, 2)
+        self.assertFalse(ActionExecutionState.claim.called)
+
+    @mock.patch.object(ActionExecutionState, 'claim')
+    @mock.patch.object(ActionExecutionState, 'query_claimable')
+    def test_bootstrap_sharding(self, query_claimable, claim):
+        claimed, not_claimed = _get_state(), _get_state()
+        query_claimable.return_value = iter([claimed, not_claimed])
+        claim.side_effect = lambda state_db, tracker_id, lease_ttl: state_db is claimed
+        tracker, querier = self._get_tracker(sharding=True, lease_ttl=30, tracker_id='t1')
+        tracker._bootstrap()
+        query_claimable.assert_called_once_with(stream=True)
+        claim.assert_any_call(claimed, 't1', 30)
+        self.assertEqual(querier.add_queries.call_count, 1)
+        _, kwargs = querier.add_queries.call_args
+        self.assertEqual(kwargs['query_contexts'][0].id, str(claimed.id))
+        self.assertEqual(kwargs['query_contexts'][0].claimed_by, 't1')
+        self.assertEqual(kwargs['query_contexts'][0].lease_ttl, 30)
+
+    @mock.patch.object(ActionExecutionState, 'claim', mock.MagicMock(return_value=False))
+    def test_new_state_claimed_by_other_tracker(self):
+        tracker, querier = self._get_tracker(sharding=True)
+        consumer = ActionStateQueueConsumer(None, tracker)
+        consumer._add_to_querier(_get_state())
+        self.assertFalse(querier.add_queries.called)
+
+    @mock.patch.object(ActionExecutionState, 'release')
+    def test_shutdown_releases_claims(self, release):
+        tracker, _ = self._get_tracker(sharding=True, tracker_id='t1')
+        tracker._queue_consumer = mock.MagicMock()
+        tracker.shutdown()
+        release.assert_called_once_with('t1')
+
+
+class ResultsTrackerClaimTestCase(DbTestCase):
+
+    def tearDown(self):
+        ActionExecutionStateDB.drop_collection()
+        super(ResultsTrackerClaimTestCase, self).tearDown()
+
+    def test_state_seen_by_consumer_and_lease_scan(self):
+        state = ActionExecutionState.add_or_update(_get_state())
+        tracker = ResultsTracker(sharding=True, lease_ttl=30, tracker_id='t1')
+        querier = mock.MagicMock()
+        tracker.get_querier = mock.MagicMock(return_value=querier)
+        consumer = ActionStateQueueConsumer(None, tracker)
+
+        # The lease scan finds the unclaimed state before the consumer gets its message.
+        scanned = list(ActionExecutionState.query_claimable())
+        consumer._add_to_querier(state)
+        self.assertEqual(tracker._add_states(scanned), 0)
+        self.assertEqual(querier.add_queries.call_count, 1)
@@ -18,6 +18,7 @@ import mock
 
 from oslo.config import cfg
 from st2actions.runners import get_runner
+from st2common.constants.action import ACTIONEXEC_STATUS_SUCCEEDED
 from st2common.exceptions.actionrunner import ActionRunnerCreateError
 from st2common.models.system.common import ResourceReference
 from st2common.models.db.action import (ActionExecutionDB, RunnerTypeDB)
@@ -89,6 +90,27 @@ class RunnerContainerTest(DbTestCase):
         self.assertTrue(result.get('action_params').get('actionint') == 10)
         self.assertTrue(result.get('action_params').get('actionstr') == 'bar')
 
+    def test_dispatch_single_write(self):
+        runner_container = get_runner_container()
+        params = {
+            'actionstr': 'bar'
+        }
+        actionexec_db = self._get_action_exec_db_model(RunnerContainerTest.action_db, params)
+        actionexec_db = ActionExecution.add_or_update(actionexec_db)
+
+        # Assert that the execution is not re-read and is written exactly once.
+        with mock.patch.object(ActionExecution, 'get_by_id') as get_by_id:
+            with mock.patch.object(ActionExecution, 'update',
+                                   side_effect=ActionExecution.update) as update:
+                runner_container.dispatch(actionexec_db)
+        self.assertFalse(get_by_id.called)
+        self.assertEqual(update.call_count, 1)
+
+        actionexec_db = ActionExecution.get_by_id(actionexec_db.id)
+        self.assertEqual(actionexec_db.status, ACTIONEXEC_STATUS_SUCCEEDED)
+        self.assertTrue(actionexec_db.end_timestamp is not None)
+        self.assertTrue(actionexec_db.result.get('action_params').get('actionstr') == 'bar')
+
     def test_dispatch_runner_failure(self):
         runner_container = get_runner_container()
         params = {
@@ -19,6 +19,7 @@ import pecan
 from st2common import hooks
 from st2common import log as logging
 from st2common.constants.system import VERSION_STRING
+from st2common.middleware.compression import GzipMiddleware
 
 
 LOG = logging.getLogger(__name__)
@@ -51,7 +52,7 @@ def setup_app(config=None):
 
     app_conf = dict(config.app)
 
-    active_hooks = [hooks.CorsHook()]
+    active_hooks = [hooks.CorsHook(), hooks.DBProfilingHook(), hooks.ETagHook()]
 
     if cfg.CONF.auth.enable:
         active_hooks.append(hooks.AuthHook())
@@ -62,6 +63,9 @@ def setup_app(config=None):
                          **app_conf
                          )
 
+    if cfg.CONF.api.gzip:
+        app = GzipMiddleware(app, min_size=cfg.CONF.api.gzip_min_size)
+
     LOG.info('%s app created.' % __name__)
 
     return app
@@ -0,0 +1,191 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+In-process cache of the GET responses of the content resources.
+
+Actions, runner types, sensor types, trigger types and rules only change when packs are
+registered or when they are written through the API, yet they are listed over and over again.
+The encoded responses are cached per resource, keyed by the request path and query parameters
+(see :func:`st2common.models.api.base.jsexpose`). The responses of a resource are dropped when
+it is written through the API of the current process, when CUD events published by other
+processes are received (see :func:`start_watcher`) and, as a last resort, expire after a while.
+"""
+
+import eventlet
+from kombu import Connection
+from kombu.mixins import ConsumerMixin
+from oslo.config import cfg
+import six
+
+from st2common import log as logging
+from st2common.transport import action as action_transport
+from st2common.transport import publishers
+from st2common.transport import reactor as reactor_transport
+from st2common.util.cache import ExpiringCache
+
+__all__ = [
+    'ResponseCache',
+    'get_cache',
+    'configure',
+    'invalidate',
+    'clear',
+    'get_stats',
+    'start_watcher'
+]
+
+LOG = logging.getLogger(__name__)
+
+CACHE_TTL = 600
+CACHE_MAX_SIZE = 100
+
+ACTION = 'action'
+RUNNER_TYPE = 'runnertype'
+SENSOR_TYPE = 'sensortype'
+TRIGGER_TYPE = 'triggertype'
+RULE = 'rule'
+
+# Resources whose responses embed another resource, e.g. the action views include the
+# parameters of the runner.
+DEPENDENT_RESOURCES = {
+    RUNNER_TYPE: [ACTION]
+}
+
+_watcher = None
+
+
+class ResponseCache(object):
+    """
+    Cached responses of a resource.
+    """
+
+    def __init__(self, resource):
+        self.resource = resource
+        self.enabled = True
+        self._cache = ExpiringCache(ttl=CACHE_TTL, max_size=CACHE_MAX_SIZE)
+
+    def get(self, key):
+        if not self.enabled:
+            return None
+        return self._cache.get(key)
+
+    def set(self, key, response):
+        if self.enabled:
+            self._cache.set(key, response)
+        return response
+
+    def clear(self):
+        """
+        Drop the cached responses of this resource and of the resources which depend on it.
+        """
+        self._cache.clear()
+        for resource in DEPENDENT_RESOURCES.get(self.resource, []):
+            get_cache(resource).clear()
+
+    def get_stats(self):
+        stats = self._cache.get_stats()
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = float(stats['hits']) / lookups if lookups else 0.0
+        return stats
+
+
+_caches = dict([(resource, ResponseCache(resource))
+                for resource in [ACTION, RUNNER_TYPE, SENSOR_TYPE, TRIGGER_TYPE, RULE]])
+
+
+def get_cache(resource):
+    """
+    :rtype: :class:`ResponseCache`
+    """
+    return _caches[resource]
+
+
+def configure(max_size, ttl):
+    """
+    :param max_size: Maximum number of responses cached per resource. 0 disables the cache.
+    :type max_size: ``int``
+
+    :param ttl: Seconds after which a cached response expires. 0 means never.
+    :type ttl: ``int``
+    """
+    for response_cache in six.itervalues(_caches):
+        response_cache.enabled = max_size > 0
+        response_cache._cache.max_size = max_size or None
+        response_cache._cache.ttl = ttl or None
+        response_cache.clear()
+
+
+def invalidate(resource):
+    get_cache(resource).clear()
+
+
+def clear():
+    for response_cache in six.itervalues(_caches):
+        response_cache.clear()
+
+
+def get_stats():
+    """
+    Return the size and the hits and misses of the cache of each resource.
+
+    :rtype: ``dict``
+    """
+    return dict([(resource, response_cache.get_stats())
+                 for resource, response_cache in six.iteritems(_caches)])
+
+
+class ResponseCacheWatcher(ConsumerMixin):
+    """
+    Drops the cached responses of the resources created, updated or deleted by other
+    processes.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def get_consumers(self, Consumer, channel):
+        queues = [
+            (ACTION, action_transport.get_action_queue),
+            (RUNNER_TYPE, action_transport.get_runnertype_queue),
+            (SENSOR_TYPE, reactor_transport.get_sensortype_cud_queue),
+            (TRIGGER_TYPE, reactor_transport.get_triggertype_cud_queue),
+            (RULE, reactor_transport.get_rule_cud_queue)
+        ]
+        return [Consumer(queues=[get_queue(routing_key=publishers.ANY_RK, exclusive=True)],
+                         accept=['pickle'],
+                         callbacks=[self._get_callback(resource)])
+                for resource, get_queue in queues]
+
+    def _get_callback(self, resource):
+        def process(body, message):
+            try:
+                invalidate(resource)
+            except:
+                LOG.exception('Failed to invalidate cached %s responses. Message body : %s',
+                              resource, body)
+            finally:
+                message.ack()
+        return process
+
+
+def start_watcher():
+    """
+    Start watching for changes of the cached resources in a background green thread.
+    """
+    global _watcher
+    if not _watcher:
+        _watcher = ResponseCacheWatcher(Connection(cfg.CONF.messaging.url))
+        eventlet.spawn_n(_watcher.run)
+    return _watcher
@@ -23,10 +23,14 @@ from eventlet import wsgi
 from st2common import log as logging
 from st2common.models.db import db_setup
 from st2common.models.db import db_teardown
+from st2common.services import historyfilters
+from st2common.services import metadata
 from st2common.constants.logging import DEFAULT_LOGGING_CONF_PATH
 from st2api.listener import get_listener_if_set
+from st2api import cache
 from st2api import config
 from st2api import app
+from st2api.controllers.v1 import historyviews
 
 
 eventlet.monkey_patch(
@@ -57,6 +61,17 @@ def _setup():
     db_setup(cfg.CONF.database.db_name, cfg.CONF.database.host, cfg.CONF.database.port,
              username=username, password=password)
 
+    # 4. keep cached action and runner type metadata up to date.
+    metadata.start_watcher()
+
+    # 5. keep the values of the history filters up to date.
+    historyfilters.start_watcher(historyviews.get_filters_cache())
+
+    # 6. serve the content resources from the response cache and keep it up to date.
+    cache.configure(cfg.CONF.api.response_cache_size, cfg.CONF.api.response_cache_ttl)
+    if cfg.CONF.api.response_cache_size > 0:
+        cache.start_watcher()
+
 
 def _run_server():
     host = cfg.CONF.api.host
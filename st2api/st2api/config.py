@@ -36,7 +36,22 @@ def _register_app_opts():
         cfg.ListOpt('allow_origin', default=['http://localhost:3000'],
                     help='List of origins allowed'),
         cfg.IntOpt('heartbeat', default=25,
-                   help='Send empty message every N seconds to keep connection open')
+                   help='Send empty message every N seconds to keep connection open'),
+        cfg.IntOpt('history_filters_window', default=0,
+                   help='Seconds of history the values of the history filters are listed for. 0 '
+                        'lists the values of the whole history.'),
+        cfg.IntOpt('history_filters_refresh_interval', default=3600,
+                   help='Seconds after which the values of the history filters are recomputed '
+                        'from scratch.'),
+        cfg.BoolOpt('gzip', default=True,
+                    help='Compress the responses with gzip for the clients which accept it.'),
+        cfg.IntOpt('gzip_min_size', default=1024,
+                   help='Responses smaller than this number of bytes aren\'t compressed.'),
+        cfg.IntOpt('response_cache_size', default=100,
+                   help='Number of GET responses cached per content resource (actions, runner '
+                        'types, sensor types, trigger types and rules). 0 disables the cache.'),
+        cfg.IntOpt('response_cache_ttl', default=600,
+                   help='Seconds after which a cached response expires. 0 means never.')
     ]
     CONF.register_opts(api_opts, group='api')
 
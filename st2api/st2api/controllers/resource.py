@@ -14,10 +14,15 @@
 # limitations under the License.
 
 import abc
+import base64
 import copy
+import datetime
+import json
 
+from bson import ObjectId
 from mongoengine import ValidationError
 import pecan
+from pymongo.errors import ExecutionTimeout
 from pecan import rest
 import six
 from six.moves import http_client
@@ -26,6 +31,7 @@ from st2common.models.api.base import jsexpose
 from st2common import log as logging
 from st2common.models.system.common import InvalidResourceReferenceError
 from st2common.models.system.common import ResourceReference
+from st2common.util import isotime
 
 
 LOG = logging.getLogger(__name__)
@@ -48,6 +54,19 @@ class ResourceController(rest.RestController):
     }
     max_limit = 100
 
+    # Field on which results are paginated with markers instead of offsets. Pages are sorted
+    # on this field and on the id, both in descending order, and X-Next-Marker is set to an
+    # opaque token to pass as the marker query parameter to retrieve the next page.
+    marker_field = None
+
+    # Milliseconds the database may spend counting the results for X-Total-Count. The header
+    # is omitted if the count takes longer.
+    count_max_time_ms = 1000
+
+    # Cache the GET responses are served from, see st2api.cache. Requests with other methods
+    # drop the cached responses.
+    response_cache = None
+
     def __init__(self):
         self.supported_filters = copy.deepcopy(self.__class__.supported_filters)
         self.supported_filters.update(RESERVED_QUERY_PARAMS)
@@ -106,7 +125,8 @@ class ResourceController(rest.RestController):
         limit = kwargs.pop('limit', None)
         if limit and int(limit) > self.max_limit:
             limit = self.max_limit
-        eop = offset + int(limit) if limit else None
+        marker = kwargs.pop('marker', None)
+        include_attributes, exclude_attributes = self._get_projection(**kwargs)
 
         filters = {}
 
@@ -114,15 +134,109 @@ class ResourceController(rest.RestController):
             if kwargs.get(k):
                 filters['__'.join(v.split('.'))] = kwargs[k]
 
+        paginate = self._can_paginate_by_marker(filters, db_sort_values)
+        if paginate:
+            filters['order_by'] = ['-' + self.marker_field, '-id']
+        elif marker:
+            pecan.abort(http_client.BAD_REQUEST,
+                        'marker can\'t be used with a custom sort or a range on %s.' %
+                        self.marker_field)
+            return
+
         LOG.info('GET all %s with filters=%s', pecan.request.path, filters)
 
-        instances = self.access.query(**filters)
+        total_count = self._get_total_count(**filters)
+
+        if marker:
+            try:
+                filters['__raw__'] = self._get_marker_query(marker)
+            except Exception:
+                pecan.abort(http_client.BAD_REQUEST, 'Invalid marker "%s".' % marker)
+                return
+            offset = 0
+
+        if include_attributes:
+            # The next marker is built from the marker field.
+            filters['only'] = include_attributes + ([self.marker_field.replace('__', '.')]
+                                                    if paginate else [])
+        elif exclude_attributes:
+            marker_field = self.marker_field.replace('__', '.') if paginate else ''
+            filters['exclude'] = [attr for attr in exclude_attributes
+                                  if not (marker_field + '.').startswith(attr + '.')]
+
+        # Documents are read as plain dicts and converted straight to API objects.
+        docs = self.access.query_raw(offset=offset, limit=limit, **filters)
 
         if limit:
             pecan.response.headers['X-Limit'] = str(limit)
-        pecan.response.headers['X-Total-Count'] = str(len(instances))
+            if paginate and len(docs) == int(limit):
+                pecan.response.headers['X-Next-Marker'] = self._get_marker(docs[-1])
+        if total_count is not None:
+            pecan.response.headers['X-Total-Count'] = str(total_count)
+
+        if include_attributes or exclude_attributes:
+            return [self.model.from_partial_dict(doc, include_attributes=include_attributes,
+                                                 exclude_attributes=exclude_attributes)
+                    for doc in docs]
+
+        return [self.model.from_dict(doc) for doc in docs]
+
+    def _get_projection(self, **kwargs):
+        """
+        Return the attributes to include and to exclude requested with the include_attributes
+        and exclude_attributes query parameters. Nested attributes are separated with dots.
+        """
+        include_attributes = kwargs.get('include_attributes')
+        exclude_attributes = kwargs.get('exclude_attributes')
+
+        if include_attributes and exclude_attributes:
+            pecan.abort(http_client.BAD_REQUEST,
+                        'include_attributes and exclude_attributes are mutually exclusive.')
+
+        attributes = [attr for attr in (include_attributes or exclude_attributes or '').split(',')
+                      if attr]
+        properties = self.model.schema.get('properties', {})
+        for attr in attributes:
+            if attr.split('.')[0] not in properties:
+                pecan.abort(http_client.BAD_REQUEST, 'Unknown attribute "%s".' % attr)
+
+        # The id is always returned.
+        attributes = [attr for attr in attributes if attr != 'id']
+
+        if include_attributes:
+            return attributes or ['id'], None
+        return None, attributes
+
+    def _get_total_count(self, **filters):
+        try:
+            return self.access.query(**filters).max_time_ms(self.count_max_time_ms).count()
+        except ExecutionTimeout:
+            LOG.warn('Counting %s with filters=%s exceeded %sms.', pecan.request.path, filters,
+                     self.count_max_time_ms)
+            return None
 
-        return [self.model.from_model(instance) for instance in instances[offset:eop]]
+    def _can_paginate_by_marker(self, filters, sort):
+        if not self.marker_field or sort:
+            return False
+        # Ranges might reverse the sort on the marker field.
+        value = filters.get(self.marker_field, None)
+        return not (isinstance(value, six.string_types) and '..' in value)
+
+    def _get_marker(self, doc):
+        value = doc
+        for attr in self.marker_field.split('__'):
+            value = value.get(attr) if isinstance(value, dict) else None
+        if isinstance(value, datetime.datetime):
+            value = {'$date': isotime.format(value)}
+        return base64.urlsafe_b64encode(json.dumps([value, str(doc['_id'])]))
+
+    def _get_marker_query(self, marker):
+        value, id = json.loads(base64.urlsafe_b64decode(str(marker)))
+        if isinstance(value, dict):
+            value = isotime.parse(value['$date'])
+        field = self.marker_field.replace('__', '.')
+        return {'$or': [{field: {'$lt': value}},
+                        {field: value, '_id': {'$lt': ObjectId(id)}}]}
 
 
 class ContentPackResourceControler(ResourceController):
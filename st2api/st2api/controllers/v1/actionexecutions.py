@@ -51,6 +51,8 @@ class ActionExecutionsController(ResourceController):
         'sort': ['-start_timestamp', 'action']
     }
 
+    marker_field = 'start_timestamp'
+
     def _get_action_executions(self, **kw):
         kw['limit'] = int(kw.get('limit', 50))
 
@@ -22,6 +22,7 @@ import six
 #       that bubble up to this layer should be core Python exceptions or
 #       StackStorm defined exceptions.
 
+from st2api import cache
 from st2api.controllers import resource
 from st2api.controllers.v1.actionviews import ActionViewsController
 from st2common import log as logging
@@ -59,6 +60,8 @@ class ActionsController(resource.ContentPackResourceControler):
 
     include_reference = True
 
+    response_cache = cache.get_cache(cache.ACTION)
+
     @staticmethod
     def _validate_action_parameters(action, runnertype_db):
         # check if action parameters conflict with those from the supplied runner_type.
@@ -18,6 +18,7 @@ from pecan import abort
 from pecan.rest import RestController
 import six
 
+from st2api import cache
 from st2api.controllers import resource
 from st2common.exceptions.db import StackStormDBObjectNotFoundError
 from st2common import log as logging
@@ -63,6 +64,7 @@ class LookupUtils(object):
 
 
 class ParametersViewController(RestController):
+    response_cache = cache.get_cache(cache.ACTION)
 
     @jsexpose(str, status_code=http_client.OK)
     def get_one(self, action_id):
@@ -97,6 +99,8 @@ class OverviewController(resource.ContentPackResourceControler):
 
     include_reference = True
 
+    response_cache = cache.get_cache(cache.ACTION)
+
     @jsexpose(str)
     def get_one(self, ref_or_id):
         """
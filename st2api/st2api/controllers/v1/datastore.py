@@ -70,7 +70,7 @@ class KeyValuePairController(RestController):
         """
         LOG.info('GET all /keys/ with filters=%s', kw)
 
-        kvp_dbs = KeyValuePair.get_all(**kw)
+        kvp_dbs = KeyValuePair.stream(**kw)
         kvps = [KeyValuePairAPI.from_model(kvp_db) for kvp_db in kvp_dbs]
         LOG.debug('GET all /keys/ client_result=%s', kvps)
 
@@ -38,6 +38,8 @@ class ActionExecutionHistoryController(resource.ResourceController):
         'sort': ['-execution__start_timestamp']
     }
 
+    marker_field = 'execution__start_timestamp'
+
     def _get_executions(self, **kw):
         action_ref = kw.get('action', None)
 
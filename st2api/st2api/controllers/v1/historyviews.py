@@ -13,13 +13,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from itertools import chain
+from oslo.config import cfg
 from pecan.rest import RestController
 import six
 
 from st2common import log as logging
 from st2common.models.api.base import jsexpose
-from st2common.persistence.history import ActionExecutionHistory
+from st2common.services import historyfilters
 
 LOG = logging.getLogger(__name__)
 
@@ -42,6 +42,25 @@ SUPPORTED_FILTERS = {
 IGNORE_FILTERS = ['parent', 'timestamp', 'execution']
 
 
+_filters_cache = None
+
+
+def get_filters_cache():
+    """
+    Return the cache of the distinct values of the filters which aren't ignored.
+
+    :rtype: :class:`historyfilters.FiltersCache`
+    """
+    global _filters_cache
+    if not _filters_cache:
+        filters = dict([(name, field) for name, field in six.iteritems(SUPPORTED_FILTERS)
+                        if name not in IGNORE_FILTERS])
+        _filters_cache = historyfilters.FiltersCache(
+            filters, window=cfg.CONF.api.history_filters_window or None,
+            refresh_interval=cfg.CONF.api.history_filters_refresh_interval or None)
+    return _filters_cache
+
+
 class FiltersController(RestController):
     @jsexpose()
     def get_all(self):
@@ -53,26 +72,7 @@ class FiltersController(RestController):
         """
         LOG.info('GET all /history/executions/views/filters')
 
-        filters = {}
-
-        for name, field in six.iteritems(SUPPORTED_FILTERS):
-            if name not in IGNORE_FILTERS:
-                if isinstance(field, six.string_types):
-                    query = '$' + field
-                else:
-                    dot_notation = list(chain.from_iterable(
-                        ('$' + item, '.') for item in field
-                    ))
-                    dot_notation.pop(-1)
-                    query = {'$concat': dot_notation}
-
-                aggregate = ActionExecutionHistory.aggregate([
-                    {'$group': {'_id': query}}
-                ])
-
-                filters[name] = [res['_id'] for res in aggregate['result'] if res['_id']]
-
-        return filters
+        return get_filters_cache().get_all()
 
 
 class HistoryViewsController(RestController):
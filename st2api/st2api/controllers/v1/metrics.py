@@ -0,0 +1,40 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pecan.rest import RestController
+
+from st2api import cache
+from st2common.models.api.base import jsexpose
+from st2common.models.db import profiler
+
+
+class MetricsController(RestController):
+    """
+    Implements the RESTful web endpoint that exposes the metrics collected by this process.
+    """
+
+    @jsexpose()
+    def get_all(self):
+        """
+            Return the latency histograms of the database operations and the hits and misses
+            of the response cache.
+
+            Handles requests:
+                GET /metrics/
+        """
+        return {
+            'database': profiler.get_stats(),
+            'response_cache': cache.get_stats()
+        }
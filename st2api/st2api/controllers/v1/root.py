@@ -19,6 +19,7 @@ from st2api.controllers.v1.actions import ActionsController
 from st2api.controllers.v1.actionexecutions import ActionExecutionsController
 from st2api.controllers.v1.datastore import KeyValuePairController
 from st2api.controllers.v1.history import HistoryController
+from st2api.controllers.v1.metrics import MetricsController
 from st2api.controllers.v1.rules import RuleController
 from st2api.controllers.v1.runnertypes import RunnerTypesController
 from st2api.controllers.v1.sensors import SensorTypeController
@@ -41,6 +42,7 @@ class RootController(object):
     history = HistoryController()
     webhooks = WebhooksController()
     stream = StreamController()
+    metrics = MetricsController()
 
     @expose(generic=True, template='index.html')
     def index(self):
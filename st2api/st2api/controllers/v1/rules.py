@@ -18,6 +18,7 @@ from pecan import abort
 from pecan.rest import RestController
 import six
 
+from st2api import cache
 from st2common import log as logging
 from st2common.exceptions.apivalidation import ValueValidationException
 from st2common.exceptions.db import StackStormDBObjectConflictError
@@ -36,6 +37,8 @@ class RuleController(RestController):
         Implements the RESTful web endpoint that handles
         the lifecycle of Rules in the system.
     """
+    response_cache = cache.get_cache(cache.RULE)
+
     @jsexpose(str)
     def get_one(self, id):
         """
@@ -18,6 +18,7 @@ from pecan import abort
 from pecan.rest import RestController
 import six
 
+from st2api import cache
 from st2common import log as logging
 from st2common.models.api.base import jsexpose
 from st2common.models.api.action import RunnerTypeAPI
@@ -33,6 +34,7 @@ class RunnerTypesController(RestController):
         Implements the RESTful web endpoint that handles
         the lifecycle of an RunnerType in the system.
     """
+    response_cache = cache.get_cache(cache.RUNNER_TYPE)
 
     @staticmethod
     def __get_by_id(id):
@@ -17,6 +17,7 @@ import six
 from st2common import log as logging
 from st2common.persistence.reactor import SensorType
 from st2common.models.api.reactor import SensorTypeAPI
+from st2api import cache
 from st2api.controllers import resource
 
 http_client = six.moves.http_client
@@ -37,3 +38,5 @@ class SensorTypeController(resource.ContentPackResourceControler):
     }
 
     include_reference = True
+
+    response_cache = cache.get_cache(cache.SENSOR_TYPE)
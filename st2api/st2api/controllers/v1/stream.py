@@ -37,7 +37,7 @@ def format(gen):
             yield '\n'
         else:
             (event, body) = pack
-            yield message % (event, json_encode(body, indent=None))
+            yield message % (event, json_encode(body))
 
 
 class StreamController(RestController):
@@ -24,6 +24,7 @@ from st2common.models.api.base import jsexpose
 from st2common.models.system.common import ResourceReference
 from st2common.persistence.reactor import TriggerType, Trigger, TriggerInstance
 from st2common.services import triggers as TriggerService
+from st2api import cache
 from st2api.controllers import resource
 from st2common.exceptions.apivalidation import ValueValidationException
 from st2common.exceptions.db import StackStormDBObjectConflictError
@@ -52,6 +53,8 @@ class TriggerTypeController(resource.ContentPackResourceControler):
 
     include_reference = True
 
+    response_cache = cache.get_cache(cache.TRIGGER_TYPE)
+
     @jsexpose(body=TriggerTypeAPI, status_code=http_client.CREATED)
     def post(self, triggertype):
         """
@@ -20,6 +20,7 @@ from webtest import TestApp
 
 
 import st2actions.bootstrap.runnersregistrar as runners_registrar
+from st2api import cache
 from st2common.middleware import auth
 from st2tests import DbTestCase
 import st2tests.config as tests_config
@@ -52,6 +53,11 @@ class FunctionalTest(DbTestCase):
 
         cls.app = load_test_app(config=cfg_dict)
 
+    def setUp(self):
+        super(FunctionalTest, self).setUp()
+        # Cached responses refer to objects which no longer exist.
+        cache.clear()
+
 
 class AuthMiddlewareTest(DbTestCase):
 
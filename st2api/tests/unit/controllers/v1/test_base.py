@@ -28,7 +28,7 @@ class TestBase(FunctionalTest):
         self.assertEqual(response.headers['Access-Control-Allow-Headers'],
                          'Content-Type,Authorization,X-Auth-Token')
         self.assertEqual(response.headers['Access-Control-Expose-Headers'],
-                         'Content-Type,X-Limit,X-Total-Count')
+                         'Content-Type,X-Limit,X-Total-Count,X-Next-Marker')
 
     def test_origin(self):
         response = self.app.get('/', headers={
@@ -65,3 +65,17 @@ class TestBase(FunctionalTest):
         self.assertEqual(response.status_int, 200)
         self.assertEqual(response.headers['Access-Control-Allow-Origin'],
                          '*')
+
+    def test_etag(self):
+        response = self.app.get('/v1/actions')
+        self.assertEqual(response.status_int, 200)
+        etag = response.headers['ETag']
+        self.assertTrue(etag.startswith('W/"'))
+
+        response = self.app.get('/v1/actions', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_int, 304)
+        self.assertEqual(response.body, '')
+
+        response = self.app.get('/v1/actions', headers={'If-None-Match': 'W/"outdated"'})
+        self.assertEqual(response.status_int, 200)
+        self.assertEqual(response.headers['ETag'], etag)
@@ -186,6 +186,54 @@ class TestActionExecutionHistory(FunctionalTest):
             retrieved += ids
         self.assertListEqual(sorted(retrieved), sorted(self.refs.keys()))
 
+    def test_pagination_by_marker(self):
+        retrieved = []
+        page_size = 10
+        url = '/v1/history/executions?limit=%s' % page_size
+        while url:
+            response = self.app.get(url)
+            self.assertEqual(response.status_int, 200)
+            self.assertLessEqual(len(response.json), page_size)
+            self.assertEqual(response.headers['X-Total-Count'], str(self.num_records))
+            ids = [item['id'] for item in response.json]
+            self.assertListEqual(sorted(list(set(ids) - set(retrieved))), sorted(ids))
+            retrieved += ids
+            marker = response.headers.get('X-Next-Marker', None)
+            url = ('/v1/history/executions?limit=%s&marker=%s' % (page_size, marker)
+                   if marker else None)
+        self.assertListEqual(sorted(retrieved), sorted(self.refs.keys()))
+
+    def test_invalid_marker(self):
+        response = self.app.get('/v1/history/executions?marker=foo', expect_errors=True)
+        self.assertEqual(response.status_int, 400)
+
+    def test_include_attributes(self):
+        response = self.app.get('/v1/history/executions?limit=5&'
+                                'include_attributes=execution.status,action')
+        self.assertEqual(response.status_int, 200)
+        self.assertEqual(len(response.json), 5)
+        for item in response.json:
+            self.assertListEqual(sorted(item.keys()), ['action', 'execution', 'id'])
+            self.assertListEqual(list(item['execution'].keys()), ['status'])
+
+    def test_exclude_attributes(self):
+        response = self.app.get('/v1/history/executions?limit=5&'
+                                'exclude_attributes=execution.result,runner')
+        self.assertEqual(response.status_int, 200)
+        self.assertEqual(len(response.json), 5)
+        for item in response.json:
+            self.assertNotIn('runner', item)
+            self.assertNotIn('result', item['execution'])
+            self.assertIn('status', item['execution'])
+
+    def test_invalid_projection(self):
+        response = self.app.get('/v1/history/executions?include_attributes=foo',
+                                expect_errors=True)
+        self.assertEqual(response.status_int, 400)
+        response = self.app.get('/v1/history/executions?include_attributes=action&'
+                                'exclude_attributes=runner', expect_errors=True)
+        self.assertEqual(response.status_int, 400)
+
     def test_datetime_range(self):
         dt_range = '2014-12-25T00:00:10Z..2014-12-25T00:00:19Z'
         response = self.app.get('/v1/history/executions?timestamp=%s' % dt_range)
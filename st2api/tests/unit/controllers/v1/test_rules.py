@@ -60,6 +60,17 @@ class TestRuleController(FunctionalTest):
         resp = self.app.get('/v1/rules')
         self.assertEqual(resp.status_int, http_client.OK)
 
+    def test_get_all_include_attributes(self):
+        post_resp = self.__do_post(TestRuleController.RULE_1)
+        rule_id = self.__get_rule_id(post_resp)
+        resp = self.app.get('/v1/rules?include_attributes=trigger')
+        self.assertEqual(resp.status_int, http_client.OK)
+        rule = [rule for rule in resp.json if rule['id'] == rule_id][0]
+        self.assertListEqual(sorted(rule.keys()), ['id', 'trigger'])
+        # The trigger is converted the same way as without a projection.
+        self.assertDictEqual(rule['trigger'], post_resp.json['trigger'])
+        self.__do_delete(rule_id)
+
     def test_get_one(self):
         post_resp = self.__do_post(TestRuleController.RULE_1)
         rule_id = self.__get_rule_id(post_resp)
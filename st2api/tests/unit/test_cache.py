@@ -0,0 +1,120 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pecan
+from pecan import abort
+from pecan.rest import RestController
+import six
+import unittest2
+from webtest import TestApp
+
+from st2api import cache
+from st2common.models.api.base import jsexpose
+
+http_client = six.moves.http_client
+
+
+class ThingsController(RestController):
+    response_cache = cache.get_cache(cache.RULE)
+
+    calls = 0
+
+    @jsexpose(str)
+    def get_one(self, id):
+        ThingsController.calls += 1
+        if id == 'missing':
+            abort(http_client.NOT_FOUND, 'Missing thing.')
+        return {'id': id}
+
+    @jsexpose()
+    def get_all(self, **kw):
+        ThingsController.calls += 1
+        pecan.response.headers['X-Total-Count'] = '1'
+        return [dict(kw, calls=ThingsController.calls)]
+
+    @jsexpose(str, status_code=http_client.NO_CONTENT)
+    def delete(self, id):
+        pass
+
+
+class RootController(object):
+    things = ThingsController()
+
+
+class ResponseCacheTest(unittest2.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = TestApp(pecan.make_app(RootController()))
+
+    def setUp(self):
+        cache.configure(max_size=cache.CACHE_MAX_SIZE, ttl=cache.CACHE_TTL)
+        ThingsController.calls = 0
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_get_all_is_cached(self):
+        before = cache.get_stats()[cache.RULE]
+
+        resp = self.app.get('/things?a=1&b=2')
+        self.assertEqual(resp.json, [{'a': '1', 'b': '2', 'calls': 1}])
+
+        # Order of the query parameters doesn't matter.
+        resp = self.app.get('/things?b=2&a=1')
+        self.assertEqual(resp.json, [{'a': '1', 'b': '2', 'calls': 1}])
+        self.assertEqual(resp.headers['X-Total-Count'], '1')
+        self.assertEqual(ThingsController.calls, 1)
+
+        resp = self.app.get('/things?a=2')
+        self.assertEqual(resp.json, [{'a': '2', 'calls': 2}])
+
+        stats = cache.get_stats()[cache.RULE]
+        self.assertEqual(stats['size'], 2)
+        self.assertEqual(stats['hits'] - before['hits'], 1)
+        self.assertEqual(stats['misses'] - before['misses'], 2)
+
+    def test_errors_are_not_cached(self):
+        self.app.get('/things/missing', expect_errors=True)
+        resp = self.app.get('/things/missing', expect_errors=True)
+        self.assertEqual(resp.status_int, http_client.NOT_FOUND)
+        self.assertEqual(ThingsController.calls, 2)
+
+    def test_write_drops_cached_responses(self):
+        self.app.get('/things/1')
+        self.app.delete('/things/1')
+        self.app.get('/things/1')
+        self.assertEqual(ThingsController.calls, 2)
+
+    def test_invalidate_dependent_resources(self):
+        action_cache = cache.get_cache(cache.ACTION)
+        action_cache.set('key', 'response')
+        cache.invalidate(cache.RUNNER_TYPE)
+        self.assertIsNone(action_cache.get('key'))
+
+    def test_hit_rate(self):
+        response_cache = cache.ResponseCache(cache.RULE)
+        self.assertEqual(response_cache.get_stats()['hit_rate'], 0.0)
+        response_cache.get('key')
+        response_cache.set('key', 'response')
+        response_cache.get('key')
+        self.assertEqual(response_cache.get_stats()['hit_rate'], 0.5)
+
+    def test_disabled(self):
+        cache.configure(max_size=0, ttl=0)
+        self.app.get('/things/1')
+        self.app.get('/things/1')
+        self.assertEqual(ThingsController.calls, 2)
+        self.assertEqual(cache.get_stats()[cache.RULE]['size'], 0)
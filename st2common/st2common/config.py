@@ -73,6 +73,19 @@ def register_opts(ignore_errors=False):
         cfg.StrOpt('db_name', default='st2', help='name of database'),
         cfg.StrOpt('username', help='username for db login'),
         cfg.StrOpt('password', help='password for db login'),
+        cfg.BoolOpt('query_audit', default=False,
+                    help='Record the shapes of the database queries and whether they are '
+                         'served by an index.'),
+        cfg.StrOpt('query_audit_file', default=None,
+                   help='File the recorded query shapes are written to on exit. The id of '
+                        'the process is appended to the file name so every service writes '
+                        'its own report.'),
+        cfg.IntOpt('stream_batch_size', default=100,
+                   help='Number of documents fetched per round trip when query results are '
+                        'streamed.'),
+        cfg.IntOpt('slow_query_threshold', default=500,
+                   help='Database operations slower than this number of milliseconds are '
+                        'logged. 0 disables the slow query log.')
     ]
     _do_register_opts(db_opts, 'database', ignore_errors)
 
@@ -102,6 +115,26 @@ def register_opts(ignore_errors=False):
     ]
     _do_register_opts(log_opts, 'log', ignore_errors)
 
+    retention_opts = [
+        cfg.IntOpt('executions_ttl', default=0,
+                   help='Days after which action executions are purged. 0 keeps them forever.'),
+        cfg.IntOpt('history_ttl', default=0,
+                   help='Days after which execution history records are purged. 0 keeps them '
+                        'forever.'),
+        cfg.IntOpt('trigger_instances_ttl', default=0,
+                   help='Days after which trigger instances are purged. 0 keeps them forever.'),
+        cfg.ListOpt('statuses', default=['succeeded', 'failed'],
+                    help='Only executions and history records with these statuses are purged.'),
+        cfg.IntOpt('batch_size', default=1000,
+                   help='Maximum number of documents deleted at once.'),
+        cfg.IntOpt('purge_interval', default=3600,
+                   help='Seconds between two purges.'),
+        cfg.StrOpt('archive_dir', default=None,
+                   help='Directory the purged documents are archived to as gzipped JSON lines '
+                        'files. They are not archived if not set.')
+    ]
+    _do_register_opts(retention_opts, 'retention', ignore_errors)
+
     # Common API options
     api_opts = [
         cfg.StrOpt('host', default='0.0.0.0', help='StackStorm API server host'),
@@ -31,3 +31,16 @@ class StackStormDBObjectConflictError(StackStormBaseException):
     def __init__(self, message, conflict_id):
         super(StackStormDBObjectConflictError, self).__init__(message)
         self.conflict_id = conflict_id
+
+
+class StackStormDBBulkWriteError(StackStormBaseException):
+    """
+    Exception that captures the failures of a bulk write. Objects which were written
+    regardless are available in written. Write errors of the objects are in errors, errors of
+    the write concern, which aren't tied to an object, are in write_concern_errors.
+    """
+    def __init__(self, message, written, errors, write_concern_errors=None):
+        super(StackStormDBBulkWriteError, self).__init__(message)
+        self.written = written
+        self.errors = errors
+        self.write_concern_errors = write_concern_errors or []
@@ -13,6 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
 
 import webob
 from oslo.config import cfg
@@ -21,6 +22,7 @@ from six.moves.urllib import parse as urlparse
 
 from st2common import log as logging
 from st2common.exceptions import access as exceptions
+from st2common.models.db import profiler
 from st2common.util.jsonify import json_encode
 from st2common.util.auth import validate_token
 
@@ -46,7 +48,8 @@ class CorsHook(PecanHook):
 
         methods_allowed = ['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS']
         request_headers_allowed = ['Content-Type', 'Authorization', 'X-Auth-Token']
-        response_headers_allowed = ['Content-Type', 'X-Limit', 'X-Total-Count']
+        response_headers_allowed = ['Content-Type', 'X-Limit', 'X-Total-Count',
+                                    'X-Next-Marker']
 
         headers['Access-Control-Allow-Origin'] = origin_allowed
         headers['Access-Control-Allow-Methods'] = ','.join(methods_allowed)
@@ -61,6 +64,60 @@ class CorsHook(PecanHook):
             return webob.Response()
 
 
+class DBProfilingHook(PecanHook):
+    """
+    Counts the database round trips made to serve a request and reports them in the
+    X-DB-Round-Trips response header.
+    """
+
+    def before(self, state):
+        name = '%s %s' % (state.request.method, state.request.path)
+        profiler.set_counter(profiler.RoundTripCounter(name))
+
+    def after(self, state):
+        counter = profiler.get_counter()
+        if not counter:
+            return
+
+        profiler.set_counter(None)
+        state.response.headers['X-DB-Round-Trips'] = str(counter.round_trips)
+        LOG.debug('%s made %s database round trips in %.1fms', counter.name,
+                  counter.round_trips, counter.duration_ms)
+
+    def on_error(self, state, e):
+        profiler.set_counter(None)
+
+
+class ETagHook(PecanHook):
+    """
+    Sets a weak ETag computed from the body of the JSON responses to GET requests, and replies
+    304 Not Modified without a body when the client sends a matching If-None-Match header.
+    """
+
+    def after(self, state):
+        request = state.request
+        response = state.response
+        if request.method != 'GET' or response.status_int != 200:
+            return
+        if response.content_type != 'application/json':
+            return
+
+        etag = hashlib.md5(response.body).hexdigest()
+        response.headers['ETag'] = 'W/"%s"' % etag
+
+        if self._matches(request.headers.get('If-None-Match', None), etag):
+            response.status = 304
+            response.body = ''
+
+    @staticmethod
+    def _matches(if_none_match, etag):
+        if not if_none_match:
+            return False
+        # The comparison is weak so W/ prefixes are ignored.
+        tags = [tag.strip() for tag in if_none_match.split(',')]
+        return '*' in tags or any(tag.replace('W/', '', 1).strip('"') == etag for tag in tags)
+
+
 class AuthHook(PecanHook):
 
     def before(self, state):
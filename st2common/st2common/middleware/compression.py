@@ -0,0 +1,69 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gzip
+import io
+
+import webob
+
+from st2common import log as logging
+
+
+LOG = logging.getLogger(__name__)
+
+
+class GzipMiddleware(object):
+    """
+    WSGI middleware which compresses the responses with gzip for the clients which accept it.
+    Streamed responses, such as event streams, and small responses aren't compressed.
+    """
+
+    def __init__(self, app, min_size=1024, compress_level=6):
+        """
+        :param min_size: Responses with fewer bytes aren't compressed.
+        :type min_size: ``int``
+
+        :param compress_level: Compression level from 1 (fastest) to 9 (smallest).
+        :type compress_level: ``int``
+        """
+        self.app = app
+        self.min_size = min_size
+        self.compress_level = compress_level
+
+    def __call__(self, environ, start_response):
+        request = webob.Request(environ)
+        if not environ.get('HTTP_ACCEPT_ENCODING') or 'gzip' not in request.accept_encoding:
+            return self.app(environ, start_response)
+
+        response = request.get_response(self.app)
+        if self._should_compress(response):
+            self._compress(response)
+        return response(environ, start_response)
+
+    def _should_compress(self, response):
+        if response.content_encoding or response.status_int < 200 or response.status_int >= 300:
+            return False
+        # Responses without a length are streamed.
+        if response.content_length is None or response.content_length < self.min_size:
+            return False
+        return response.content_type != 'text/event-stream'
+
+    def _compress(self, response):
+        buf = io.BytesIO()
+        with gzip.GzipFile(mode='wb', fileobj=buf, compresslevel=self.compress_level) as fd:
+            fd.write(response.body)
+        response.body = buf.getvalue()
+        response.content_encoding = 'gzip'
+        response.vary = tuple(response.vary or ()) + ('Accept-Encoding',)
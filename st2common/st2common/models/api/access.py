@@ -73,10 +73,17 @@ class TokenAPI(BaseAPI):
     }
 
     @classmethod
-    def from_model(cls, model):
-        doc = super(cls, cls)._from_model(model)
-        doc['expiry'] = isotime.format(model.expiry, offset=False) if model.expiry else None
-        return cls(**doc)
+    def _from_doc(cls, doc):
+        doc = super(cls, cls)._from_doc(doc)
+        if doc.get('expiry'):
+            doc['expiry'] = isotime.format(doc['expiry'], offset=False)
+        return doc
+
+    @classmethod
+    def from_dict(cls, doc):
+        doc = cls._from_doc(doc)
+        doc['expiry'] = doc.get('expiry') or None
+        return cls._from_trusted(**doc)
 
     @classmethod
     def to_model(cls, token):
@@ -13,7 +13,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import jsonschema
 
 from st2common.util import isotime
 from st2common.util import schema as util_schema
@@ -86,17 +85,14 @@ class RunnerTypeAPI(BaseAPI):
         "additionalProperties": False
     }
 
-    def __init__(self, **kw):
-        # Ideally, you should not do that. You should not redefine __init__ to validate and then set
-        # default values, instead you should define defaults in schema and use BaseAPI __init__
-        # validator to unwrap them. The problem here is that draft schema also contains default
-        # values and we don't want them to be unwrapped at the same time. I've tried to remove the
-        # default values from draft schema, but, either because of a bug or some weird intention, it
-        # has continued to resolve $ref'erenced properties against the initial draft schema, not the
-        # modified one
-        jsonschema.validate(kw, self.schema, util_schema.get_validator())
-        for key, value in kw.items():
-            setattr(self, key, value)
+    def _initialize(self, **kw):
+        # Ideally, you should not do that. You should not redefine _initialize to set default
+        # values, instead you should define defaults in schema and use a validator to unwrap them.
+        # The problem here is that draft schema also contains default values and we don't want
+        # them to be unwrapped at the same time. I've tried to remove the default values from
+        # draft schema, but, either because of a bug or some weird intention, it has continued to
+        # resolve $ref'erenced properties against the initial draft schema, not the modified one
+        super(RunnerTypeAPI, self)._initialize(**kw)
         if not hasattr(self, 'runner_parameters'):
             setattr(self, 'runner_parameters', dict())
 
@@ -169,21 +165,30 @@ class ActionAPI(BaseAPI):
         "additionalProperties": False
     }
 
-    def __init__(self, **kw):
-        jsonschema.validate(kw, self.schema, util_schema.get_validator())
-        for key, value in kw.items():
-            setattr(self, key, value)
+    def _initialize(self, **kw):
+        super(ActionAPI, self)._initialize(**kw)
         if not hasattr(self, 'parameters'):
             setattr(self, 'parameters', dict())
         if not hasattr(self, 'entry_point'):
             setattr(self, 'entry_point', '')
 
     @classmethod
-    def from_model(cls, model):
-        action = cls._from_model(model)
-        action['runner_type'] = action['runner_type']['name']
-        action['tags'] = TagsHelper.from_model(model.tags)
-        return cls(**action)
+    def _from_doc(cls, doc):
+        action = super(cls, cls)._from_doc(doc)
+
+        # The action might be partially loaded.
+        if 'runner_type' in action:
+            action['runner_type'] = action['runner_type']['name']
+        if 'tags' in action:
+            action['tags'] = TagsHelper.from_dict(action['tags'])
+
+        return action
+
+    @classmethod
+    def from_dict(cls, doc):
+        action = cls._from_doc(doc)
+        action.setdefault('tags', [])
+        return cls._from_trusted(**action)
 
     @classmethod
     def to_model(cls, action):
@@ -266,13 +271,17 @@ class ActionExecutionAPI(BaseAPI):
     }
 
     @classmethod
-    def from_model(cls, model):
-        doc = super(cls, cls)._from_model(model)
-        if model.start_timestamp:
-            doc['start_timestamp'] = isotime.format(model.start_timestamp, offset=False)
-        if model.end_timestamp:
-            doc['end_timestamp'] = isotime.format(model.end_timestamp, offset=False)
-        return cls(**doc)
+    def _from_doc(cls, doc):
+        doc = super(cls, cls)._from_doc(doc)
+        if doc.get('start_timestamp', None):
+            doc['start_timestamp'] = isotime.format(doc['start_timestamp'], offset=False)
+        if doc.get('end_timestamp', None):
+            doc['end_timestamp'] = isotime.format(doc['end_timestamp'], offset=False)
+        return doc
+
+    @classmethod
+    def from_dict(cls, doc):
+        return cls._from_trusted(**cls._from_doc(doc))
 
     @classmethod
     def to_model(cls, execution):
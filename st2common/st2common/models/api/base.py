@@ -33,17 +33,47 @@ from st2common import log as logging
 LOG = logging.getLogger(__name__)
 VALIDATOR = util_schema.get_validator(assign_property_default=False)
 
+# Number of spaces responses are indented with when the pretty query parameter is provided.
+PRETTY_INDENT = 4
+
 
 @six.add_metaclass(abc.ABCMeta)
 class BaseAPI(object):
     schema = abc.abstractproperty
 
     def __init__(self, **kw):
-        VALIDATOR(getattr(self, 'schema', {})).validate(kw)
+        self.get_validator().validate(kw)
+        self._initialize(**kw)
 
+    def _initialize(self, **kw):
         for key, value in kw.items():
             setattr(self, key, value)
 
+    @classmethod
+    def get_validator(cls):
+        """
+        Return the validator for the schema of this class. The schema is checked and the
+        validator is built once per class.
+        """
+        # Look in the class itself, subclasses have schemas of their own.
+        validator = cls.__dict__.get('_validator', None)
+        if validator is None:
+            schema = getattr(cls, 'schema', {})
+            VALIDATOR.check_schema(schema)
+            validator = VALIDATOR(schema)
+            cls._validator = validator
+        return validator
+
+    @classmethod
+    def _from_trusted(cls, **kw):
+        """
+        Return an instance for attributes which don't need to be validated, i.e. the ones of a
+        document read from the database.
+        """
+        instance = cls.__new__(cls)
+        instance._initialize(**kw)
+        return instance
+
     def __repr__(self):
         name = type(self).__name__
         attrs = ', '.join("'%s':%r" % item for item in six.iteritems(vars(self)))
@@ -60,17 +90,63 @@ class BaseAPI(object):
         return vars(self)
 
     @classmethod
-    def _from_model(cls, model):
-        doc = util_mongodb.unescape_chars(model.to_mongo())
+    def _from_doc(cls, doc):
+        doc = util_mongodb.unescape_chars(doc)
         if '_id' in doc:
             doc['id'] = str(doc.pop('_id'))
         return doc
 
     @classmethod
     def from_model(cls, model):
-        doc = cls._from_model(model)
+        return cls.from_dict(model.to_mongo())
+
+    @classmethod
+    def from_dict(cls, doc):
+        """
+        Return an API object for a document as stored in the database, such as the ones
+        returned by :meth:`MongoDBAccess.query_raw`. No model is built for the document.
+
+        :param doc: Document as stored in the database. It might be modified.
+        :type doc: ``dict``
+        """
+        doc = cls._from_doc(doc)
         attrs = {attr: value for attr, value in six.iteritems(doc) if value is not None}
-        return cls(**attrs)
+        return cls._from_trusted(**attrs)
+
+    @classmethod
+    def from_partial_model(cls, model, include_attributes=None, exclude_attributes=None):
+        return cls.from_partial_dict(model.to_mongo(), include_attributes=include_attributes,
+                                     exclude_attributes=exclude_attributes)
+
+    @classmethod
+    def from_partial_dict(cls, doc, include_attributes=None, exclude_attributes=None):
+        """
+        Return an API object for a document which was loaded with a projection. Only the
+        loaded attributes are converted and set, and the object isn't validated since
+        attributes required by the schema might be missing. Models which convert attributes
+        of the stored document do it in :meth:`_from_doc` so both paths convert them.
+
+        :param include_attributes: Attributes the document was loaded with. The id is always
+                                   set.
+        :type include_attributes: ``list``
+
+        :param exclude_attributes: Attributes the document was loaded without.
+        :type exclude_attributes: ``list``
+        """
+        doc = cls._from_doc(doc)
+
+        if include_attributes:
+            attrs = set([attr.split('.')[0] for attr in include_attributes] + ['id'])
+            doc = {attr: value for attr, value in six.iteritems(doc) if attr in attrs}
+        if exclude_attributes:
+            doc = {attr: value for attr, value in six.iteritems(doc)
+                   if attr not in exclude_attributes}
+
+        instance = cls.__new__(cls)
+        for key, value in six.iteritems(doc):
+            if value is not None:
+                setattr(instance, key, value)
+        return instance
 
     @classmethod
     def to_model(cls, doc):
@@ -96,6 +172,14 @@ def _handle_error(e, status_code, body=None, headers=None):
     return json_encode(error_body)
 
 
+def _get_response_cache_key():
+    """
+    Return the key responses to the current request are cached with: the path and the query
+    parameters, sorted so their order doesn't matter.
+    """
+    return pecan.request.path, tuple(sorted(pecan.request.GET.items()))
+
+
 def jsexpose(*argtypes, **opts):
     content_type = opts.get('content_type', 'application/json')
 
@@ -106,6 +190,12 @@ def jsexpose(*argtypes, **opts):
     def decorate(f):
         @functools.wraps(f)
         def callfunction(*args, **kwargs):
+            # Responses are compact unless they are requested to be indented with ?pretty.
+            pretty = kwargs.pop('pretty', None)
+            indent = None
+            if pretty is not None and pretty.lower() not in ['0', 'false']:
+                indent = PRETTY_INDENT
+
             try:
                 args = list(args)
                 types = list(argtypes)
@@ -150,16 +240,40 @@ def jsexpose(*argtypes, **opts):
 
                 if status_code and status_code in noop_codes:
                     pecan.response.status = status_code
-                    return json_encode(None)
+                    return json_encode(None, indent=indent)
+
+                # Controllers with a response_cache serve the GET responses from it. Any other
+                # request to them modifies the resource so the cached responses are dropped.
+                response_cache = getattr(more[0], 'response_cache', None)
+                cache_key = None
+                if response_cache is not None and pecan.request.method == 'GET':
+                    cache_key = _get_response_cache_key()
+                    cached = response_cache.get(cache_key)
+                    if cached is not None:
+                        body, headers = cached
+                        pecan.response.headers.update(headers)
+                        if status_code:
+                            pecan.response.status = status_code
+                        return body
+                    headers_before = dict(pecan.response.headers)
 
                 try:
                     result = f(*args, **kwargs)
                     if status_code:
                         pecan.response.status = status_code
                     if content_type == 'application/json':
-                        return json_encode(result)
-                    else:
-                        return result
+                        result = json_encode(result, indent=indent)
+
+                    if response_cache is not None and cache_key is None:
+                        response_cache.clear()
+                    elif cache_key is not None and pecan.response.status_int == http_client.OK:
+                        # Keep the headers set by the controller, e.g. X-Total-Count.
+                        headers = dict([(name, value) for name, value
+                                        in six.iteritems(dict(pecan.response.headers))
+                                        if headers_before.get(name) != value])
+                        response_cache.set(cache_key, (result, headers))
+
+                    return result
                 except exc.HTTPException as e:
                     LOG.exception('API call failed.')
                     # Exception contains pecan.response.header + more. This is per implementation
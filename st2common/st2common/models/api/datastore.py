@@ -54,17 +54,22 @@ class KeyValuePairAPI(BaseAPI):
     }
 
     @classmethod
-    def from_model(cls, model):
-        doc = cls._from_model(model)
+    def _from_doc(cls, doc):
+        doc = super(cls, cls)._from_doc(doc)
 
         if 'id' in doc:
             del doc['id']
 
-        if model.expire_timestamp:
-            doc['expire_timestamp'] = isotime.format(model.expire_timestamp, offset=False)
+        if doc.get('expire_timestamp', None):
+            doc['expire_timestamp'] = isotime.format(doc['expire_timestamp'], offset=False)
 
+        return doc
+
+    @classmethod
+    def from_dict(cls, doc):
+        doc = cls._from_doc(doc)
         attrs = {attr: value for attr, value in six.iteritems(doc) if value is not None}
-        return cls(**attrs)
+        return cls._from_trusted(**attrs)
 
     @classmethod
     def to_model(cls, kvp):
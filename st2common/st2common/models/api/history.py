@@ -67,19 +67,22 @@ class ActionExecutionHistoryAPI(BaseAPI):
     }
 
     @classmethod
-    def from_model(cls, model):
-        doc = cls._from_model(model)
-        start_timestamp = isotime.format(doc['execution']['start_timestamp'], offset=False)
+    def _from_doc(cls, doc):
+        doc = super(cls, cls)._from_doc(doc)
+        execution = doc.get('execution', {})
 
-        end_timestamp = doc['execution'].get('end_timestamp', None)
-        if end_timestamp is not None:
-            end_timestamp = isotime.format(end_timestamp, offset=False)
-            doc['execution']['end_timestamp'] = end_timestamp
+        # The execution might be partially loaded.
+        for attr in ['start_timestamp', 'end_timestamp']:
+            if execution.get(attr, None) is not None:
+                execution[attr] = isotime.format(execution[attr], offset=False)
 
-        doc['execution']['start_timestamp'] = start_timestamp
+        return doc
 
+    @classmethod
+    def from_dict(cls, doc):
+        doc = cls._from_doc(doc)
         attrs = {attr: value for attr, value in six.iteritems(doc) if value}
-        return cls(**attrs)
+        return cls._from_trusted(**attrs)
 
     @classmethod
     def to_model(cls, instance):
@@ -107,10 +107,18 @@ class TriggerTypeAPI(BaseAPI):
         return model
 
     @classmethod
-    def from_model(cls, model):
-        triggertype = cls._from_model(model)
-        triggertype['tags'] = TagsHelper.from_model(model.tags)
-        return cls(**triggertype)
+    def _from_doc(cls, doc):
+        triggertype = super(cls, cls)._from_doc(doc)
+        # The trigger type might be partially loaded.
+        if 'tags' in triggertype:
+            triggertype['tags'] = TagsHelper.from_dict(triggertype['tags'])
+        return triggertype
+
+    @classmethod
+    def from_dict(cls, doc):
+        triggertype = cls._from_doc(doc)
+        triggertype.setdefault('tags', [])
+        return cls._from_trusted(**triggertype)
 
 
 class TriggerAPI(BaseAPI):
@@ -143,9 +151,9 @@ class TriggerAPI(BaseAPI):
     }
 
     @classmethod
-    def from_model(cls, model):
-        trigger = cls._from_model(model)
-        return cls(**trigger)
+    def from_dict(cls, doc):
+        trigger = cls._from_doc(doc)
+        return cls._from_trusted(**trigger)
 
     @classmethod
     def to_model(cls, trigger):
@@ -191,10 +199,17 @@ class TriggerInstanceAPI(BaseAPI):
     }
 
     @classmethod
-    def from_model(cls, model):
-        instance = cls._from_model(model)
-        instance['occurrence_time'] = isotime.format(instance['occurrence_time'], offset=False)
-        return cls(**instance)
+    def _from_doc(cls, doc):
+        instance = super(cls, cls)._from_doc(doc)
+        # The trigger instance might be partially loaded.
+        if 'occurrence_time' in instance:
+            instance['occurrence_time'] = isotime.format(instance['occurrence_time'],
+                                                         offset=False)
+        return instance
+
+    @classmethod
+    def from_dict(cls, doc):
+        return cls._from_trusted(**cls._from_doc(doc))
 
     @classmethod
     def to_model(cls, instance):
@@ -130,18 +130,29 @@ class RuleAPI(BaseAPI):
     }
 
     @classmethod
-    def from_model(cls, model):
-        rule = cls._from_model(model)
-        trigger_db = reference.get_model_by_resource_ref(Trigger, model.trigger)
-
-        if not trigger_db:
-            raise ValueError('Missing TriggerDB object for rule %s' % (rule['id']))
-
-        rule['trigger'] = vars(TriggerAPI.from_model(trigger_db))
-        del rule['trigger']['id']
-        del rule['trigger']['name']
-        rule['tags'] = TagsHelper.from_model(model.tags)
-        return cls(**rule)
+    def _from_doc(cls, doc):
+        rule = super(cls, cls)._from_doc(doc)
+
+        # The rule might be partially loaded.
+        if 'trigger' in rule:
+            trigger_db = reference.get_model_by_resource_ref(Trigger, rule['trigger'])
+
+            if not trigger_db:
+                raise ValueError('Missing TriggerDB object for rule %s' % (rule['id']))
+
+            rule['trigger'] = vars(TriggerAPI.from_model(trigger_db))
+            del rule['trigger']['id']
+            del rule['trigger']['name']
+        if 'tags' in rule:
+            rule['tags'] = TagsHelper.from_dict(rule['tags'])
+
+        return rule
+
+    @classmethod
+    def from_dict(cls, doc):
+        rule = cls._from_doc(doc)
+        rule.setdefault('tags', [])
+        return cls._from_trusted(**rule)
 
     @classmethod
     def to_model(cls, rule):
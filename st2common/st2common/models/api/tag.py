@@ -25,3 +25,8 @@ class TagsHelper(object):
     @staticmethod
     def from_model(tags):
         return [{'name': tag.name, 'value': tag.value} for tag in tags]
+
+    @staticmethod
+    def from_dict(tags):
+        return [{'name': tag.get('name', None), 'value': tag.get('value', None)}
+                for tag in tags or []]
@@ -1,9 +1,15 @@
 import importlib
+import time
 
+import bson
 import mongoengine
+from oslo.config import cfg
+from pymongo.errors import BulkWriteError
+import six
 
 from st2common.util import isotime
-from st2common.models.db import stormbase
+from st2common.models.db import profiler
+from st2common.models.db import queryaudit
 from st2common import log as logging
 
 
@@ -30,6 +36,12 @@ def db_setup(db_name, db_host, db_port, username=None, password=None):
     # lazy index creation
     db_ensure_indexes()
 
+    if hasattr(cfg.CONF.database, 'query_audit') and cfg.CONF.database.query_audit:
+        queryaudit.enable(report_path=cfg.CONF.database.query_audit_file)
+
+    if hasattr(cfg.CONF.database, 'slow_query_threshold'):
+        profiler.configure(slow_query_threshold_ms=cfg.CONF.database.slow_query_threshold)
+
     return connection
 
 
@@ -40,8 +52,8 @@ def db_ensure_indexes():
     Note #1: When calling this method database connection already needs to be
     established.
 
-    Note #2: This method blocks until all the index have been created (indexes
-    are created in real-time and not in background).
+    Note #2: This method blocks until all the index have been created. Indexes are built
+    in background so building new indexes on large collections doesn't lock the database.
     """
     LOG.debug('Ensuring database indexes...')
 
@@ -49,7 +61,13 @@ def db_ensure_indexes():
         module = importlib.import_module(module_name)
         model_classes = getattr(module, 'MODELS', [])
         for cls in model_classes:
+            # Indexes of existing deployments which conflict with the ones of the model are
+            # migrated first, e.g. an index which became unique.
+            migrate_indexes = getattr(cls, 'migrate_indexes', None)
+            if migrate_indexes:
+                migrate_indexes()
             LOG.debug('Ensuring indexes for model "%s"...' % (cls.__name__))
+            cls._meta['index_background'] = True
             cls.ensure_indexes()
 
 
@@ -109,9 +127,11 @@ class MongoDBAccess(object):
     def get_by_id(self, value):
         return self.get(id=value, raise_exception=True)
 
+    @profiler.profiled('get')
     def get(self, *args, **kwargs):
         raise_exception = kwargs.pop('raise_exception', False)
         instances = self.model.objects(**kwargs)
+        queryaudit.record(self.model, kwargs, queryset=instances)
         instance = instances[0] if instances else None
         if not instance and raise_exception:
             raise ValueError('Unable to find the %s instance. %s' % (self.model.__name__, kwargs))
@@ -120,8 +140,11 @@ class MongoDBAccess(object):
     def get_all(self, *args, **kwargs):
         return self.query(*args, **kwargs)
 
+    @profiler.profiled('count')
     def count(self, *args, **kwargs):
-        return self.model.objects(**kwargs).count()
+        instances = self.model.objects(**kwargs)
+        queryaudit.record(self.model, kwargs, queryset=instances)
+        return instances.count()
 
     @process_null_filter
     @process_datetime_ranges
@@ -130,24 +153,233 @@ class MongoDBAccess(object):
         limit = kwargs.pop('limit', None)
         eop = offset + int(limit) if limit else None
         order_by = kwargs.pop('order_by', [])
-        return self.model.objects(**kwargs).order_by(*order_by)[offset:eop]
-
+        instances = self.model.objects(**kwargs).order_by(*order_by)[offset:eop]
+        queryaudit.record(self.model, kwargs, order_by=order_by, queryset=instances)
+        return instances
+
+    @profiler.profiled('query_raw')
+    def query_raw(self, *args, **kwargs):
+        """
+        Return the documents matching a query as plain dicts read with pymongo, without
+        building the models. Accepts the same arguments as :meth:`query`. Documents are as
+        stored in the database, i.e. with an _id and with the keys of the dict fields escaped.
+
+        :param only: Names of the only fields to load. Nested fields are separated with dots.
+        :type only: ``list``
+
+        :param exclude: Names of the fields not to load.
+        :type exclude: ``list``
+
+        :rtype: ``list``
+        """
+        only = kwargs.pop('only', None)
+        exclude = kwargs.pop('exclude', None)
+        instances = self.query(*args, **kwargs)
+        if only:
+            instances = instances.only(*only)
+        if exclude:
+            instances = instances.exclude(*exclude)
+        # The pymongo cursor of the query set applies the filters, the sort, the pagination
+        # and the projection of the query set, and returns the documents as is.
+        return list(instances._cursor)
+
+    def stream(self, *args, **kwargs):
+        """
+        Iterate over the results of a query without caching them, fetching them from a
+        server-side cursor one batch at a time. Accepts the same arguments as :meth:`query`.
+
+        :param batch_size: Number of documents fetched per round trip. Defaults to
+                           database.stream_batch_size.
+        :type batch_size: ``int``
+
+        :param no_cursor_timeout: If True, the cursor doesn't time out on the server while the
+                                  results are slowly consumed. It is closed once the results
+                                  are consumed or the iteration is abandoned.
+        :type no_cursor_timeout: ``bool``
+        """
+        batch_size = kwargs.pop('batch_size', None) or cfg.CONF.database.stream_batch_size
+        no_cursor_timeout = kwargs.pop('no_cursor_timeout', False)
+        instances = self.query(*args, **kwargs).no_cache().batch_size(batch_size)
+        instances = iter(instances.timeout(not no_cursor_timeout))
+
+        # Only the time spent waiting for the database is recorded, not the processing of
+        # the results by the caller.
+        duration = 0.0
+        try:
+            while True:
+                start = time.time()
+                try:
+                    instance = next(instances)
+                except StopIteration:
+                    return
+                finally:
+                    duration += time.time() - start
+                yield instance
+        finally:
+            if instances._cursor_obj:
+                instances._cursor_obj.close()
+            profiler.record(self.model, 'stream', duration * 1000, kwargs)
+
+    @profiler.profiled('distinct')
     def distinct(self, *args, **kwargs):
         field = kwargs.pop('field')
-        return self.model.objects(**kwargs).distinct(field)
+        instances = self.model.objects(**kwargs)
+        queryaudit.record(self.model, kwargs, queryset=instances)
+        return instances.distinct(field)
 
+    @profiler.profiled('aggregate')
     def aggregate(self, *args, **kwargs):
         return self.model.objects(**kwargs)._collection.aggregate(*args, **kwargs)
 
     @staticmethod
+    @profiler.profiled('save')
     def add_or_update(instance):
         instance.save()
-        for attr, field in instance._fields.iteritems():
-            if isinstance(field, stormbase.EscapedDictField):
-                value = getattr(instance, attr)
-                setattr(instance, attr, field.to_python(value))
         return instance
 
     @staticmethod
+    @profiler.profiled('update')
+    def update(instance, **kwargs):
+        updates = {'set__%s' % attr: value for attr, value in six.iteritems(kwargs)}
+        if not instance.update(**updates):
+            raise ValueError('Unable to find the %s instance. %s' %
+                             (instance.__class__.__name__, {'id': instance.id}))
+        for attr, value in six.iteritems(kwargs):
+            setattr(instance, attr, value)
+        return instance
+
+    @profiler.profiled('bulk_add')
+    def bulk_add(self, instances, ordered=True):
+        """
+        Insert many new instances with a single bulk write.
+
+        :param ordered: If True, the instances are inserted in order and the first failure
+                        stops the write. Otherwise all the instances are attempted.
+        :type ordered: ``bool``
+
+        :return: (inserted instances, write errors, write concern errors) tuple. Write concern
+                 errors aren't tied to an instance, the instances are written regardless.
+        :rtype: ``tuple``
+        """
+        instances = list(instances)
+        bulk = self._initialize_bulk_op(ordered)
+        for instance in instances:
+            instance.validate()
+            if instance.id is None:
+                instance.id = bson.ObjectId()
+            bulk.insert(instance.to_mongo())
+
+        errors, concern_errors = self._execute_bulk_op(bulk, instances)
+        written = [instances[index] for index in self._get_written(instances, errors, ordered)]
+        self._mark_saved(written)
+        return written, errors, concern_errors
+
+    @profiler.profiled('bulk_upsert')
+    def bulk_upsert(self, instances, ordered=True):
+        """
+        Insert or replace many instances, matched by id, with a single bulk write. Instances
+        without an id are inserted.
+
+        :return: (inserted instances, replaced instances, write errors, write concern errors)
+                 tuple.
+        :rtype: ``tuple``
+        """
+        instances = list(instances)
+        bulk = self._initialize_bulk_op(ordered)
+        for instance in instances:
+            instance.validate()
+            if instance.id is None:
+                instance.id = bson.ObjectId()
+            bulk.find({'_id': instance.id}).upsert().replace_one(instance.to_mongo())
+
+        result = {}
+        errors, concern_errors = self._execute_bulk_op(bulk, instances, result=result)
+        written = self._get_written(instances, errors, ordered)
+        self._mark_saved([instances[index] for index in written])
+
+        upserted = set(item['index'] for item in result.get('upserted', []))
+        created = [instances[index] for index in written if index in upserted]
+        updated = [instances[index] for index in written if index not in upserted]
+        return created, updated, errors, concern_errors
+
+    @profiler.profiled('bulk_delete')
+    def bulk_delete(self, instances, ordered=True):
+        """
+        Delete many instances with a single bulk write. Instances which don't exist aren't
+        deleted and aren't reported as deleted.
+
+        :return: (deleted instances, write errors, write concern errors) tuple.
+        :rtype: ``tuple``
+        """
+        # A removal which matches nothing isn't a write error, so the instances which exist are
+        # looked up first.
+        instances = list(instances)
+        existing = self._get_existing_ids(instances)
+        instances = [instance for instance in instances
+                     if self._get_mongo_id(instance) in existing]
+        bulk = self._initialize_bulk_op(ordered)
+        for instance in instances:
+            bulk.find({'_id': instance.id}).remove_one()
+
+        errors, concern_errors = self._execute_bulk_op(bulk, instances)
+        deleted = [instances[index] for index in self._get_written(instances, errors, ordered)]
+        return deleted, errors, concern_errors
+
+    def _get_existing_ids(self, instances):
+        ids = [self._get_mongo_id(instance) for instance in instances]
+        if not ids:
+            return set()
+        docs = self.model._get_collection().find({'_id': {'$in': ids}}, {'_id': True})
+        return set(doc['_id'] for doc in docs)
+
+    def _get_mongo_id(self, instance):
+        return self.model._fields['id'].to_mongo(instance.id)
+
+    def _initialize_bulk_op(self, ordered):
+        collection = self.model._get_collection()
+        if ordered:
+            return collection.initialize_ordered_bulk_op()
+        return collection.initialize_unordered_bulk_op()
+
+    def _execute_bulk_op(self, bulk, instances, result=None):
+        """
+        Execute a bulk write and return its (write errors, write concern errors) tuple. Write
+        errors are tied to the instance at their index. Write concern errors are not, the
+        instances were written but the write concern couldn't be satisfied.
+        """
+        if not instances:
+            return [], []
+
+        try:
+            details = bulk.execute()
+        except BulkWriteError as e:
+            details = e.details
+
+        if result is not None:
+            result.update(details)
+
+        return (list(details.get('writeErrors', [])),
+                list(details.get('writeConcernErrors', [])))
+
+    @staticmethod
+    def _get_written(instances, errors, ordered):
+        """
+        Return the indexes of the instances which were written.
+        """
+        failed = set(error['index'] for error in errors)
+        count = len(instances)
+        if ordered and failed:
+            # Nothing is written after the first failure of an ordered write.
+            count = min(failed)
+        return [index for index in range(count) if index not in failed]
+
+    @staticmethod
+    def _mark_saved(instances):
+        for instance in instances:
+            instance._clear_changed_fields()
+            instance._created = False
+
+    @staticmethod
+    @profiler.profiled('delete')
     def delete(instance):
         instance.delete()
@@ -33,5 +33,11 @@ class TokenDB(stormbase.StormFoundationDB):
     metadata = me.DictField(required=False,
                             help_text='Arbitrary metadata associated with this token')
 
+    meta = {
+        'indexes': [
+            {'fields': ['expiry']}
+        ]
+    }
+
 
 MODELS = [UserDB, TokenDB]
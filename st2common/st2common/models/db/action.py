@@ -131,7 +131,12 @@ class ActionExecutionDB(stormbase.StormFoundationDB):
         help_text='Callback information for the on completion of action execution.')
 
     meta = {
-        'indexes': ['-start_timestamp', 'action']
+        'indexes': [
+            {'fields': ['-start_timestamp']},
+            {'fields': ['action', '-start_timestamp']},
+            {'fields': ['status', '-start_timestamp']},
+            {'fields': ['context.user', '-start_timestamp']}
+        ]
     }
 
 
@@ -150,9 +155,14 @@ class ActionExecutionStateDB(stormbase.StormFoundationDB):
     query_context = me.DictField(
         required=True,
         help_text='Context about the action execution that is needed for results query.')
+    claimed_by = me.StringField(
+        help_text='Id of the results tracker which queries the results when trackers are '
+                  'sharded.')
+    lease_expiry = me.DateTimeField(
+        help_text='Time after which other results trackers can claim this state.')
 
     meta = {
-        'indexes': ['query_module']
+        'indexes': ['query_module', 'claimed_by', 'lease_expiry']
     }
 
 # specialized access objects
@@ -14,7 +14,9 @@
 # limitations under the License.
 
 import mongoengine as me
+from pymongo.errors import OperationFailure
 
+from st2common.constants.action import (ACTIONEXEC_STATUS_SUCCEEDED, ACTIONEXEC_STATUS_FAILED)
 from st2common.models.db import stormbase
 from st2common import log as logging
 
@@ -25,6 +27,10 @@ __all__ = [
 
 LOG = logging.getLogger(__name__)
 
+DONE_STATES = [ACTIONEXEC_STATUS_SUCCEEDED, ACTIONEXEC_STATUS_FAILED]
+
+EXECUTION_ID_INDEX = 'execution.id_1'
+
 
 class ActionExecutionHistoryDB(stormbase.StormFoundationDB):
     trigger = stormbase.EscapedDictField()
@@ -40,9 +46,70 @@ class ActionExecutionHistoryDB(stormbase.StormFoundationDB):
     meta = {
         'indexes': [
             {'fields': ['parent']},
-            {'fields': ['execution.id']},
-            {'fields': ['execution.start_timestamp']}
+            {'fields': ['execution.id'], 'unique': True},
+            {'fields': ['execution.start_timestamp']},
+            # Filters of the history listing, which is sorted on the start timestamp.
+            {'fields': ['action.pack', 'action.name', '-execution.start_timestamp']},
+            {'fields': ['action.name', '-execution.start_timestamp']},
+            {'fields': ['execution.context.user', '-execution.start_timestamp']},
+            {'fields': ['execution.status', '-execution.start_timestamp']},
+            {'fields': ['rule.name', '-execution.start_timestamp']},
+            {'fields': ['runner.name', '-execution.start_timestamp']},
+            {'fields': ['trigger.name', '-execution.start_timestamp']},
+            {'fields': ['trigger_type.name', '-execution.start_timestamp']}
         ]
     }
 
+    @classmethod
+    def migrate_indexes(cls):
+        """
+        Make the index on execution.id of existing deployments unique. The index used not to be
+        unique, so the duplicate records of an execution are merged first and the index is
+        dropped to be rebuilt by ensure_indexes. Nothing is done once the index is unique.
+        """
+        # The raw collection, the one of the model ensures the indexes which conflict.
+        collection = cls._get_db()[cls._get_collection_name()]
+        index = collection.index_information().get(EXECUTION_ID_INDEX, None)
+        if not index or index.get('unique', False):
+            return
+
+        LOG.info('Making the index on execution.id of the history unique.')
+        pipeline = [
+            {'$group': {'_id': '$execution.id', 'ids': {'$push': '$_id'},
+                        'count': {'$sum': 1}}},
+            {'$match': {'count': {'$gt': 1}}}
+        ]
+        merged = 0
+        for group in collection.aggregate(pipeline, allowDiskUse=True, cursor={}):
+            cls._merge_duplicates(collection, group['ids'])
+            merged += 1
+        LOG.info('Merged the duplicate history records of %d executions.', merged)
+
+        try:
+            collection.drop_index(EXECUTION_ID_INDEX)
+        except OperationFailure:
+            # Another service which started at the same time dropped it first.
+            LOG.debug('Index %s is already dropped.', EXECUTION_ID_INDEX)
+
+    @staticmethod
+    def _merge_duplicates(collection, ids):
+        records = list(collection.find({'_id': {'$in': ids}}))
+        if len(records) < 2:
+            return
+
+        # Keep the record of a done execution if any, the most recent record otherwise. The
+        # children of all the records are kept.
+        records.sort(key=lambda record: (record.get('execution', {}).get('status') in DONE_STATES,
+                                         record['_id']))
+        kept = records[-1]
+        children = set()
+        for record in records:
+            children.update(record.get('children', None) or [])
+
+        if children:
+            collection.update_one({'_id': kept['_id']},
+                                  {'$set': {'children': sorted(children)}})
+        collection.delete_many({'_id': {'$in': [record['_id'] for record in records[:-1]]}})
+
+
 MODELS = [ActionExecutionHistoryDB]
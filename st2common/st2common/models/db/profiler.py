@@ -0,0 +1,216 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Profiling of the database operations issued through :class:`MongoDBAccess`.
+
+The latency of each operation is recorded in a histogram per model and operation. Round trips
+and time spent in the database are also added to the counter of the current green thread, if
+any, so the database cost of a single API request or action execution is known (see
+:func:`counter`). Operations slower than the configured threshold are logged with the shape of
+their filters.
+
+Queries are lazy, so their latency is recorded as their results are fetched, one chunk of
+results at a time.
+"""
+
+import contextlib
+import functools
+import time
+
+from eventlet import corolocal
+from mongoengine import Document
+from mongoengine.queryset import QuerySet
+
+from st2common import log as logging
+from st2common.models.db import queryaudit
+
+__all__ = [
+    'ProfiledQuerySet',
+    'configure',
+    'counter',
+    'get_counter',
+    'get_stats',
+    'profiled',
+    'record',
+    'reset',
+    'set_counter'
+]
+
+LOG = logging.getLogger(__name__)
+
+# Upper bounds of the latency histogram buckets in milliseconds. The last bucket is unbounded.
+BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+# (model name, operation) -> OperationStats
+STATS = {}
+
+_slow_query_threshold_ms = None
+_local = corolocal.local()
+
+
+class OperationStats(object):
+    """
+    Latency histogram of an operation on a model.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+
+    def add(self, duration_ms):
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        for i, bound in enumerate(BUCKETS_MS):
+            if duration_ms <= bound:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+
+    def to_dict(self):
+        buckets = dict([('<=%s' % bound, count) for bound, count in zip(BUCKETS_MS, self.buckets)])
+        buckets['>%s' % BUCKETS_MS[-1]] = self.buckets[-1]
+        return {
+            'count': self.count,
+            'total_ms': round(self.total_ms, 3),
+            'max_ms': round(self.max_ms, 3),
+            'buckets': buckets
+        }
+
+
+class RoundTripCounter(object):
+    """
+    Database round trips and time spent in the database by a unit of work such as an API
+    request or an action execution.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.round_trips = 0
+        self.duration_ms = 0.0
+
+    def __repr__(self):
+        return '%s(name=%r, round_trips=%s, duration_ms=%.3f)' % (
+            type(self).__name__, self.name, self.round_trips, self.duration_ms)
+
+
+def configure(slow_query_threshold_ms=None):
+    """
+    :param slow_query_threshold_ms: Operations slower than this are logged. None disables the
+                                    slow query log.
+    :type slow_query_threshold_ms: ``int``
+    """
+    global _slow_query_threshold_ms
+    _slow_query_threshold_ms = slow_query_threshold_ms
+
+
+@contextlib.contextmanager
+def counter(name):
+    """
+    Count the database round trips of the current green thread for the duration of the block.
+
+    :rtype: :class:`RoundTripCounter`
+    """
+    previous = getattr(_local, 'counter', None)
+    _local.counter = RoundTripCounter(name)
+    try:
+        yield _local.counter
+    finally:
+        _local.counter = previous
+
+
+def get_counter():
+    return getattr(_local, 'counter', None)
+
+
+def set_counter(value):
+    """
+    Set the counter of the current green thread for units of work which don't fit in a block,
+    such as a request going through the API hooks. None removes the counter.
+    """
+    _local.counter = value
+
+
+def record(model, operation, duration_ms, filters=None):
+    key = (model.__name__, operation)
+    stats = STATS.get(key)
+    if stats is None:
+        stats = STATS[key] = OperationStats()
+    stats.add(duration_ms)
+
+    current = get_counter()
+    if current:
+        current.round_trips += 1
+        current.duration_ms += duration_ms
+
+    if _slow_query_threshold_ms and duration_ms >= _slow_query_threshold_ms:
+        LOG.warning('Slow %s on %s took %.1fms, filters: %s', operation, model.__name__,
+                    duration_ms, queryaudit.get_filters_shape(filters or {}))
+
+
+def profiled(operation):
+    """
+    Decorator which records the latency of a :class:`MongoDBAccess` method.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            # Queries run by the method are part of the operation.
+            depth = getattr(_local, 'depth', 0)
+            _local.depth = depth + 1
+            start = time.time()
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                _local.depth = depth
+                if not depth:
+                    # Methods which take the document itself are static.
+                    model = type(self) if isinstance(self, Document) else self.model
+                    record(model, operation, (time.time() - start) * 1000, kwargs)
+        return wrapper
+    return decorate
+
+
+def get_stats():
+    """
+    Return the latency histograms keyed by model and operation.
+
+    :rtype: ``dict``
+    """
+    return dict([('%s.%s' % key, stats.to_dict()) for key, stats in STATS.items()])
+
+
+def reset():
+    STATS.clear()
+
+
+class ProfiledQuerySet(QuerySet):
+    """
+    Query set which records the time spent fetching its results.
+    """
+
+    def _populate_cache(self):
+        if getattr(_local, 'depth', 0) or not self._has_more:
+            return super(ProfiledQuerySet, self)._populate_cache()
+
+        start = time.time()
+        try:
+            return super(ProfiledQuerySet, self)._populate_cache()
+        finally:
+            record(self._document, 'query', (time.time() - start) * 1000, self._query)
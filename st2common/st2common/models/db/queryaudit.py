@@ -0,0 +1,189 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Audit of the shapes of the queries issued through :class:`MongoDBAccess`.
+
+A query shape is the model, the filtered fields with their operators and the sort order of a
+query, without the values. The first query of each shape is explained to find out whether it
+is served by an index. The shapes are written to a JSON report when the process exits. The
+services share the report path of their configuration, so the id of the process is appended to
+it, and ``tools/index_audit.py`` merges the reports of several processes to find the hot shapes
+which scan their collection.
+"""
+
+import atexit
+import json
+import os
+
+import six
+
+from st2common import log as logging
+
+__all__ = [
+    'enable',
+    'disable',
+    'is_enabled',
+    'record',
+    'get_shapes',
+    'get_report_path',
+    'write_report'
+]
+
+LOG = logging.getLogger(__name__)
+
+# Shape key -> {'model', 'filters', 'order_by', 'count', 'plan', 'scan'}
+SHAPES = {}
+
+_enabled = False
+_report_path = None
+
+
+def enable(report_path=None):
+    """
+    Start recording query shapes.
+
+    :param report_path: File the shapes are written to when the process exits, suffixed with
+                        the id of the process, e.g. ``<report_path>.<pid>``.
+    :type report_path: ``str``
+    """
+    global _enabled, _report_path
+    if report_path and not _report_path:
+        atexit.register(write_report)
+    _enabled = True
+    _report_path = report_path or _report_path
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def record(model, filters, order_by=None, queryset=None):
+    """
+    Record a query. The query is explained the first time its shape is seen.
+
+    :param filters: Keyword filters of the query, including the __raw__ filter.
+    :type filters: ``dict``
+
+    :param queryset: Query set which is explained for new shapes.
+    :type queryset: :class:`mongoengine.queryset.QuerySet`
+    """
+    if not _enabled:
+        return
+
+    filters_shape = get_filters_shape(filters)
+    order_by = list(order_by or [])
+    key = json.dumps([model.__name__, filters_shape, order_by], sort_keys=True)
+
+    shape = SHAPES.get(key)
+    if shape is None:
+        plan = _explain(queryset)
+        shape = SHAPES[key] = {
+            'model': model.__name__,
+            'filters': filters_shape,
+            'order_by': order_by,
+            'count': 0,
+            'plan': plan,
+            'scan': _is_scan(plan)
+        }
+        if shape['scan']:
+            LOG.warning('Query on %s with filters %s sorted by %s scans the collection.',
+                        model.__name__, filters_shape, order_by)
+
+    shape['count'] += 1
+
+
+def get_shapes():
+    """
+    Return the recorded shapes, most frequent first.
+
+    :rtype: ``list``
+    """
+    return sorted(SHAPES.values(), key=lambda shape: shape['count'], reverse=True)
+
+
+def write_report(path=None):
+    """
+    Write the shapes to a JSON report.
+
+    :param path: File the shapes are written to. Defaults to the report path of :func:`enable`
+                 suffixed with the id of the process.
+    :type path: ``str``
+    """
+    path = path or get_report_path()
+    if not path:
+        return
+    with open(path, 'w') as report:
+        json.dump(get_shapes(), report, indent=4)
+
+
+def get_report_path():
+    """
+    Return the file the shapes of this process are written to on exit. The pid is read when the
+    report is written so processes forked after :func:`enable` write their own report.
+
+    :rtype: ``str``
+    """
+    if not _report_path:
+        return None
+    return '%s.%d' % (_report_path, os.getpid())
+
+
+def get_filters_shape(filters):
+    """
+    Return the filters with their values replaced by their type. Keys of dictionaries are
+    kept so the shape of raw filters is recorded too.
+    """
+    if isinstance(filters, dict):
+        return dict([(k, get_filters_shape(v)) for k, v in six.iteritems(filters)])
+    if isinstance(filters, (list, tuple)):
+        # Operators such as $or have a list of filters, values of $in have a list of values.
+        return [get_filters_shape(value) for value in filters
+                if isinstance(value, dict)] or type(filters).__name__
+    if isinstance(filters, six.string_types):
+        return 'str'
+    return type(filters).__name__
+
+
+def _explain(queryset):
+    if queryset is None:
+        return None
+    try:
+        explain = queryset.explain()
+    except Exception as e:
+        LOG.debug('Failed to explain query: %s', e)
+        return None
+
+    # MongoDB 2.x
+    if 'cursor' in explain:
+        return explain['cursor']
+
+    # MongoDB 3.x
+    stages = []
+    stage = explain.get('queryPlanner', {}).get('winningPlan', {})
+    while stage:
+        stages.append(stage['stage'] + (' %s' % stage['indexName']
+                                        if 'indexName' in stage else ''))
+        stage = stage.get('inputStage', None)
+    return ' <- '.join(stages)
+
+
+def _is_scan(plan):
+    return bool(plan) and ('BasicCursor' in plan or 'COLLSCAN' in plan)
@@ -82,6 +82,12 @@ class TriggerDB(stormbase.StormBaseDB, stormbase.ContentPackResourceMixin):
     type = me.StringField()
     parameters = me.DictField()
 
+    meta = {
+        'indexes': [
+            {'fields': ['type', 'parameters']}
+        ]
+    }
+
 
 class TriggerInstanceDB(stormbase.StormFoundationDB):
     """An instance or occurrence of a type of Trigger.
@@ -94,6 +100,13 @@ class TriggerInstanceDB(stormbase.StormFoundationDB):
     payload = me.DictField()
     occurrence_time = me.DateTimeField()
 
+    meta = {
+        'indexes': [
+            {'fields': ['occurrence_time']},
+            {'fields': ['trigger', '-occurrence_time']}
+        ]
+    }
+
 
 class ActionExecutionSpecDB(me.EmbeddedDocument):
     ref = me.StringField(required=True, unique=False)
@@ -126,7 +139,9 @@ class RuleDB(stormbase.StormBaseDB, stormbase.TagsMixin):
                               help_text=u'Flag indicating whether the rule is enabled.')
 
     meta = {
-        'indexes': stormbase.TagsMixin.get_indices()
+        'indexes': stormbase.TagsMixin.get_indices() + [
+            {'fields': ['trigger', 'enabled']}
+        ]
     }
 
 # specialized access objects
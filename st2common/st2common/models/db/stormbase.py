@@ -18,6 +18,7 @@ import datetime
 import mongoengine as me
 import six
 
+from st2common.models.db import profiler
 from st2common.util import mongoescape
 from st2common.models.system.common import ResourceReference
 
@@ -46,7 +47,8 @@ class StormFoundationDB(me.Document):
 
     # see http://docs.mongoengine.org/guide/defining-documents.html#abstract-classes
     meta = {
-        'abstract': True
+        'abstract': True,
+        'queryset_class': profiler.ProfiledQuerySet
     }
 
     def __str__(self):
@@ -35,8 +35,8 @@ class Node(object):
             },
             "ref": {
                 "type": "string",
-                "description": "Ref of the action to be executed.",
-                "required": True
+                "description": "Ref of the action to be executed. Required unless parallel is"
+                               " specified."
             },
             "params": {
                 "type": "object",
@@ -64,6 +64,47 @@ class Node(object):
                 "patternProperties": {
                     "^\w+$": {}
                 }
+            },
+            "parallel": {
+                "description": "Branches executed in parallel instead of a single action. The"
+                               " node succeeds once all the branches succeed. The results of"
+                               " all the branches are available to the following nodes.",
+                "type": "array",
+                "minItems": 1,
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "name": {
+                            "description": "The name of this branch.",
+                            "type": "string",
+                            "required": True
+                        },
+                        "ref": {
+                            "type": "string",
+                            "description": "Ref of the action to be executed.",
+                            "required": True
+                        },
+                        "params": {
+                            "type": "object",
+                            "description": "Parameter for the execution.",
+                            "default": {}
+                        },
+                        "publish": {
+                            "description": "The variables to publish from the result.",
+                            "type": "object",
+                            "patternProperties": {
+                                r"^\w+$": {}
+                            }
+                        }
+                    },
+                    "additionalProperties": False
+                }
+            },
+            "concurrency": {
+                "description": "Maximum number of parallel branches executed at the same time."
+                               " All the branches are executed at once if not specified.",
+                "type": "integer",
+                "minimum": 1
             }
         },
         "additionalProperties": False
@@ -75,8 +116,16 @@ class Node(object):
             # having '-' in the property name lead to challenges in referencing the property.
             # At hindsight the schema property should've been on_success rather than on-success.
             prop = string.replace(prop, '-', '_')
+            # branches of a parallel node are nodes themselves.
+            if prop == 'parallel' and value:
+                value = [Node(**branch) for branch in value]
             setattr(self, prop, value)
 
+        if bool(self.ref) == bool(self.parallel):
+            raise ValueError('Node "%s" must specify either ref or parallel.' % self.name)
+        if self.concurrency is not None and not self.parallel:
+            raise ValueError('Node "%s" specifies concurrency without parallel.' % self.name)
+
 
 class ActionChain(object):
 
@@ -118,3 +167,15 @@ class ActionChain(object):
                     nodes.append(Node(**node))
                 value = nodes
             setattr(self, prop, value)
+
+        self._validate_branch_names()
+
+    def _validate_branch_names(self):
+        # Results of the branches are stored under their name next to the results of the nodes.
+        names = set([node.name for node in self.chain])
+        for node in self.chain:
+            for branch in node.parallel or []:
+                if branch.name in names:
+                    raise ValueError('Branch "%s" of node "%s" conflicts with another node or '
+                                     'branch of the same name.' % (branch.name, node.name))
+                names.add(branch.name)
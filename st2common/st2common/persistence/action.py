@@ -13,35 +13,113 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
+
 from oslo.config import cfg
 
 from st2common import transport
 from st2common.models.db.action import (runnertype_access, action_access, actionexec_access)
 from st2common.models.db.action import actionexecstate_access
+from st2common.models.system.common import ResourceReference
 from st2common.persistence.base import (Access, ContentPackResource)
+from st2common.services import metadata
 
 
 class RunnerType(Access):
     impl = runnertype_access
+    publisher = None
 
     @classmethod
     def _get_impl(cls):
         return cls.impl
 
+    @classmethod
+    def _get_publisher(cls):
+        if not cls.publisher:
+            cls.publisher = transport.action.RunnerTypeCUDPublisher(cfg.CONF.messaging.url)
+        return cls.publisher
+
     @classmethod
     def _get_by_object(cls, object):
         # For RunnerType name is unique.
         name = getattr(object, 'name', '')
         return cls.get_by_name(name)
 
+    @classmethod
+    def add_or_update(cls, model_object, publish=True):
+        model_object = super(RunnerType, cls).add_or_update(model_object, publish=publish)
+        metadata.invalidate_runnertype(model_object.name)
+        return model_object
+
+    @classmethod
+    def delete(cls, model_object, publish=True):
+        metadata.invalidate_runnertype(model_object.name)
+        return super(RunnerType, cls).delete(model_object, publish=publish)
+
+    @classmethod
+    def bulk_upsert(cls, model_objects, ordered=True, publish=True):
+        model_objects = list(model_objects)
+        for model_object in model_objects:
+            metadata.invalidate_runnertype(model_object.name)
+        return super(RunnerType, cls).bulk_upsert(model_objects, ordered=ordered,
+                                                  publish=publish)
+
+    @classmethod
+    def bulk_delete(cls, model_objects, ordered=True, publish=True):
+        model_objects = list(model_objects)
+        for model_object in model_objects:
+            metadata.invalidate_runnertype(model_object.name)
+        return super(RunnerType, cls).bulk_delete(model_objects, ordered=ordered,
+                                                  publish=publish)
+
 
 class Action(ContentPackResource):
     impl = action_access
+    publisher = None
 
     @classmethod
     def _get_impl(cls):
         return cls.impl
 
+    @classmethod
+    def _get_publisher(cls):
+        if not cls.publisher:
+            cls.publisher = transport.action.ActionCUDPublisher(cfg.CONF.messaging.url)
+        return cls.publisher
+
+    @classmethod
+    def add_or_update(cls, model_object, publish=True):
+        model_object = super(Action, cls).add_or_update(model_object, publish=publish)
+        metadata.invalidate_action(cls._get_ref(model_object))
+        return model_object
+
+    @classmethod
+    def delete(cls, model_object, publish=True):
+        metadata.invalidate_action(cls._get_ref(model_object))
+        return super(Action, cls).delete(model_object, publish=publish)
+
+    @classmethod
+    def bulk_upsert(cls, model_objects, ordered=True, publish=True):
+        model_objects = list(model_objects)
+        for model_object in model_objects:
+            metadata.invalidate_action(cls._get_ref(model_object))
+        return super(Action, cls).bulk_upsert(model_objects, ordered=ordered, publish=publish)
+
+    @classmethod
+    def bulk_delete(cls, model_objects, ordered=True, publish=True):
+        model_objects = list(model_objects)
+        for model_object in model_objects:
+            metadata.invalidate_action(cls._get_ref(model_object))
+        return super(Action, cls).bulk_delete(model_objects, ordered=ordered, publish=publish)
+
+    @staticmethod
+    def _get_ref(model_object):
+        try:
+            return ResourceReference.to_string_reference(pack=model_object.pack,
+                                                         name=model_object.name)
+        except ValueError:
+            return None
+
 
 class ActionExecution(Access):
     impl = actionexec_access
@@ -73,3 +151,77 @@ class ActionExecutionState(Access):
             cls.publisher = transport.actionexecutionstate.ActionExecutionStatePublisher(
                 cfg.CONF.messaging.url)
         return cls.publisher
+
+    @classmethod
+    def claim(cls, model_object, claimed_by, lease_ttl):
+        """
+        Claim the state for a results tracker if it isn't claimed or the lease of another
+        tracker expired. Claiming a state already claimed by the tracker fails so a state is
+        only added to the queriers once, leases are extended with :meth:`renew_lease(s)`.
+
+        :param claimed_by: Id of the results tracker.
+        :type claimed_by: ``str``
+
+        :param lease_ttl: Seconds for which the lease is valid unless it is renewed.
+        :type lease_ttl: ``int``
+
+        :return: True if the state is claimed by claimed_by.
+        :rtype: ``bool``
+        """
+        now = datetime.datetime.utcnow()
+        claimable = {'$or': [{'claimed_by': None},
+                             {'claimed_by': {'$ne': claimed_by}, 'lease_expiry': {'$lt': now}}]}
+        lease_expiry = now + datetime.timedelta(seconds=lease_ttl)
+        claimed = cls.query(id=model_object.id, __raw__=claimable).update(
+            set__claimed_by=claimed_by, set__lease_expiry=lease_expiry)
+        return claimed > 0
+
+    @classmethod
+    def renew_lease(cls, state_id, claimed_by, lease_ttl):
+        """
+        Renew the lease on a state if it is still claimed by the provided results tracker. A
+        tracker whose lease expired loses the state as soon as another tracker claims it.
+
+        :return: True if the state is still claimed by claimed_by.
+        :rtype: ``bool``
+        """
+        lease_expiry = datetime.datetime.utcnow() + datetime.timedelta(seconds=lease_ttl)
+        renewed = cls.query(id=state_id, claimed_by=claimed_by).update(
+            set__lease_expiry=lease_expiry)
+        return renewed > 0
+
+    @classmethod
+    def renew_leases(cls, claimed_by, lease_ttl):
+        """
+        Renew the leases on all the states claimed by a results tracker.
+
+        :rtype: ``int``
+        """
+        lease_expiry = datetime.datetime.utcnow() + datetime.timedelta(seconds=lease_ttl)
+        return cls.query(claimed_by=claimed_by).update(set__lease_expiry=lease_expiry)
+
+    @classmethod
+    def release(cls, claimed_by):
+        """
+        Release all the states claimed by a results tracker so other trackers can claim them
+        right away.
+
+        :rtype: ``int``
+        """
+        return cls.query(claimed_by=claimed_by).update(unset__claimed_by=True,
+                                                       unset__lease_expiry=True)
+
+    @classmethod
+    def query_claimable(cls, stream=False):
+        """
+        Return the states which are not claimed or whose lease expired.
+
+        :param stream: If True, the states are streamed rather than returned as a query set.
+                       See :meth:`stream`.
+        :type stream: ``bool``
+        """
+        claimable = {'$or': [{'claimed_by': None},
+                             {'lease_expiry': {'$lt': datetime.datetime.utcnow()}}]}
+        if stream:
+            return cls.stream(__raw__=claimable, no_cursor_timeout=True)
+        return cls.query(__raw__=claimable)
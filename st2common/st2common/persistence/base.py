@@ -14,7 +14,8 @@
 # limitations under the License.
 
 from mongoengine import NotUniqueError
-from st2common.exceptions.db import StackStormDBObjectConflictError
+from st2common.exceptions.db import (StackStormDBObjectConflictError,
+                                     StackStormDBBulkWriteError)
 from st2common.models.system.common import ResourceReference
 
 import abc
@@ -68,6 +69,14 @@ class Access(object):
     def query(cls, *args, **kwargs):
         return cls._get_impl().query(*args, **kwargs)
 
+    @classmethod
+    def query_raw(cls, *args, **kwargs):
+        return cls._get_impl().query_raw(*args, **kwargs)
+
+    @classmethod
+    def stream(cls, *args, **kwargs):
+        return cls._get_impl().stream(*args, **kwargs)
+
     @classmethod
     def distinct(cls, *args, **kwargs):
         return cls._get_impl().distinct(*args, **kwargs)
@@ -99,6 +108,22 @@ class Access(object):
             LOG.exception('publish failed.')
         return model_object
 
+    @classmethod
+    def update(cls, model_object, publish=True, **kwargs):
+        """
+        Atomically set the provided attributes on an already persisted object without reading
+        or re-saving the whole document. The in-memory object is updated as well and is the one
+        which is published.
+        """
+        model_object = cls._get_impl().update(model_object, **kwargs)
+        publisher = cls._get_publisher()
+        try:
+            if publisher and publish:
+                publisher.publish_update(model_object)
+        except:
+            LOG.exception('publish failed.')
+        return model_object
+
     @classmethod
     def delete(cls, model_object, publish=True):
         persisted_object = cls._get_impl().delete(model_object)
@@ -108,6 +133,73 @@ class Access(object):
             publisher.publish_delete(model_object)
         return persisted_object
 
+    @classmethod
+    def bulk_add(cls, model_objects, ordered=True, publish=True):
+        """
+        Insert many new objects with a single bulk write. The create events of the inserted
+        objects are published in one batch.
+
+        If some objects can't be inserted, StackStormDBBulkWriteError is raised once the
+        objects which were inserted regardless are published.
+
+        :param ordered: If True, the objects are inserted in order and the first failure stops
+                        the write. Otherwise all the objects are attempted.
+        :type ordered: ``bool``
+
+        :rtype: ``list``
+        """
+        written, errors, concern_errors = cls._get_impl().bulk_add(model_objects,
+                                                                   ordered=ordered)
+        cls._publish_many('create', written, publish)
+        cls._raise_bulk_write_error(written, errors, concern_errors)
+        return written
+
+    @classmethod
+    def bulk_upsert(cls, model_objects, ordered=True, publish=True):
+        """
+        Insert or replace many objects, matched by id, with a single bulk write. Create events
+        are published for the inserted objects and update events for the replaced ones.
+
+        :rtype: ``list``
+        """
+        created, updated, errors, concern_errors = cls._get_impl().bulk_upsert(
+            model_objects, ordered=ordered)
+        cls._publish_many('create', created, publish)
+        cls._publish_many('update', updated, publish)
+        cls._raise_bulk_write_error(created + updated, errors, concern_errors)
+        return created + updated
+
+    @classmethod
+    def bulk_delete(cls, model_objects, ordered=True, publish=True):
+        """
+        Delete many objects with a single bulk write and publish their delete events in one
+        batch.
+
+        :rtype: ``list``
+        """
+        deleted, errors, concern_errors = cls._get_impl().bulk_delete(model_objects,
+                                                                      ordered=ordered)
+        cls._publish_many('delete', deleted, publish)
+        cls._raise_bulk_write_error(deleted, errors, concern_errors)
+        return deleted
+
+    @classmethod
+    def _publish_many(cls, event, model_objects, publish):
+        publisher = cls._get_publisher()
+        try:
+            if publisher and publish and model_objects:
+                getattr(publisher, 'publish_%s_many' % event)(model_objects)
+        except:
+            LOG.exception('publish failed.')
+
+    @staticmethod
+    def _raise_bulk_write_error(written, errors, concern_errors):
+        if errors or concern_errors:
+            messages = ['%s: %s' % (error['index'], error.get('errmsg')) for error in errors]
+            messages += ['write concern: %s' % error.get('errmsg') for error in concern_errors]
+            raise StackStormDBBulkWriteError('Bulk write failed. %s' % '; '.join(messages),
+                                             written, errors, concern_errors)
+
 
 class ContentPackResource(Access):
 
@@ -13,12 +13,25 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from mongoengine import NotUniqueError
 from oslo.config import cfg
+from pymongo.errors import BulkWriteError
+import six
 
+from st2common import log as logging
 from st2common import transport
+from st2common.constants.action import (ACTIONEXEC_STATUS_SUCCEEDED, ACTIONEXEC_STATUS_FAILED)
 from st2common.models.db import MongoDBAccess
 from st2common.models.db.history import ActionExecutionHistoryDB
 from st2common.persistence.base import Access
+from st2common.util import mongoescape
+
+LOG = logging.getLogger(__name__)
+
+DONE_STATES = [ACTIONEXEC_STATUS_SUCCEEDED, ACTIONEXEC_STATUS_FAILED]
+
+# Codes of the write errors raised by inserts which violate a unique index.
+DUPLICATE_KEY_ERROR_CODES = [11000, 11001]
 
 
 class ActionExecutionHistory(Access):
@@ -35,3 +48,184 @@ class ActionExecutionHistory(Access):
             cls.publisher = transport.history.HistoryPublisher(
                 cfg.CONF.messaging.url)
         return cls.publisher
+
+    @classmethod
+    def record(cls, execution, attrs, publish=True):
+        """
+        Create or complete the record of an execution with a single atomic upsert. The record
+        might already have been created by an update of the execution, in which case the
+        execution snapshot of the record is more recent and is kept. A record created by
+        :meth:`add_child` has no snapshot yet, so it is set with a second conditional update.
+
+        :param execution: Execution snapshot i.e. the attributes of an ActionExecutionAPI.
+        :type execution: ``dict``
+
+        :param attrs: The other attributes of the record.
+        :type attrs: ``dict``
+
+        :rtype: :class:`ActionExecutionHistoryDB`
+        """
+        updates = {
+            '$set': cls._escape(attrs),
+            '$setOnInsert': cls._get_execution_updates(execution)
+        }
+        history = cls._upsert({'execution__id': execution['id']}, __raw__=updates)
+        history = cls._complete_stub(history, updates)
+        cls._publish_update(history, publish)
+        return history
+
+    @classmethod
+    def record_many(cls, records, publish=True):
+        """
+        Create or complete the records of many executions with a single unordered bulk write.
+        Every record is upserted the same way :meth:`record` does it.
+
+        :param records: List of (execution snapshot, other attributes of the record) tuples.
+        :type records: ``list``
+
+        :return: The records keyed by execution id.
+        :rtype: ``dict``
+        """
+        if not records:
+            return {}
+
+        collection = cls._get_impl().model._get_collection()
+        bulk = collection.initialize_unordered_bulk_op()
+
+        # The same execution can't be upserted twice in an unordered batch, last one wins.
+        updates = {}
+        for execution, attrs in records:
+            updates[execution['id']] = {
+                '$set': cls._escape(attrs),
+                '$setOnInsert': cls._get_execution_updates(execution)
+            }
+        execution_ids = list(updates.keys())
+        for execution_id in execution_ids:
+            bulk.find({'execution.id': execution_id}).upsert().update_one(updates[execution_id])
+
+        try:
+            bulk.execute()
+        except BulkWriteError as e:
+            errors = e.details['writeErrors']
+            # Records inserted by concurrent upserts exist now, so they are retried as plain
+            # updates. Other records of the batch are written regardless.
+            duplicates = [execution_ids[error['index']] for error in errors
+                          if error['code'] in DUPLICATE_KEY_ERROR_CODES]
+            errors = [error for error in errors
+                      if error['code'] not in DUPLICATE_KEY_ERROR_CODES]
+            if duplicates:
+                retry = collection.initialize_unordered_bulk_op()
+                for execution_id in duplicates:
+                    retry.find({'execution.id': execution_id}).update_one(updates[execution_id])
+                try:
+                    retry.execute()
+                except BulkWriteError as e:
+                    errors.extend(e.details['writeErrors'])
+            if errors:
+                LOG.error('Failed to record some of the executions: %s', errors)
+
+        histories = [cls._complete_stub(history, updates[history.execution['id']])
+                     for history in cls.query(execution__id__in=execution_ids)]
+        histories = dict([(history.execution['id'], history) for history in histories])
+        for history in six.itervalues(histories):
+            cls._publish_update(history, publish)
+        return histories
+
+    @classmethod
+    def update_execution(cls, execution, publish=True):
+        """
+        Set the execution snapshot of the record of an execution with a single atomic upsert.
+        The record is created if the update is processed before the execution is recorded. An
+        update of an execution which isn't done is not applied over a record of an execution
+        which is done since it is stale.
+
+        :param execution: Execution snapshot i.e. the attributes of an ActionExecutionAPI.
+        :type execution: ``dict``
+
+        :return: The updated record or None if the update is stale.
+        :rtype: :class:`ActionExecutionHistoryDB`
+        """
+        filters = {'execution__id': execution['id']}
+        if execution.get('status', None) not in DONE_STATES:
+            filters['execution__status__nin'] = DONE_STATES
+        updates = {'$set': cls._get_execution_updates(execution)}
+        history = cls._upsert(filters, __raw__=updates)
+        if history is None:
+            # The record exists and the execution is done.
+            return None
+        cls._publish_update(history, publish)
+        return history
+
+    @classmethod
+    def add_child(cls, parent_execution_id, child_id, publish=True):
+        """
+        Add a child to the record of a parent execution with a single atomic upsert.
+
+        :rtype: :class:`ActionExecutionHistoryDB`
+        """
+        history = cls._upsert({'execution__id': parent_execution_id},
+                              add_to_set__children=child_id)
+        cls._publish_update(history, publish)
+        return history
+
+    @classmethod
+    def _complete_stub(cls, history, updates):
+        """
+        Set the execution snapshot of a record which only has the execution id, i.e. a record
+        created by :meth:`add_child` before the execution was recorded. The snapshot is only set
+        while the record has no execution status since an update of the execution could have
+        set a more recent snapshot in the meantime.
+
+        :param updates: The updates of the record with the snapshot in $setOnInsert.
+        :type updates: ``dict``
+
+        :rtype: :class:`ActionExecutionHistoryDB`
+        """
+        if history is None or 'status' in history.execution:
+            return history
+
+        snapshot = dict(updates['$set'], **updates['$setOnInsert'])
+        stub = cls.query(execution__id=history.execution['id'], execution__status__exists=False)
+        completed = stub.modify(new=True, __raw__={'$set': snapshot})
+        if completed is None:
+            # The execution was updated in the meantime.
+            return cls.get_by_id(history.id)
+        return completed
+
+    @classmethod
+    def _upsert(cls, filters, **updates):
+        """
+        Upsert the record matching the provided filters and return it.
+
+        Concurrent upserts of a record race, the one which loses fails on the unique index on
+        the execution id since the record was inserted in the meantime. It is retried once as
+        a plain update, which matches the inserted record unless the filters exclude it.
+
+        :return: The updated record or None if the retried update matched no record.
+        :rtype: :class:`ActionExecutionHistoryDB`
+        """
+        try:
+            return cls.query(**filters).modify(upsert=True, new=True, **updates)
+        except NotUniqueError:
+            return cls.query(**filters).modify(new=True, **updates)
+
+    @classmethod
+    def _get_execution_updates(cls, execution):
+        # The id is set by the query the update applies to.
+        execution = dict([(k, v) for k, v in six.iteritems(execution) if k != 'id'])
+        execution = cls._escape(execution)
+        return dict([('execution.%s' % k, v) for k, v in six.iteritems(execution)])
+
+    @staticmethod
+    def _escape(values):
+        # Escaping doesn't modify the values, so shared snapshots can be escaped as is.
+        return mongoescape.escape_chars(values)
+
+    @classmethod
+    def _publish_update(cls, model_object, publish):
+        publisher = cls._get_publisher()
+        try:
+            if publisher and publish:
+                publisher.publish_update(model_object)
+        except:
+            LOG.exception('publish failed.')
@@ -24,19 +24,33 @@ from st2common.persistence.base import (Access, ContentPackResource)
 
 class SensorType(ContentPackResource):
     impl = sensor_type_access
+    publisher = None
 
     @classmethod
     def _get_impl(cls):
         return cls.impl
 
+    @classmethod
+    def _get_publisher(cls):
+        if not cls.publisher:
+            cls.publisher = transport.reactor.SensorTypeCUDPublisher(cfg.CONF.messaging.url)
+        return cls.publisher
+
 
 class TriggerType(ContentPackResource):
     impl = triggertype_access
+    publisher = None
 
     @classmethod
     def _get_impl(cls):
         return cls.impl
 
+    @classmethod
+    def _get_publisher(cls):
+        if not cls.publisher:
+            cls.publisher = transport.reactor.TriggerTypeCUDPublisher(cfg.CONF.messaging.url)
+        return cls.publisher
+
 
 class Trigger(ContentPackResource):
     impl = trigger_access
@@ -63,11 +77,18 @@ class TriggerInstance(Access):
 
 class Rule(Access):
     impl = rule_access
+    publisher = None
 
     @classmethod
     def _get_impl(cls):
         return cls.impl
 
+    @classmethod
+    def _get_publisher(cls):
+        if not cls.publisher:
+            cls.publisher = transport.reactor.RuleCUDPublisher(cfg.CONF.messaging.url)
+        return cls.publisher
+
     @classmethod
     def _get_by_object(cls, object):
         # For Rule name is unique.
@@ -14,14 +14,12 @@
 # limitations under the License.
 
 import datetime
-import jsonschema
 import six
 
 from st2common import log as logging
 from st2common.util import isotime
-from st2common.util import action_db as action_utils
-from st2common.util import schema as util_schema
 from st2common.persistence.action import ActionExecution
+from st2common.services import metadata
 from st2common.constants.action import ACTIONEXEC_STATUS_SCHEDULED
 
 LOG = logging.getLogger(__name__)
@@ -43,21 +41,19 @@ def schedule(execution):
         execution.context['user'] = getattr(parent, 'context', dict()).get('user')
 
     # Validate action.
-    action_db = action_utils.get_action_by_ref(execution.action)
+    action_db = metadata.get_action_by_ref(execution.action)
     if not action_db:
         raise ValueError('Action "%s" cannot be found.' % execution.action)
     if not action_db.enabled:
         raise ValueError('Unable to execute. Action "%s" is disabled.' % execution.action)
 
-    runnertype_db = action_utils.get_runnertype_by_name(action_db.runner_type['name'])
+    runnertype_db = metadata.get_runnertype_by_name(action_db.runner_type['name'])
 
     if not hasattr(execution, 'parameters'):
         execution.parameters = dict()
 
     # Validate action parameters.
-    schema = util_schema.get_parameter_schema(action_db)
-    validator = util_schema.get_validator()
-    jsonschema.validate(execution.parameters, schema, validator)
+    metadata.get_parameter_validator(action_db).validate(execution.parameters)
 
     # validate that no immutable params are being overriden. Although possible to
     # ignore the override it is safer to inform the user to avoid surprises.
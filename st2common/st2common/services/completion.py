@@ -0,0 +1,145 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Notifies waiters, such as action chains waiting on their children, as soon as action
+executions reach a terminal state.
+
+Completion is driven by the update events published on the action execution exchange (see
+:func:`start_watcher`). If the watcher isn't running in the current process waiters poll the
+database instead and while it runs the database is only read to recover from missed events.
+"""
+
+import eventlet
+from eventlet import queue as eventlet_queue
+from kombu import Connection
+from kombu.mixins import ConsumerMixin
+from oslo.config import cfg
+
+from st2common import log as logging
+from st2common.constants.action import (ACTIONEXEC_STATUS_SUCCEEDED, ACTIONEXEC_STATUS_FAILED)
+from st2common.transport import actionexecution, publishers
+from st2common.util import action_db as action_db_util
+from st2common.util.cache import ExpiringCache
+
+__all__ = [
+    'is_completed',
+    'wait_for_completion',
+    'start_watcher'
+]
+
+LOG = logging.getLogger(__name__)
+
+COMPLETED_STATES = [ACTIONEXEC_STATUS_SUCCEEDED, ACTIONEXEC_STATUS_FAILED]
+
+# How often the database is polled when the watcher isn't running.
+POLL_INTERVAL = 1
+# How often the database is polled to recover from missed events when the watcher is running.
+FALLBACK_POLL_INTERVAL = 30
+
+# Execution id -> status of the executions which completed recently. Covers executions which
+# complete before their waiter is registered. Only the status is kept, the results of the
+# executions can be arbitrarily large.
+COMPLETED = ExpiringCache(ttl=60, max_size=1000)
+
+# Execution id -> list of queues the waiters for that execution receive its status on.
+_waiters = {}
+_watcher = None
+
+
+def is_completed(execution):
+    return execution.status in COMPLETED_STATES
+
+
+def wait_for_completion(execution):
+    """
+    Block the current green thread until the provided execution reaches a terminal state.
+
+    :param execution: Execution to wait for.
+    :type execution: :class:`ActionExecutionDB`
+
+    :return: Completed execution.
+    :rtype: :class:`ActionExecutionDB`
+    """
+    if is_completed(execution):
+        return execution
+
+    execution_id = str(execution.id)
+    waiter = eventlet_queue.LightQueue()
+    _waiters.setdefault(execution_id, []).append(waiter)
+    try:
+        status = COMPLETED.get(execution_id, execution.status)
+        while status not in COMPLETED_STATES:
+            status = _get_next_status(execution_id, waiter)
+    finally:
+        waiters = _waiters.get(execution_id, [])
+        waiters.remove(waiter)
+        if not waiters:
+            _waiters.pop(execution_id, None)
+    return action_db_util.get_actionexec_by_id(execution_id)
+
+
+def _get_next_status(execution_id, waiter):
+    if not _watcher:
+        eventlet.sleep(POLL_INTERVAL)
+        return action_db_util.get_actionexec_by_id(execution_id).status
+
+    try:
+        return waiter.get(timeout=FALLBACK_POLL_INTERVAL)
+    except eventlet_queue.Empty:
+        LOG.debug('No completion event received for execution %s, polling.', execution_id)
+        return action_db_util.get_actionexec_by_id(execution_id).status
+
+
+def _notify(execution):
+    execution_id = str(execution.id)
+    COMPLETED.set(execution_id, execution.status)
+    for waiter in _waiters.get(execution_id, []):
+        waiter.put(execution.status)
+
+
+class CompletionWatcher(ConsumerMixin):
+    """
+    Wakes up the waiters of an execution when an update which completes it is received.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def get_consumers(self, Consumer, channel):
+        return [Consumer(queues=[actionexecution.get_queue(None, publishers.UPDATE_RK,
+                                                           exclusive=True)],
+                         accept=['pickle'],
+                         callbacks=[self.process])]
+
+    def process(self, body, message):
+        try:
+            if is_completed(body):
+                _notify(body)
+        except:
+            LOG.exception('Failed to process execution update. Message body : %s', body)
+        finally:
+            message.ack()
+
+
+def start_watcher():
+    """
+    Start watching for execution updates in a background green thread.
+    """
+    global _watcher
+    if not _watcher:
+        _watcher = CompletionWatcher(Connection(cfg.CONF.messaging.url))
+        eventlet.spawn_n(_watcher.run)
+    return _watcher
@@ -0,0 +1,249 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+In-process cache of the distinct values of the history filters.
+
+Computing the values requires an aggregation over the whole history collection per filter, so
+they are only computed once and then updated as records are written by the historian (see
+:func:`start_watcher`). The values can be restricted to the records of a recent time window,
+in which case a value is dropped once no record of the window has it. The values are
+recomputed from scratch every once in a while to drop the values of deleted records.
+"""
+
+import datetime
+
+import dateutil.tz
+import eventlet
+from kombu import Connection
+from kombu.mixins import ConsumerMixin
+from oslo.config import cfg
+import six
+
+from st2common import log as logging
+from st2common.persistence.history import ActionExecutionHistory
+from st2common.transport import history as history_transport
+from st2common.transport import publishers
+from st2common.util import isotime
+
+__all__ = [
+    'FiltersCache',
+    'start_watcher'
+]
+
+LOG = logging.getLogger(__name__)
+
+TIMESTAMP_FIELD = 'execution.start_timestamp'
+
+_watcher = None
+
+
+class FiltersCache(object):
+    """
+    Distinct values of history filters.
+    """
+
+    def __init__(self, filters, window=None, refresh_interval=None):
+        """
+        :param filters: Fields of the filters keyed by filter name. Values of a tuple of fields
+                        are joined with dots.
+        :type filters: ``dict``
+
+        :param window: Seconds of history the values are computed for. None means all of it.
+        :type window: ``int``
+
+        :param refresh_interval: Seconds after which the values are recomputed from scratch.
+                                 None means never.
+        :type refresh_interval: ``int``
+        """
+        self.filters = filters
+        self.window = window
+        self.refresh_interval = refresh_interval
+        # Filter name -> {value: time of the most recent record with the value}
+        self._values = None
+        self._computed_at = None
+        self._result = None
+        self._result_expire_at = None
+
+    def get_all(self):
+        """
+        Return the distinct values of every filter.
+
+        :rtype: ``dict``
+        """
+        now = datetime.datetime.utcnow()
+
+        if self._values is None or (self.refresh_interval and
+                                    self._computed_at + datetime.timedelta(
+                                        seconds=self.refresh_interval) <= now):
+            self._compute()
+
+        if self._result is None or (self._result_expire_at and self._result_expire_at <= now):
+            self._build_result(now)
+
+        return self._result
+
+    def add(self, history):
+        """
+        Add the values of a history record which was written.
+
+        :type history: :class:`ActionExecutionHistoryDB`
+        """
+        if self._values is None:
+            # Nothing computed yet, the record is picked up by the computation.
+            return
+
+        timestamp = _parse_timestamp(_get_value(history, TIMESTAMP_FIELD))
+
+        for name, field in six.iteritems(self.filters):
+            value = _get_value(history, field)
+            if not value:
+                continue
+
+            values = self._values.setdefault(name, {})
+            if value not in values:
+                values[value] = timestamp
+                self._result = None
+            elif timestamp and (values[value] is None or values[value] < timestamp):
+                values[value] = timestamp
+
+    def clear(self):
+        self._values = None
+        self._result = None
+
+    def _compute(self):
+        now = datetime.datetime.utcnow()
+        values = {}
+
+        for name, field in six.iteritems(self.filters):
+            pipeline = []
+            if self.window:
+                # Records store the timestamps as ISO 8601 strings, which sort chronologically.
+                since = now - datetime.timedelta(seconds=self.window)
+                pipeline.append({'$match': {TIMESTAMP_FIELD: {
+                    '$gte': isotime.format(since, offset=False)}}})
+            pipeline.append({'$group': {'_id': _get_group_key(field),
+                                        'last_seen': {'$max': '$' + TIMESTAMP_FIELD}}})
+
+            aggregate = ActionExecutionHistory.aggregate(pipeline)
+            values[name] = dict([(res['_id'], _parse_timestamp(res['last_seen']))
+                                 for res in aggregate['result'] if res['_id']])
+
+        self._values = values
+        self._computed_at = now
+        self._result = None
+
+    def _build_result(self, now):
+        result = {}
+        expire_at = None
+
+        for name, values in six.iteritems(self._values):
+            if self.window:
+                since = now - datetime.timedelta(seconds=self.window)
+                for value, last_seen in list(values.items()):
+                    if last_seen and last_seen < since:
+                        del values[value]
+                    elif last_seen and (expire_at is None or last_seen < expire_at):
+                        expire_at = last_seen
+            result[name] = list(values.keys())
+
+        self._result = result
+        self._result_expire_at = (expire_at + datetime.timedelta(seconds=self.window)
+                                  if expire_at else None)
+
+
+class FiltersWatcher(ConsumerMixin):
+    """
+    Adds the values of the history records written by the historian to the caches.
+    """
+
+    def __init__(self, connection, caches):
+        self.connection = connection
+        self.caches = caches
+
+    def get_consumers(self, Consumer, channel):
+        return [Consumer(queues=[history_transport.get_queue(routing_key=publishers.ANY_RK,
+                                                             exclusive=True)],
+                         accept=['pickle'],
+                         callbacks=[self.process_history])]
+
+    def process_history(self, body, message):
+        try:
+            for cache in self.caches:
+                cache.add(body)
+        except:
+            LOG.exception('Failed to add history record to the filters. Message body : %s',
+                          body)
+        finally:
+            message.ack()
+
+
+def start_watcher(*caches):
+    """
+    Start adding the values of written history records to the provided caches in a background
+    green thread.
+    """
+    global _watcher
+    if not _watcher:
+        _watcher = FiltersWatcher(Connection(cfg.CONF.messaging.url), caches)
+        eventlet.spawn_n(_watcher.run)
+    return _watcher
+
+
+def _get_group_key(field):
+    if isinstance(field, six.string_types):
+        return '$' + field
+
+    dot_notation = []
+    for item in field:
+        dot_notation.extend(['$' + item, '.'])
+    dot_notation.pop(-1)
+    return {'$concat': dot_notation}
+
+
+def _get_value(history, field):
+    if not isinstance(field, six.string_types):
+        values = [_get_value(history, item) for item in field]
+        return '.'.join(values) if all(values) else None
+
+    value = history
+    for attr in field.split('.'):
+        if isinstance(value, dict):
+            value = value.get(attr, None)
+        else:
+            value = getattr(value, attr, None)
+        if value is None:
+            return None
+    return value
+
+
+def _parse_timestamp(value):
+    """
+    Return a timestamp of a record as a naive UTC datetime. Records written by the historian
+    store it as an ISO 8601 string.
+    """
+    if not value:
+        return None
+
+    if isinstance(value, six.string_types):
+        try:
+            value = isotime.parse(value)
+        except ValueError:
+            LOG.warn('Invalid timestamp "%s" in history record.', value)
+            return None
+
+    if value.tzinfo:
+        value = value.astimezone(dateutil.tz.tzutc()).replace(tzinfo=None)
+    return value
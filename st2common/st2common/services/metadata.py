@@ -0,0 +1,183 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+In-process cache for action and runner type metadata.
+
+Actions and runner types only change when packs are registered, yet they are looked up for
+every single execution. Entries are invalidated when the models are written through the
+persistence layer of the current process, when CUD events published by other processes are
+received (see :func:`start_watcher`) and, as a last resort, expire after a short time.
+"""
+
+import eventlet
+from kombu import Connection
+from kombu.mixins import ConsumerMixin
+from oslo.config import cfg
+
+from st2common import log as logging
+from st2common.transport import action as action_transport
+from st2common.transport import publishers
+from st2common.util.cache import ExpiringCache
+
+__all__ = [
+    'get_action_by_ref',
+    'get_runnertype_by_name',
+    'get_parameter_schema',
+    'get_parameter_validator',
+    'invalidate_action',
+    'invalidate_runnertype',
+    'clear',
+    'start_watcher'
+]
+
+LOG = logging.getLogger(__name__)
+
+CACHE_TTL = 60
+CACHE_MAX_SIZE = 1000
+
+ACTIONS = ExpiringCache(ttl=CACHE_TTL, max_size=CACHE_MAX_SIZE)
+RUNNER_TYPES = ExpiringCache(ttl=CACHE_TTL, max_size=CACHE_MAX_SIZE)
+
+# Action ref -> (merged parameter schema, validator instance for that schema)
+PARAMETER_SCHEMAS = ExpiringCache(ttl=CACHE_TTL, max_size=CACHE_MAX_SIZE)
+
+_watcher = None
+
+
+def get_action_by_ref(ref):
+    """
+    Return the ActionDB for the provided reference or None if the action doesn't exist.
+
+    :param ref: Action reference.
+    :type ref: ``str``
+
+    :rtype: :class:`ActionDB`
+    """
+    from st2common.util import action_db as action_utils
+    return ACTIONS.get_or_load(ref, action_utils.get_action_by_ref)
+
+
+def get_runnertype_by_name(name):
+    """
+    Return the RunnerTypeDB with the provided name.
+
+    On error, raise StackStormDBObjectNotFoundError.
+
+    :rtype: :class:`RunnerTypeDB`
+    """
+    from st2common.util import action_db as action_utils
+    return RUNNER_TYPES.get_or_load(name, action_utils.get_runnertype_by_name)
+
+
+def get_parameter_schema(action_db):
+    """
+    Return the JSON schema for the parameters of the provided action. The schema combines the
+    runner and the action parameters.
+
+    :rtype: ``dict``
+    """
+    return _get_parameter_schema_entry(action_db)[0]
+
+
+def get_parameter_validator(action_db):
+    """
+    Return a validator instance for the parameters of the provided action. The schema is only
+    checked and compiled the first time it is requested.
+
+    :rtype: :class:`jsonschema.IValidator`
+    """
+    return _get_parameter_schema_entry(action_db)[1]
+
+
+def invalidate_action(ref):
+    ACTIONS.invalidate(ref)
+    PARAMETER_SCHEMAS.invalidate(ref)
+
+
+def invalidate_runnertype(name):
+    RUNNER_TYPES.invalidate(name)
+    # Schemas of all the actions which use this runner are affected.
+    PARAMETER_SCHEMAS.clear()
+
+
+def clear():
+    ACTIONS.clear()
+    RUNNER_TYPES.clear()
+    PARAMETER_SCHEMAS.clear()
+
+
+def _get_parameter_schema_entry(action_db):
+    from st2common.util import schema as util_schema
+
+    ref = action_db.get_reference().ref
+    entry = PARAMETER_SCHEMAS.get(ref)
+
+    if entry is None:
+        schema = util_schema.get_parameter_schema(action_db)
+        validator_cls = util_schema.get_validator()
+        validator_cls.check_schema(schema)
+        entry = PARAMETER_SCHEMAS.set(ref, (schema, validator_cls(schema)))
+
+    return entry
+
+
+class MetadataWatcher(ConsumerMixin):
+    """
+    Invalidates cached metadata when actions and runner types are created, updated or deleted
+    by other processes.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def get_consumers(self, Consumer, channel):
+        return [
+            Consumer(queues=[action_transport.get_action_queue(routing_key=publishers.ANY_RK,
+                                                               exclusive=True)],
+                     accept=['pickle'],
+                     callbacks=[self.process_action]),
+            Consumer(queues=[action_transport.get_runnertype_queue(routing_key=publishers.ANY_RK,
+                                                                   exclusive=True)],
+                     accept=['pickle'],
+                     callbacks=[self.process_runnertype])
+        ]
+
+    def process_action(self, body, message):
+        try:
+            invalidate_action(body.get_reference().ref)
+        except:
+            LOG.exception('Failed to invalidate cached action. Message body : %s', body)
+        finally:
+            message.ack()
+
+    def process_runnertype(self, body, message):
+        try:
+            invalidate_runnertype(body.name)
+        except:
+            LOG.exception('Failed to invalidate cached runner type. Message body : %s', body)
+        finally:
+            message.ack()
+
+
+def start_watcher():
+    """
+    Start watching for action and runner type changes in a background green thread.
+    """
+    global _watcher
+    if not _watcher:
+        _watcher = MetadataWatcher(Connection(cfg.CONF.messaging.url))
+        eventlet.spawn_n(_watcher.run)
+    return _watcher
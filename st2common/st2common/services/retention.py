@@ -0,0 +1,180 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Retention of action executions, execution history records and trigger instances.
+
+Documents older than the configured number of days are deleted in bounded batches so a purge
+never holds a long running operation on the database. Purged documents can be archived to
+gzipped files with one MongoDB extended JSON document per line, which mongoimport can load
+back.
+"""
+
+import datetime
+import gzip
+import os
+
+from bson import json_util
+import eventlet
+from oslo.config import cfg
+
+from st2common import log as logging
+from st2common.persistence.action import ActionExecution
+from st2common.persistence.history import ActionExecutionHistory
+from st2common.persistence.reactor import TriggerInstance
+from st2common.util import isotime
+
+__all__ = [
+    'purge',
+    'purge_expired',
+    'start_purger'
+]
+
+LOG = logging.getLogger(__name__)
+
+_purger = None
+
+
+def get_retention_policies():
+    """
+    Return the (access, timestamp field, status field, days to keep, timestamp formatter)
+    tuples of the purged collections. The formatter converts a datetime to the type the
+    timestamps are stored as, None if they are stored as dates.
+
+    :rtype: ``list``
+    """
+    return [
+        (ActionExecution, 'start_timestamp', 'status', cfg.CONF.retention.executions_ttl, None),
+        (ActionExecutionHistory, 'execution.start_timestamp', 'execution.status',
+         cfg.CONF.retention.history_ttl, _format_history_timestamp),
+        (TriggerInstance, 'occurrence_time', None, cfg.CONF.retention.trigger_instances_ttl,
+         None)
+    ]
+
+
+def _format_history_timestamp(dt):
+    # History records store the timestamps as ISO 8601 strings, which sort chronologically.
+    # MongoDB doesn't compare strings with dates.
+    return isotime.format(dt, offset=False)
+
+
+def purge(access, timestamp_field, older_than, status_field=None, statuses=None,
+          batch_size=1000, archive_dir=None):
+    """
+    Delete the documents older than the provided time.
+
+    :param access: Persistence class of the collection.
+    :type access: :class:`Access`
+
+    :param older_than: Documents whose timestamp is older than this are deleted. Must be of
+                       the type the timestamps are stored as.
+    :type older_than: :class:`datetime.datetime` or ``str``
+
+    :param statuses: If set, only the documents with one of these statuses are deleted.
+    :type statuses: ``list``
+
+    :param archive_dir: If set, deleted documents are archived to a file in this directory.
+    :type archive_dir: ``str``
+
+    :return: Number of deleted documents.
+    :rtype: ``int``
+    """
+    collection = access._get_impl().model._get_collection()
+
+    spec = {timestamp_field: {'$lt': older_than}}
+    if status_field and statuses:
+        spec[status_field] = {'$in': statuses}
+    fields = None if archive_dir else ['_id']
+
+    archive = None
+    deleted = 0
+    try:
+        while True:
+            docs = list(collection.find(spec, fields=fields).limit(batch_size))
+            if not docs:
+                break
+
+            if archive_dir:
+                if not archive:
+                    archive = gzip.open(_get_archive_path(archive_dir, collection.name), 'ab')
+                for doc in docs:
+                    archive.write(json_util.dumps(doc) + '\n')
+                # Documents must be archived before they are deleted.
+                archive.flush()
+
+            collection.remove({'_id': {'$in': [doc['_id'] for doc in docs]}})
+            deleted += len(docs)
+
+            # Let other green threads run between batches.
+            eventlet.sleep(0)
+    finally:
+        if archive:
+            archive.close()
+
+    return deleted
+
+
+def purge_expired():
+    """
+    Purge the expired documents of every collection which has a retention period.
+
+    :return: Number of deleted documents keyed by collection name.
+    :rtype: ``dict``
+    """
+    deleted = {}
+    now = datetime.datetime.utcnow()
+
+    for access, timestamp_field, status_field, ttl, format_timestamp in \
+            get_retention_policies():
+        if not ttl:
+            continue
+
+        older_than = now - datetime.timedelta(days=ttl)
+        if format_timestamp:
+            older_than = format_timestamp(older_than)
+
+        name = access._get_impl().model._get_collection_name()
+        deleted[name] = purge(access, timestamp_field, older_than,
+                              status_field=status_field, statuses=cfg.CONF.retention.statuses,
+                              batch_size=cfg.CONF.retention.batch_size,
+                              archive_dir=cfg.CONF.retention.archive_dir)
+        LOG.info('Purged %s documents older than %s days from %s.', deleted[name], ttl, name)
+
+    return deleted
+
+
+def start_purger():
+    """
+    Periodically purge the expired documents in a background green thread if any collection
+    has a retention period.
+    """
+    global _purger
+    if not _purger and any(policy[3] for policy in get_retention_policies()):
+        _purger = eventlet.spawn(_run_purger, cfg.CONF.retention.purge_interval)
+    return _purger
+
+
+def _run_purger(interval):
+    while True:
+        try:
+            purge_expired()
+        except:
+            LOG.exception('Failed to purge expired documents.')
+        eventlet.sleep(interval)
+
+
+def _get_archive_path(archive_dir, collection_name):
+    timestamp = datetime.datetime.utcnow().strftime('%Y%m%dT%H%M%S')
+    return os.path.join(archive_dir, '%s-%s.jsonl.gz' % (collection_name, timestamp))
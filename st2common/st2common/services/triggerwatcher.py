@@ -130,7 +130,7 @@ class TriggerWatcher(ConsumerMixin):
 
     def _load_triggers_from_db(self):
         for trigger_type in self._trigger_types:
-            for trigger in Trigger.query(type=trigger_type):
+            for trigger in Trigger.stream(type=trigger_type):
                 LOG.debug('Found existing trigger: %s in db.' % trigger)
                 self._handlers[publishers.CREATE_RK](trigger)
 
@@ -13,8 +13,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from st2common.transport import actionexecution, actionexecutionstate, history, publishers, reactor
+from st2common.transport import action, actionexecution, actionexecutionstate, history
+from st2common.transport import publishers, reactor
 
 # TODO(manas) : Exchanges, Queues and RoutingKey design discussion pending.
 
-__all__ = ['actionexecution', 'actionexecutionstate', 'history', 'publishers', 'reactor']
+__all__ = ['action', 'actionexecution', 'actionexecutionstate', 'history', 'publishers', 'reactor']
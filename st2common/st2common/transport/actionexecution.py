@@ -28,5 +28,5 @@ class ActionExecutionPublisher(publishers.CUDPublisher):
         super(ActionExecutionPublisher, self).__init__(url, ACTIONEXECUTION_XCHG)
 
 
-def get_queue(name, routing_key):
-    return Queue(name, ACTIONEXECUTION_XCHG, routing_key=routing_key)
+def get_queue(name, routing_key, exclusive=False):
+    return Queue(name, ACTIONEXECUTION_XCHG, routing_key=routing_key, exclusive=exclusive)
@@ -46,6 +46,22 @@ class PoolPublisher(object):
                     LOG.exception('Connections to rabbitmq cannot be re-established: %s',
                                   e.message, exc_info=False)
 
+    def publish_many(self, payloads, exchange, routing_key=''):
+        """
+        Publish many payloads through a single connection and producer.
+        """
+        with self.pool.acquire(block=True) as connection:
+            with producers[connection].acquire(block=True) as producer:
+                try:
+                    publish = connection.ensure(producer, producer.publish, errback=self.errback,
+                                                max_retries=3)
+                    for payload in payloads:
+                        publish(payload, exchange=exchange, routing_key=routing_key,
+                                serializer='pickle')
+                except Exception as e:
+                    LOG.exception('Connections to rabbitmq cannot be re-established: %s',
+                                  e.message, exc_info=False)
+
 
 class CUDPublisher(object):
     def __init__(self, url, exchange):
@@ -60,3 +76,12 @@ class CUDPublisher(object):
 
     def publish_delete(self, payload):
         self._publisher.publish(payload, self._exchange, DELETE_RK)
+
+    def publish_create_many(self, payloads):
+        self._publisher.publish_many(payloads, self._exchange, CREATE_RK)
+
+    def publish_update_many(self, payloads):
+        self._publisher.publish_many(payloads, self._exchange, UPDATE_RK)
+
+    def publish_delete_many(self, payloads):
+        self._publisher.publish_many(payloads, self._exchange, DELETE_RK)
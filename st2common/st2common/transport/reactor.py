@@ -22,11 +22,17 @@ from st2common.transport import publishers
 
 __all__ = [
     'TriggerCUDPublisher',
+    'TriggerTypeCUDPublisher',
+    'RuleCUDPublisher',
+    'SensorTypeCUDPublisher',
     'TriggerInstancePublisher',
 
     'TriggerDispatcher',
 
     'get_trigger_cud_queue',
+    'get_triggertype_cud_queue',
+    'get_rule_cud_queue',
+    'get_sensortype_cud_queue',
     'get_trigger_instances_queue'
 ]
 
@@ -35,6 +41,15 @@ LOG = logging.getLogger(__name__)
 # Exchange for Trigger CUD events
 TRIGGER_CUD_XCHG = Exchange('st2.trigger', type='topic')
 
+# Exchange for TriggerType CUD events
+TRIGGERTYPE_CUD_XCHG = Exchange('st2.triggertype', type='topic')
+
+# Exchange for Rule CUD events
+RULE_CUD_XCHG = Exchange('st2.rule', type='topic')
+
+# Exchange for SensorType CUD events
+SENSORTYPE_CUD_XCHG = Exchange('st2.sensortype', type='topic')
+
 # Exchange for TriggerInstance events
 TRIGGER_INSTANCES_XCHG = Exchange('st2.trigger_instances_dispatch', type='topic')
 
@@ -48,6 +63,33 @@ class TriggerCUDPublisher(publishers.CUDPublisher):
         super(TriggerCUDPublisher, self).__init__(url, TRIGGER_CUD_XCHG)
 
 
+class TriggerTypeCUDPublisher(publishers.CUDPublisher):
+    """
+    Publisher responsible for publishing TriggerType model CUD events.
+    """
+
+    def __init__(self, url):
+        super(TriggerTypeCUDPublisher, self).__init__(url, TRIGGERTYPE_CUD_XCHG)
+
+
+class RuleCUDPublisher(publishers.CUDPublisher):
+    """
+    Publisher responsible for publishing Rule model CUD events.
+    """
+
+    def __init__(self, url):
+        super(RuleCUDPublisher, self).__init__(url, RULE_CUD_XCHG)
+
+
+class SensorTypeCUDPublisher(publishers.CUDPublisher):
+    """
+    Publisher responsible for publishing SensorType model CUD events.
+    """
+
+    def __init__(self, url):
+        super(SensorTypeCUDPublisher, self).__init__(url, SENSORTYPE_CUD_XCHG)
+
+
 class TriggerInstancePublisher(object):
     def __init__(self, url):
         self._publisher = publishers.PoolPublisher(url=url)
@@ -88,8 +130,20 @@ class TriggerDispatcher(object):
         self._publisher.publish_trigger(payload=payload, routing_key=routing_key)
 
 
-def get_trigger_cud_queue(name, routing_key):
-    return Queue(name, TRIGGER_CUD_XCHG, routing_key=routing_key)
+def get_trigger_cud_queue(name, routing_key, exclusive=False):
+    return Queue(name, TRIGGER_CUD_XCHG, routing_key=routing_key, exclusive=exclusive)
+
+
+def get_triggertype_cud_queue(name=None, routing_key=None, exclusive=False):
+    return Queue(name, TRIGGERTYPE_CUD_XCHG, routing_key=routing_key, exclusive=exclusive)
+
+
+def get_rule_cud_queue(name=None, routing_key=None, exclusive=False):
+    return Queue(name, RULE_CUD_XCHG, routing_key=routing_key, exclusive=exclusive)
+
+
+def get_sensortype_cud_queue(name=None, routing_key=None, exclusive=False):
+    return Queue(name, SENSORTYPE_CUD_XCHG, routing_key=routing_key, exclusive=exclusive)
 
 
 def get_trigger_instances_queue(name, routing_key):
@@ -131,7 +131,8 @@ def update_actionexecution_status(status=None, result=None, end_timestamp=None,
         new_status.
 
         The ActionExecution may be specified using either actionexec_id, or as an
-        actionexec_db instance.
+        actionexec_db instance. When an instance is provided it is not re-read from
+        the database, only the changed attributes are written.
     """
 
     if (actionexec_id is None) and (actionexec_db is None):
@@ -148,14 +149,14 @@ def update_actionexecution_status(status=None, result=None, end_timestamp=None,
 
     LOG.debug('Updating ActionExection: "%s" with status="%s"',
               actionexec_db, status)
-    actionexec_db.status = status
+    updates = {'status': status}
     if result:
-        actionexec_db.result = result
+        updates['result'] = result
 
     if end_timestamp:
-        actionexec_db.end_timestamp = end_timestamp
+        updates['end_timestamp'] = end_timestamp
 
-    actionexec_db = ActionExecution.add_or_update(actionexec_db)
+    actionexec_db = ActionExecution.update(actionexec_db, **updates)
     LOG.debug('Updated status for ActionExecution object: %s', actionexec_db)
     return actionexec_db
 
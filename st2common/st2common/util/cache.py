@@ -0,0 +1,103 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+from collections import OrderedDict
+
+__all__ = [
+    'ExpiringCache'
+]
+
+
+class ExpiringCache(object):
+    """
+    Simple in-process cache with an optional per entry time to live and an optional upper
+    bound on the number of entries. When the cache is full the least recently used entry is
+    evicted.
+    """
+
+    def __init__(self, ttl=None, max_size=None):
+        """
+        :param ttl: Number of seconds after which an entry expires. None means never.
+        :type ttl: ``int``
+
+        :param max_size: Maximum number of entries kept in the cache. None means unbounded.
+        :type max_size: ``int``
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+
+    def get(self, key, default=None):
+        item = self._items.pop(key, None)
+
+        if item is None:
+            self.misses += 1
+            return default
+
+        value, expire_at = item
+        if expire_at is not None and expire_at <= time.time():
+            self.misses += 1
+            return default
+
+        # Re-insert so the entry becomes the most recently used one.
+        self._items[key] = item
+        self.hits += 1
+        return value
+
+    def set(self, key, value):
+        self._items.pop(key, None)
+
+        if self.max_size and len(self._items) >= self.max_size:
+            self._items.popitem(last=False)
+
+        expire_at = (time.time() + self.ttl) if self.ttl else None
+        self._items[key] = (value, expire_at)
+        return value
+
+    def get_or_load(self, key, loader):
+        """
+        Return the cached value for the provided key or call loader to retrieve it. Values for
+        which loader returns None are not cached.
+        """
+        value = self.get(key)
+
+        if value is None:
+            value = loader(key)
+            if value is not None:
+                self.set(key, value)
+
+        return value
+
+    def invalidate(self, key):
+        self._items.pop(key, None)
+
+    def clear(self):
+        self._items.clear()
+
+    def get_stats(self):
+        return {
+            'size': len(self._items),
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __len__(self):
+        return len(self._items)
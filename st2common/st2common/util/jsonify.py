@@ -18,7 +18,9 @@ try:
 except ImportError:
     import json
 
+import datetime
 
+import bson
 from pecan.jsonify import GenericJSON
 import six
 
@@ -27,9 +29,38 @@ __all__ = [
     'json_encode'
 ]
 
+_generic_encoder = GenericJSON()
 
-def json_encode(obj, indent=4):
-    return json.dumps(obj, cls=GenericJSON, indent=indent)
+
+def _default(obj):
+    # The types returned by the API are handled here, anything else goes through the generic
+    # encoder of pecan.
+    json_method = getattr(obj, '__json__', None)
+    if json_method is not None:
+        return json_method()
+    if isinstance(obj, bson.ObjectId):
+        return str(obj)
+    if isinstance(obj, (datetime.date, datetime.datetime)):
+        return str(obj)
+    return _generic_encoder.default(obj)
+
+
+# Compact output is produced by the C encoder when it's available.
+_compact_encoder = json.JSONEncoder(default=_default, separators=(',', ':'))
+
+
+def json_encode(obj, indent=None):
+    """
+    Encode an object, API objects included, as compact JSON unless indent is provided.
+
+    :param indent: Number of spaces the output is indented with.
+    :type indent: ``int``
+
+    :rtype: ``str``
+    """
+    if indent:
+        return json.dumps(obj, default=_default, indent=indent)
+    return _compact_encoder.encode(obj)
 
 
 def load_file(path):
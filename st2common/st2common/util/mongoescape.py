@@ -30,25 +30,51 @@ RULE_CRITERIA_UNESCAPE_TRANSLATION = dict(zip(RULE_CRITERIA_ESCAPED,
                                               RULE_CRITERIA_UNESCAPED))
 
 
+# Both the current and the old rule criteria escape characters are translated back in one pass.
+ALL_UNESCAPE_TRANSLATION = dict(UNESCAPE_TRANSLATION, **RULE_CRITERIA_UNESCAPE_TRANSLATION)
+
+
+def _translate_key(key, translation):
+    if not isinstance(key, six.string_types):
+        return key
+    for t_k, t_v in six.iteritems(translation):
+        if t_k in key:
+            key = key.replace(t_k, t_v)
+    return key
+
+
 def _translate_chars(field, translation):
-    # Only translate the fields of a dict
-    if not isinstance(field, dict):
-        return field
-    work_items = [(k, v, field) for k, v in six.iteritems(field)]
-    while len(work_items) > 0:
-        work_item = work_items.pop(0)
-        oldkey = work_item[0]
-        value = work_item[1]
-        work_field = work_item[2]
-        newkey = oldkey
-        for t_k, t_v in six.iteritems(translation):
-            newkey = newkey.replace(t_k, t_v)
-        if newkey != oldkey:
-            work_field[newkey] = value
-            del work_field[oldkey]
-        if isinstance(value, dict):
-            nested_work_items = [(k, v, value) for k, v in six.iteritems(value)]
-            work_items.extend(nested_work_items)
+    """
+    Translate the keys of the dicts found in field, including the dicts nested in lists.
+
+    The field is not modified. Containers in which nothing needs to be translated are
+    returned as is, the others are shallow copies, so the cost of a field whose keys don't
+    need translation is a single walk over it.
+    """
+    if isinstance(field, dict):
+        changes = []
+        for key, value in six.iteritems(field):
+            new_key = _translate_key(key, translation)
+            new_value = _translate_chars(value, translation)
+            if new_key != key or new_value is not value:
+                changes.append((key, new_key, new_value))
+
+        if not changes:
+            return field
+
+        result = dict(field)
+        for key, new_key, new_value in changes:
+            if new_key != key:
+                del result[key]
+            result[new_key] = new_value
+        return result
+
+    if isinstance(field, (list, tuple)):
+        items = [_translate_chars(item, translation) for item in field]
+        if all(new is old for new, old in zip(items, field)):
+            return field
+        return type(field)(items)
+
     return field
 
 
@@ -57,6 +83,4 @@ def escape_chars(field):
 
 
 def unescape_chars(field):
-    translated = _translate_chars(field, UNESCAPE_TRANSLATION)
-    translated = _translate_chars(field, RULE_CRITERIA_UNESCAPE_TRANSLATION)
-    return translated
+    return _translate_chars(field, ALL_UNESCAPE_TRANSLATION)
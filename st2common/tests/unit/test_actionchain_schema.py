@@ -59,3 +59,17 @@ class ActionChainSchemaTest(unittest2.TestCase):
     def test_actionchain_schema_invalid(self):
         with self.assertRaises(ValidationError):
             actionchain.ActionChain(**MALFORMED_CHAIN)
+
+    def test_actionchain_concurrency_without_parallel(self):
+        chainspec = {'chain': [{'name': 'c1', 'ref': 'wolfpack.a1', 'concurrency': 2}]}
+        self.assertRaises(ValueError, actionchain.ActionChain, **chainspec)
+
+    def test_actionchain_branch_name_conflicts(self):
+        branches = [{'name': 'b1', 'ref': 'wolfpack.a1'}, {'name': 'c2', 'ref': 'wolfpack.a1'}]
+        chainspec = {'chain': [{'name': 'c1', 'parallel': branches, 'on-success': 'c2'},
+                               {'name': 'c2', 'ref': 'wolfpack.a2'}]}
+        self.assertRaises(ValueError, actionchain.ActionChain, **chainspec)
+
+        branches = [{'name': 'b1', 'ref': 'wolfpack.a1'}, {'name': 'b1', 'ref': 'wolfpack.a1'}]
+        chainspec = {'chain': [{'name': 'c1', 'parallel': branches}]}
+        self.assertRaises(ValueError, actionchain.ActionChain, **chainspec)
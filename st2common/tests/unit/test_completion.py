@@ -0,0 +1,77 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import bson
+import eventlet
+import mock
+from unittest2 import TestCase
+
+from st2common.constants.action import (ACTIONEXEC_STATUS_RUNNING, ACTIONEXEC_STATUS_SUCCEEDED)
+from st2common.models.db.action import ActionExecutionDB
+from st2common.services import completion
+from st2common.util import action_db as action_db_util
+
+
+def _get_execution(status, execution_id=None):
+    return ActionExecutionDB(id=execution_id or bson.ObjectId(), action='wolfpack.a1',
+                             status=status)
+
+
+class CompletionTestCase(TestCase):
+
+    def setUp(self):
+        super(CompletionTestCase, self).setUp()
+        completion.COMPLETED.clear()
+
+    @mock.patch.object(action_db_util, 'get_actionexec_by_id', mock.MagicMock())
+    def test_completed_execution_is_returned(self):
+        execution = _get_execution(ACTIONEXEC_STATUS_SUCCEEDED)
+        self.assertTrue(completion.wait_for_completion(execution) is execution)
+        self.assertFalse(action_db_util.get_actionexec_by_id.called)
+
+    @mock.patch('eventlet.sleep', mock.MagicMock())
+    @mock.patch.object(action_db_util, 'get_actionexec_by_id', mock.MagicMock())
+    def test_polling_without_watcher(self):
+        execution = _get_execution(ACTIONEXEC_STATUS_RUNNING)
+        completed = _get_execution(ACTIONEXEC_STATUS_SUCCEEDED, execution.id)
+        action_db_util.get_actionexec_by_id.side_effect = [execution, completed, completed]
+
+        self.assertEqual(completion.wait_for_completion(execution), completed)
+        self.assertEqual(action_db_util.get_actionexec_by_id.call_count, 3)
+
+    @mock.patch.object(completion, '_watcher', mock.MagicMock())
+    @mock.patch.object(action_db_util, 'get_actionexec_by_id', mock.MagicMock())
+    def test_woken_up_by_completion_event(self):
+        execution = _get_execution(ACTIONEXEC_STATUS_RUNNING)
+        completed = _get_execution(ACTIONEXEC_STATUS_SUCCEEDED, execution.id)
+        action_db_util.get_actionexec_by_id.return_value = completed
+        eventlet.spawn_n(completion._notify, completed)
+
+        # The completed execution is only read once it is woken up.
+        self.assertEqual(completion.wait_for_completion(execution), completed)
+        action_db_util.get_actionexec_by_id.assert_called_once_with(str(execution.id))
+        self.assertEqual(completion._waiters, {})
+
+    @mock.patch.object(completion, '_watcher', mock.MagicMock())
+    @mock.patch.object(action_db_util, 'get_actionexec_by_id', mock.MagicMock())
+    def test_completed_before_waiting(self):
+        execution = _get_execution(ACTIONEXEC_STATUS_RUNNING)
+        completed = _get_execution(ACTIONEXEC_STATUS_SUCCEEDED, execution.id)
+        action_db_util.get_actionexec_by_id.return_value = completed
+        completion._notify(completed)
+
+        self.assertEqual(completion.COMPLETED.get(str(execution.id)), ACTIONEXEC_STATUS_SUCCEEDED)
+        self.assertEqual(completion.wait_for_completion(execution), completed)
+        action_db_util.get_actionexec_by_id.assert_called_once_with(str(execution.id))
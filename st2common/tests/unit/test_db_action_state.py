@@ -19,6 +19,23 @@ class ActionExecutionStateTests(DbTestCase):
             retrieved = None
         self.assertIsNone(retrieved, 'managed to retrieve after failure.')
 
+    def test_claim(self):
+        saved = ActionExecutionStateTests._create_save_actionstate()
+        self.assertTrue(ActionExecutionState.claim(saved, 't1', 60))
+        # A state is claimed once, even by the same tracker.
+        self.assertFalse(ActionExecutionState.claim(saved, 't1', 60))
+        self.assertFalse(ActionExecutionState.claim(saved, 't2', 60))
+        self.assertTrue(ActionExecutionState.renew_lease(saved.id, 't1', 60))
+        self.assertFalse(ActionExecutionState.renew_lease(saved.id, 't2', 60))
+
+    def test_claim_expired_lease(self):
+        saved = ActionExecutionStateTests._create_save_actionstate()
+        self.assertTrue(ActionExecutionState.claim(saved, 't1', -1))
+        self.assertFalse(ActionExecutionState.claim(saved, 't1', 60))
+        self.assertTrue(ActionExecutionState.claim(saved, 't2', 60))
+        self.assertEqual(ActionExecutionState.get_by_id(saved.id).claimed_by, 't2')
+        self.assertFalse(ActionExecutionState.renew_lease(saved.id, 't1', 60))
+
     @staticmethod
     def _create_save_actionstate():
         created = ActionExecutionStateDB()
@@ -17,9 +17,14 @@ import copy
 import bson
 import datetime
 
+import mock
+from mongoengine import NotUniqueError
+import unittest2
+
 from st2tests.fixtures import history as fixture
 from st2tests import DbTestCase
 from st2common.util import isotime
+from st2common.models.db.history import ActionExecutionHistoryDB
 from st2common.persistence.history import ActionExecutionHistory
 from st2common.models.api.history import ActionExecutionHistoryAPI
 
@@ -244,3 +249,111 @@ class TestActionExecutionHistoryModel(DbTestCase):
         objs = ActionExecutionHistory.query(execution__start_timestamp=dt_range,
                                             order_by=['-execution__start_timestamp'])
         self.assertLess(objs[9].execution['start_timestamp'], objs[0].execution['start_timestamp'])
+
+    def test_record_after_child(self):
+        execution = copy.deepcopy(self.fake_history_workflow['execution'])
+        child_id = self.fake_history_workflow['children'][0]
+
+        # The child is recorded first, which creates the record of the parent.
+        stub = ActionExecutionHistory.add_child(execution['id'], child_id, publish=False)
+        self.assertNotIn('status', stub.execution)
+
+        attrs = {'action': self.fake_history_workflow['action']}
+        model = ActionExecutionHistory.record(execution, attrs, publish=False)
+        self.assertEqual(model.id, stub.id)
+        self.assertEqual(model.execution['status'], execution['status'])
+        self.assertIn('start_timestamp', model.execution)
+        self.assertDictEqual(model.action, self.fake_history_workflow['action'])
+        self.assertListEqual(model.children, [child_id])
+
+        histories = ActionExecutionHistory.record_many([(execution, attrs)], publish=False)
+        self.assertEqual(histories[execution['id']].execution['status'], execution['status'])
+
+
+@mock.patch.object(ActionExecutionHistory, '_get_publisher', mock.MagicMock(return_value=None))
+class TestActionExecutionHistoryUpsert(unittest2.TestCase):
+
+    @mock.patch.object(ActionExecutionHistory, 'query')
+    def test_lost_upsert_retried_as_update(self, query):
+        history = mock.MagicMock()
+        query.return_value.modify.side_effect = [NotUniqueError(), history]
+        execution = {'id': str(bson.ObjectId()), 'status': 'running'}
+
+        self.assertEqual(ActionExecutionHistory.update_execution(execution, publish=False),
+                         history)
+        _, first = query.return_value.modify.call_args_list[0]
+        _, retry = query.return_value.modify.call_args_list[1]
+        self.assertTrue(first['upsert'])
+        self.assertNotIn('upsert', retry)
+
+    @mock.patch.object(ActionExecutionHistory, 'query')
+    def test_stale_update_once_retried(self, query):
+        query.return_value.modify.side_effect = [NotUniqueError(), None]
+        execution = {'id': str(bson.ObjectId()), 'status': 'running'}
+        self.assertIsNone(ActionExecutionHistory.update_execution(execution, publish=False))
+
+    @mock.patch.object(ActionExecutionHistory, 'query')
+    def test_record_completes_stub(self, query):
+        execution = {'id': str(bson.ObjectId()), 'status': 'running'}
+        stub = mock.MagicMock(execution={'id': execution['id']})
+        history = mock.MagicMock(execution=execution)
+        query.return_value.modify.side_effect = [stub, history]
+
+        self.assertEqual(ActionExecutionHistory.record(execution, {'action': {}}, publish=False),
+                         history)
+        query.assert_called_with(execution__id=execution['id'], execution__status__exists=False)
+        _, kwargs = query.return_value.modify.call_args
+        self.assertDictEqual(kwargs['__raw__'],
+                             {'$set': {'action': {}, 'execution.status': 'running'}})
+
+    @mock.patch.object(ActionExecutionHistory, 'query')
+    def test_record_keeps_updated_snapshot(self, query):
+        execution = {'id': str(bson.ObjectId()), 'status': 'running'}
+        history = mock.MagicMock(execution=dict(execution, status='succeeded'))
+        query.return_value.modify.return_value = history
+
+        self.assertEqual(ActionExecutionHistory.record(execution, {}, publish=False), history)
+        self.assertEqual(query.return_value.modify.call_count, 1)
+
+    @mock.patch.object(ActionExecutionHistory, 'query')
+    def test_add_child_retried(self, query):
+        history = mock.MagicMock()
+        query.return_value.modify.side_effect = [NotUniqueError(), history]
+        self.assertEqual(ActionExecutionHistory.add_child('parent', 'child', publish=False),
+                         history)
+        query.assert_called_with(execution__id='parent')
+
+
+class TestActionExecutionHistoryIndexMigration(unittest2.TestCase):
+
+    def _migrate(self, index, records):
+        collection = mock.MagicMock()
+        collection.index_information.return_value = {'execution.id_1': index}
+        collection.aggregate.return_value = iter([
+            {'_id': 'e1', 'ids': [record['_id'] for record in records], 'count': len(records)}
+        ])
+        collection.find.return_value = records
+        with mock.patch.object(ActionExecutionHistoryDB, '_get_db',
+                               mock.MagicMock(return_value={'action_execution_history_d_b':
+                                                            collection})):
+            with mock.patch.object(ActionExecutionHistoryDB, '_get_collection_name',
+                                   mock.MagicMock(return_value='action_execution_history_d_b')):
+                ActionExecutionHistoryDB.migrate_indexes()
+        return collection
+
+    def test_duplicates_merged_and_index_dropped(self):
+        done = {'_id': bson.ObjectId(), 'execution': {'id': 'e1', 'status': 'succeeded'},
+                'children': ['c1']}
+        running = {'_id': bson.ObjectId(), 'execution': {'id': 'e1', 'status': 'running'},
+                   'children': ['c2']}
+        collection = self._migrate({'key': [('execution.id', 1)]}, [done, running])
+
+        collection.update_one.assert_called_once_with({'_id': done['_id']},
+                                                      {'$set': {'children': ['c1', 'c2']}})
+        collection.delete_many.assert_called_once_with({'_id': {'$in': [running['_id']]}})
+        collection.drop_index.assert_called_once_with('execution.id_1')
+
+    def test_unique_index_not_migrated(self):
+        collection = self._migrate({'key': [('execution.id', 1)], 'unique': True}, [])
+        self.assertFalse(collection.aggregate.called)
+        self.assertFalse(collection.drop_index.called)
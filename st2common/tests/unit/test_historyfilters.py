@@ -0,0 +1,92 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+
+import mock
+from unittest2 import TestCase
+
+from st2common.models.db.history import ActionExecutionHistoryDB
+from st2common.persistence.history import ActionExecutionHistory
+from st2common.services import historyfilters
+from st2common.util import isotime
+
+FILTERS = {
+    'action': ('action.pack', 'action.name'),
+    'user': 'execution.context.user'
+}
+
+
+def get_timestamp(dt):
+    # Format of the timestamps stored in the history records.
+    return isotime.format(dt, offset=False)
+
+
+def get_history(pack, name, user, start_timestamp):
+    return ActionExecutionHistoryDB(
+        action={'pack': pack, 'name': name},
+        execution={'context': {'user': user}, 'start_timestamp': get_timestamp(start_timestamp)})
+
+
+def aggregate(pipeline):
+    group = pipeline[-1]['$group']['_id']
+    now = get_timestamp(datetime.datetime.utcnow())
+    if isinstance(group, dict):
+        return {'result': [{'_id': 'core.local', 'last_seen': now}, {'_id': None}]}
+    return {'result': [{'_id': 'stanley', 'last_seen': now}]}
+
+
+class FiltersCacheTestCase(TestCase):
+
+    @mock.patch.object(ActionExecutionHistory, 'aggregate', mock.MagicMock(side_effect=aggregate))
+    def test_get_all_is_cached(self):
+        cache = historyfilters.FiltersCache(FILTERS)
+        self.assertDictEqual(cache.get_all(), {'action': ['core.local'], 'user': ['stanley']})
+        self.assertDictEqual(cache.get_all(), {'action': ['core.local'], 'user': ['stanley']})
+        self.assertEqual(ActionExecutionHistory.aggregate.call_count, len(FILTERS))
+
+    @mock.patch.object(ActionExecutionHistory, 'aggregate', mock.MagicMock(side_effect=aggregate))
+    def test_add_updates_values(self):
+        cache = historyfilters.FiltersCache(FILTERS)
+        cache.get_all()
+        cache.add(get_history('core', 'remote', 'stanley', datetime.datetime.utcnow()))
+        filters = cache.get_all()
+        self.assertItemsEqual(filters['action'], ['core.local', 'core.remote'])
+        self.assertItemsEqual(filters['user'], ['stanley'])
+        self.assertEqual(ActionExecutionHistory.aggregate.call_count, len(FILTERS))
+
+    @mock.patch.object(ActionExecutionHistory, 'aggregate', mock.MagicMock(side_effect=aggregate))
+    def test_values_out_of_window_are_dropped(self):
+        cache = historyfilters.FiltersCache(FILTERS, window=60)
+        cache.get_all()
+        pipeline = ActionExecutionHistory.aggregate.call_args[0][0]
+        since = pipeline[0]['$match']['execution.start_timestamp']['$gte']
+        self.assertTrue(isotime.validate(since))
+        self.assertTrue(since < get_timestamp(datetime.datetime.utcnow()))
+
+        old = datetime.datetime.utcnow() - datetime.timedelta(seconds=30)
+        cache.add(get_history('core', 'remote', 'tester', old))
+        self.assertItemsEqual(cache.get_all()['user'], ['stanley', 'tester'])
+
+        later = datetime.datetime.utcnow() + datetime.timedelta(seconds=45)
+        with mock.patch('datetime.datetime', mock.MagicMock(utcnow=mock.MagicMock(
+                return_value=later))):
+            self.assertItemsEqual(cache.get_all()['user'], ['stanley'])
+
+    @mock.patch.object(ActionExecutionHistory, 'aggregate', mock.MagicMock(side_effect=aggregate))
+    def test_add_before_compute_is_ignored(self):
+        cache = historyfilters.FiltersCache(FILTERS)
+        cache.add(get_history('core', 'remote', 'stanley', datetime.datetime.utcnow()))
+        self.assertDictEqual(cache.get_all(), {'action': ['core.local'], 'user': ['stanley']})
@@ -1,3 +1,7 @@
+import datetime
+import json
+
+import bson
 import unittest2
 
 import st2common.util.jsonify as jsonify
@@ -34,3 +38,18 @@ class JsonifyTests(unittest2.TestCase):
         d = '{"a": 1, "b": true}'
         expected = {'a': 1, 'b': True}
         self.assertDictEqual(jsonify.try_loads(d), expected)
+
+    def test_json_encode(self):
+        class FakeAPI(object):
+            def __json__(self):
+                return {'id': bson.ObjectId('5497e9b8bd9a5d7c8c5ac6d5'),
+                        'timestamp': datetime.datetime(2014, 12, 25, 0, 0, 0)}
+
+        expected = {'id': '5497e9b8bd9a5d7c8c5ac6d5', 'timestamp': '2014-12-25 00:00:00'}
+        encoded = jsonify.json_encode([FakeAPI()])
+        self.assertNotIn(' ', encoded.replace('2014-12-25 00', ''))
+        self.assertListEqual(json.loads(encoded), [expected])
+
+        encoded = jsonify.json_encode([FakeAPI()], indent=4)
+        self.assertIn('\n    ', encoded)
+        self.assertListEqual(json.loads(encoded), [expected])
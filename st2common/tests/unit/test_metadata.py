@@ -0,0 +1,65 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import jsonschema
+import mock
+from unittest2 import TestCase
+
+from st2common.models.db.action import (ActionDB, RunnerTypeDB)
+from st2common.services import metadata
+from st2common.util import action_db as action_db_util
+
+RUNNER = RunnerTypeDB(name='test-runner', runner_module='test.runner',
+                      runner_parameters={'runnerstr': {'type': 'string'}})
+ACTION = ActionDB(name='a1', pack='wolfpack', entry_point='', runner_type={'name': 'test-runner'},
+                  parameters={'actionint': {'type': 'integer'}})
+
+
+@mock.patch.object(action_db_util, 'get_runnertype_by_name', mock.MagicMock(return_value=RUNNER))
+class MetadataCacheTestCase(TestCase):
+
+    def setUp(self):
+        super(MetadataCacheTestCase, self).setUp()
+        metadata.clear()
+
+    @mock.patch.object(action_db_util, 'get_action_by_ref', mock.MagicMock(return_value=ACTION))
+    def test_get_action_by_ref_is_cached(self):
+        self.assertEqual(metadata.get_action_by_ref('wolfpack.a1'), ACTION)
+        self.assertEqual(metadata.get_action_by_ref('wolfpack.a1'), ACTION)
+        self.assertEqual(action_db_util.get_action_by_ref.call_count, 1)
+
+        metadata.invalidate_action('wolfpack.a1')
+        metadata.get_action_by_ref('wolfpack.a1')
+        self.assertEqual(action_db_util.get_action_by_ref.call_count, 2)
+
+    @mock.patch.object(action_db_util, 'get_action_by_ref', mock.MagicMock(return_value=None))
+    def test_missing_action_is_not_cached(self):
+        self.assertEqual(metadata.get_action_by_ref('wolfpack.a2'), None)
+        self.assertEqual(metadata.get_action_by_ref('wolfpack.a2'), None)
+        self.assertEqual(action_db_util.get_action_by_ref.call_count, 2)
+
+    def test_parameter_schema_merges_runner_and_action_parameters(self):
+        schema = metadata.get_parameter_schema(ACTION)
+        self.assertItemsEqual(schema['properties'].keys(), ['runnerstr', 'actionint'])
+
+    def test_parameter_validator_is_cached(self):
+        validator = metadata.get_parameter_validator(ACTION)
+        self.assertTrue(validator is metadata.get_parameter_validator(ACTION))
+        validator.validate({'runnerstr': 'foo', 'actionint': 1})
+        self.assertRaises(jsonschema.ValidationError, validator.validate, {'actionint': 'foo'})
+
+        # A runner type change invalidates the schemas of all the actions.
+        metadata.invalidate_runnertype('test-runner')
+        self.assertFalse(validator is metadata.get_parameter_validator(ACTION))
@@ -0,0 +1,62 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gzip
+import io
+
+import unittest2
+import webob
+
+from st2common.middleware.compression import GzipMiddleware
+
+
+def _get_app(body, content_type='application/json'):
+    def app(environ, start_response):
+        response = webob.Response(body=body, content_type=content_type)
+        return response(environ, start_response)
+    return GzipMiddleware(app, min_size=10)
+
+
+def _get(app, headers=None):
+    return webob.Request.blank('/', headers=headers or {}).get_response(app)
+
+
+class GzipMiddlewareTestCase(unittest2.TestCase):
+
+    def test_compressed(self):
+        body = '{"a": "%s"}' % ('b' * 100)
+        response = _get(_get_app(body), headers={'Accept-Encoding': 'gzip, deflate'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+        self.assertLess(int(response.headers['Content-Length']), len(body))
+        self.assertEqual(gzip.GzipFile(fileobj=io.BytesIO(response.body)).read(), body)
+
+    def test_not_accepted(self):
+        body = '{"a": "%s"}' % ('b' * 100)
+        response = _get(_get_app(body))
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertEqual(response.body, body)
+
+    def test_small_response(self):
+        response = _get(_get_app('{}'), headers={'Accept-Encoding': 'gzip'})
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertEqual(response.body, '{}')
+
+    def test_event_stream(self):
+        body = 'event: st2.history__create\ndata: {}\n\n' * 10
+        response = _get(_get_app(body, content_type='text/event-stream'),
+                        headers={'Accept-Encoding': 'gzip'})
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertEqual(response.body, body)
@@ -13,13 +13,21 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
 import json
 
+import bson
+import jsonschema
 import mock
 import pecan
 import unittest
 
 from st2common.models.api import base
+from st2common.models.api.action import ActionAPI, ActionExecutionAPI
+from st2common.models.api.reactor import TriggerAPI
+from st2common.models.api.rule import RuleAPI
+from st2common.util import isotime
+from st2common.util import reference
 
 
 class FakeModel(base.BaseAPI):
@@ -178,6 +186,18 @@ class TestModelBase(unittest.TestCase):
         APIModelMock.assert_called_once_with(a='b')
         self.f.assert_called_once_with(self, APIModelMock(), 11, (), {})
 
+    def test_expose_pretty(self):
+        @base.jsexpose()
+        def f(self, *args, **kwargs):
+            self.f(self, args, kwargs)
+            return {'a': 'b'}
+
+        self.assertEqual(f(self), '{"a":"b"}')
+        self.assertEqual(f(self, pretty=''), '{\n    "a": "b"\n}')
+        self.assertEqual(f(self, pretty='false'), '{"a":"b"}')
+        # The query parameter isn't passed to the controller.
+        self.f.assert_called_with(self, (), {})
+
     @mock.patch.object(pecan, 'response', mock.MagicMock(status=200))
     def test_expose_schema_validation_failed(self):
 
@@ -192,3 +212,57 @@ class TestModelBase(unittest.TestCase):
         rtn_val = json.loads(f(self))
         self.assertIn('faultstring', rtn_val)
         self.assertIn("'b' was unexpected", rtn_val['faultstring'])
+
+
+class TestFromDict(unittest.TestCase):
+
+    def setUp(self):
+        super(TestFromDict, self).setUp()
+        self.doc = {
+            '_id': bson.ObjectId(),
+            'action': 'core.local',
+            'status': 'succeeded',
+            'start_timestamp': isotime.add_utc_tz(datetime.datetime(2014, 12, 25, 0, 0, 0)),
+            'parameters': {'cmd': 'uname'},
+            'result': {u'a\uff0eb': {u'\uff04c': 1}}
+        }
+
+    def test_from_dict(self):
+        execution = ActionExecutionAPI.from_dict(self.doc)
+        self.assertEqual(execution.id, str(self.doc['_id']))
+        self.assertEqual(execution.start_timestamp, '2014-12-25T00:00:00.000000Z')
+        self.assertDictEqual(execution.result, {'a.b': {'$c': 1}})
+        self.assertFalse(hasattr(execution, '_id'))
+
+    def test_from_partial_dict(self):
+        doc = dict((k, v) for k, v in self.doc.items() if k in ['_id', 'status'])
+        execution = ActionExecutionAPI.from_partial_dict(doc, include_attributes=['status'])
+        self.assertEqual(execution.id, str(self.doc['_id']))
+        self.assertEqual(execution.status, 'succeeded')
+        self.assertFalse(hasattr(execution, 'action'))
+
+    @mock.patch.object(reference, 'get_model_by_resource_ref', mock.MagicMock())
+    @mock.patch.object(TriggerAPI, 'from_model')
+    def test_from_partial_dict_converted(self, from_model):
+        from_model.return_value = TriggerAPI._from_trusted(
+            id=str(bson.ObjectId()), name='t1', pack='dummy', type='dummy.st2.webhook',
+            parameters={'url': 'foo'})
+        doc = {'_id': bson.ObjectId(), 'trigger': 'dummy.t1'}
+        rule = RuleAPI.from_partial_dict(doc, include_attributes=['trigger'])
+        self.assertDictEqual(rule.trigger, {'pack': 'dummy', 'type': 'dummy.st2.webhook',
+                                            'parameters': {'url': 'foo'}})
+        self.assertFalse(hasattr(rule, 'tags'))
+
+        doc = {'_id': bson.ObjectId(), 'runner_type': {'name': 'run-local'}}
+        action = ActionAPI.from_partial_dict(doc, exclude_attributes=['parameters'])
+        self.assertEqual(action.runner_type, 'run-local')
+
+    def test_from_dict_is_not_validated(self):
+        with mock.patch.object(ActionExecutionAPI, 'get_validator') as get_validator:
+            ActionExecutionAPI.from_dict(self.doc)
+        self.assertFalse(get_validator.called)
+
+    def test_validator_is_cached_per_class(self):
+        self.assertIs(ActionExecutionAPI.get_validator(), ActionExecutionAPI.get_validator())
+        self.assertIsNot(FakeModel.get_validator(), ActionExecutionAPI.get_validator())
+        self.assertRaises(jsonschema.ValidationError, ActionExecutionAPI, status='unknown')
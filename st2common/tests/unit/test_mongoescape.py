@@ -57,3 +57,19 @@ class TestMongoEscape(unittest.TestCase):
 
         result = mongoescape.unescape_chars(escaped)
         self.assertEqual(result, unescaped)
+
+    def test_lists(self):
+        field = {'k1': [{'nk1.': 'v1'}, 'v2', [{'$nk2': 'v3'}]]}
+        escaped = mongoescape.escape_chars(field)
+        self.assertEqual(escaped, {'k1': [{u'nk1\uff0e': 'v1'}, 'v2', [{u'\uff04nk2': 'v3'}]]})
+        unescaped = mongoescape.unescape_chars(escaped)
+        self.assertEqual(unescaped, field)
+
+    def test_field_is_not_modified(self):
+        untouched = {'nk1': ['v1']}
+        field = {'k1.': 'v1', 'k2': untouched}
+        escaped = mongoescape.escape_chars(field)
+        self.assertEqual(field, {'k1.': 'v1', 'k2': {'nk1': ['v1']}})
+        # Values in which nothing is translated are shared with the field.
+        self.assertIs(escaped['k2'], untouched)
+        self.assertIs(mongoescape.escape_chars(untouched), untouched)
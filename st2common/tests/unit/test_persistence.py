@@ -17,9 +17,13 @@ import uuid
 import datetime
 
 import bson
+import mock
 import mongoengine
+import unittest2
+from pymongo.errors import BulkWriteError
 
 from st2tests import DbTestCase
+from st2common.exceptions.db import StackStormDBBulkWriteError
 from st2common.util import isotime
 from st2common.models import db
 from st2common.persistence.base import Access
@@ -196,3 +200,111 @@ class TestPersistence(DbTestCase):
         self.assertLess(objs[0].timestamp, objs[(count / 2) - 1].timestamp)
         self.assertLess(objs[count / 2].timestamp, objs[(count / 2) - 1].timestamp)
         self.assertLess(objs[count / 2].timestamp, objs[count - 1].timestamp)
+
+    def test_stream(self):
+        for i in range(10):
+            category = 'type1' if i % 2 else 'type2'
+            self.access.add_or_update(FakeModelDB(name=uuid.uuid4().hex, index=i,
+                                                  category=category))
+
+        objs = list(self.access.stream(category='type1', order_by=['index'], batch_size=2))
+        self.assertListEqual([obj.index for obj in objs], [1, 3, 5, 7, 9])
+
+        objs = self.access.stream(order_by=['-index'], batch_size=3, no_cursor_timeout=True)
+        self.assertEqual(next(objs).index, 9)
+        # Abandoning the iteration closes the cursor.
+        objs.close()
+        self.assertRaises(StopIteration, next, objs)
+
+    def test_bulk_crud(self):
+        objs = [FakeModelDB(name=uuid.uuid4().hex, context={'a.b': i}) for i in range(10)]
+        added = self.access.bulk_add(objs)
+        self.assertEqual(len(added), 10)
+        self.assertEqual(self.access.count(), 10)
+        self.assertDictEqual(self.access.get(id=objs[3].id).context, {'a.b': 3})
+
+        objs[0].category = 'type1'
+        new_obj = FakeModelDB(name=uuid.uuid4().hex)
+        upserted = self.access.bulk_upsert([objs[0], new_obj])
+        self.assertEqual(len(upserted), 2)
+        self.assertEqual(self.access.count(), 11)
+        self.assertEqual(self.access.get(id=objs[0].id).category, 'type1')
+
+        deleted = self.access.bulk_delete(objs[:5])
+        self.assertEqual(len(deleted), 5)
+        self.assertEqual(self.access.count(), 6)
+
+    def test_bulk_delete_missing(self):
+        obj = self.access.add_or_update(FakeModelDB(name=uuid.uuid4().hex))
+        missing = FakeModelDB(id=bson.ObjectId(), name=uuid.uuid4().hex)
+        with mock.patch.object(FakeModel, '_publish_many') as publish_many:
+            deleted = self.access.bulk_delete([missing, obj])
+        self.assertListEqual(deleted, [obj])
+        publish_many.assert_called_once_with('delete', [obj], True)
+        self.assertEqual(self.access.count(), 0)
+
+    def test_bulk_add_failure(self):
+        existing = self.access.add_or_update(FakeModelDB(name=uuid.uuid4().hex))
+        conflict = FakeModelDB(id=existing.id, name=uuid.uuid4().hex)
+
+        objs = [FakeModelDB(name=uuid.uuid4().hex), conflict, FakeModelDB(name=uuid.uuid4().hex)]
+        with self.assertRaises(StackStormDBBulkWriteError) as cm:
+            self.access.bulk_add(objs, ordered=True)
+        # Nothing is written after the failure of an ordered write.
+        self.assertListEqual(cm.exception.written, objs[:1])
+        self.assertEqual(self.access.count(), 2)
+
+        objs = [FakeModelDB(name=uuid.uuid4().hex), conflict, FakeModelDB(name=uuid.uuid4().hex)]
+        with self.assertRaises(StackStormDBBulkWriteError) as cm:
+            self.access.bulk_add(objs, ordered=False)
+        self.assertListEqual(cm.exception.written, [objs[0], objs[2]])
+        self.assertEqual(self.access.count(), 4)
+
+
+class TestBulkWriteConcernErrors(unittest2.TestCase):
+
+    def setUp(self):
+        super(TestBulkWriteConcernErrors, self).setUp()
+        details = {'writeErrors': [], 'writeConcernErrors': [{'code': 64, 'errmsg': 'wtimeout'}],
+                   'nInserted': 3, 'upserted': []}
+        bulk = mock.Mock()
+        bulk.execute.side_effect = BulkWriteError(details)
+        self.bulk = bulk
+
+    def test_bulk_add_write_concern_error(self):
+        publisher = mock.Mock()
+        objs = [FakeModelDB(name=uuid.uuid4().hex) for _ in range(3)]
+        with mock.patch.object(FakeModel.impl, '_initialize_bulk_op',
+                               mock.Mock(return_value=self.bulk)), \
+                mock.patch.object(FakeModel, '_get_publisher',
+                                  mock.Mock(return_value=publisher)):
+            with self.assertRaises(StackStormDBBulkWriteError) as cm:
+                FakeModel.bulk_add(objs, ordered=True)
+
+        # The documents were written even though the write concern wasn't satisfied.
+        self.assertListEqual(cm.exception.written, objs)
+        self.assertListEqual(cm.exception.errors, [])
+        self.assertEqual(len(cm.exception.write_concern_errors), 1)
+        self.assertIn('write concern: wtimeout', str(cm.exception))
+        publisher.publish_create_many.assert_called_once_with(objs)
+
+
+class TestBulkDelete(unittest2.TestCase):
+
+    def test_missing_instances_not_deleted(self):
+        objs = [FakeModelDB(id=bson.ObjectId(), name=uuid.uuid4().hex) for _ in range(3)]
+        collection = mock.MagicMock()
+        collection.find.return_value = [{'_id': objs[0].id}, {'_id': objs[2].id}]
+        bulk = collection.initialize_ordered_bulk_op.return_value
+        bulk.execute.return_value = {'writeErrors': [], 'nRemoved': 2}
+        publisher = mock.Mock()
+
+        with mock.patch.object(FakeModelDB, '_get_collection',
+                               mock.Mock(return_value=collection)), \
+                mock.patch.object(FakeModel, '_get_publisher',
+                                  mock.Mock(return_value=publisher)):
+            deleted = FakeModel.bulk_delete(objs)
+
+        self.assertListEqual(deleted, [objs[0], objs[2]])
+        self.assertEqual(bulk.find.call_count, 2)
+        publisher.publish_delete_many.assert_called_once_with([objs[0], objs[2]])
@@ -0,0 +1,78 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+from unittest2 import TestCase
+
+from st2common.models.db import profiler
+from st2common.models.db.action import ActionExecutionDB
+
+
+class FakeAccess(object):
+    model = ActionExecutionDB
+
+    @profiler.profiled('get')
+    def get(self, **kwargs):
+        return self.query(**kwargs)
+
+    @profiler.profiled('query')
+    def query(self, **kwargs):
+        return kwargs
+
+
+class ProfilerTestCase(TestCase):
+
+    def setUp(self):
+        super(ProfilerTestCase, self).setUp()
+        profiler.reset()
+        profiler.configure(slow_query_threshold_ms=None)
+
+    def test_histogram_buckets(self):
+        for duration_ms in [0.5, 3, 3, 7000]:
+            profiler.record(ActionExecutionDB, 'get', duration_ms)
+
+        stats = profiler.get_stats()['ActionExecutionDB.get']
+        self.assertEqual(stats['count'], 4)
+        self.assertEqual(stats['max_ms'], 7000)
+        self.assertEqual(stats['buckets']['<=1'], 1)
+        self.assertEqual(stats['buckets']['<=5'], 2)
+        self.assertEqual(stats['buckets']['>5000'], 1)
+
+    def test_round_trips_are_counted_per_unit_of_work(self):
+        with profiler.counter('GET /v1/history') as outer:
+            profiler.record(ActionExecutionDB, 'get', 2)
+            with profiler.counter('execution') as inner:
+                profiler.record(ActionExecutionDB, 'count', 3)
+            profiler.record(ActionExecutionDB, 'get', 4)
+            self.assertIs(profiler.get_counter(), outer)
+
+        self.assertIsNone(profiler.get_counter())
+        self.assertEqual(outer.round_trips, 2)
+        self.assertEqual(outer.duration_ms, 6)
+        self.assertEqual(inner.round_trips, 1)
+
+    def test_nested_operations_are_not_recorded(self):
+        FakeAccess().get(status='running')
+        self.assertListEqual(list(profiler.get_stats().keys()), ['ActionExecutionDB.get'])
+
+    @mock.patch.object(profiler, 'LOG')
+    def test_slow_operations_are_logged(self, log):
+        profiler.configure(slow_query_threshold_ms=100)
+        profiler.record(ActionExecutionDB, 'get', 50, {'status': 'running'})
+        self.assertFalse(log.warning.called)
+
+        profiler.record(ActionExecutionDB, 'get', 150, {'status': 'running'})
+        self.assertTrue(log.warning.called)
+        self.assertIn({'status': 'str'}, log.warning.call_args[0])
@@ -0,0 +1,93 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+import json
+import os
+import shutil
+import tempfile
+
+import mock
+from unittest2 import TestCase
+
+from st2common.models.db import queryaudit
+from st2common.models.db.action import ActionExecutionDB
+
+
+class QueryAuditTestCase(TestCase):
+
+    def setUp(self):
+        super(QueryAuditTestCase, self).setUp()
+        queryaudit.SHAPES.clear()
+        queryaudit.enable()
+
+    def tearDown(self):
+        queryaudit.disable()
+        super(QueryAuditTestCase, self).tearDown()
+
+    def test_values_are_not_part_of_the_shape(self):
+        queryset = mock.MagicMock()
+        queryset.explain.return_value = {'cursor': 'BtreeCursor action_1_start_timestamp_-1'}
+
+        queryaudit.record(ActionExecutionDB, {'action': 'core.local'}, ['-start_timestamp'],
+                          queryset=queryset)
+        queryaudit.record(ActionExecutionDB, {'action': u'core.remote'}, ['-start_timestamp'],
+                          queryset=queryset)
+
+        shapes = queryaudit.get_shapes()
+        self.assertEqual(len(shapes), 1)
+        self.assertEqual(shapes[0]['count'], 2)
+        self.assertDictEqual(shapes[0]['filters'], {'action': 'str'})
+        self.assertFalse(shapes[0]['scan'])
+        # Only the first query of a shape is explained.
+        self.assertEqual(queryset.explain.call_count, 1)
+
+    def test_raw_filters_shape(self):
+        raw = {'$or': [{'claimed_by': None},
+                       {'lease_expiry': {'$lt': datetime.datetime.utcnow()}}]}
+        self.assertDictEqual(queryaudit.get_filters_shape({'__raw__': raw}),
+                             {'__raw__': {'$or': [{'claimed_by': 'NoneType'},
+                                                  {'lease_expiry': {'$lt': 'datetime'}}]}})
+
+    def test_collection_scans_are_flagged(self):
+        queryset = mock.MagicMock()
+        queryset.explain.return_value = {
+            'queryPlanner': {'winningPlan': {'stage': 'SORT',
+                                             'inputStage': {'stage': 'COLLSCAN'}}}}
+        queryaudit.record(ActionExecutionDB, {'status': 'running'}, queryset=queryset)
+        shape = queryaudit.get_shapes()[0]
+        self.assertEqual(shape['plan'], 'SORT <- COLLSCAN')
+        self.assertTrue(shape['scan'])
+
+    def test_report_per_process(self):
+        report_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, report_dir)
+        report_path = os.path.join(report_dir, 'queries.json')
+
+        with mock.patch.object(queryaudit, '_report_path', report_path):
+            queryaudit.record(ActionExecutionDB, {'status': 'running'})
+            queryaudit.write_report()
+            with mock.patch('os.getpid', mock.MagicMock(return_value=1)):
+                queryaudit.write_report()
+
+        self.assertFalse(os.path.exists(report_path))
+        with open('%s.%d' % (report_path, os.getpid())) as report:
+            self.assertEqual(json.load(report)[0]['count'], 1)
+        self.assertTrue(os.path.exists(report_path + '.1'))
+
+    def test_disabled(self):
+        queryaudit.disable()
+        queryaudit.record(ActionExecutionDB, {'status': 'running'})
+        self.assertListEqual(queryaudit.get_shapes(), [])
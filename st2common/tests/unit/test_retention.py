@@ -0,0 +1,124 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+import gzip
+import os
+import shutil
+import tempfile
+
+from bson import json_util
+import mock
+from oslo.config import cfg
+import unittest2
+
+from st2common.models.db.action import ActionExecutionDB
+from st2common.models.db.reactor import TriggerInstanceDB
+from st2common.persistence.action import ActionExecution
+from st2common.persistence.history import ActionExecutionHistory
+from st2common.persistence.reactor import TriggerInstance
+from st2common.services import retention
+from st2common.transport.publishers import PoolPublisher
+from st2common.util import isotime
+from st2tests import DbTestCase
+import st2tests.config as tests_config
+
+
+def _get_history_timestamp(days):
+    # History records store the timestamps as ISO 8601 strings.
+    return isotime.format(datetime.datetime.utcnow() - datetime.timedelta(days=days),
+                          offset=False)
+
+
+@mock.patch.object(PoolPublisher, 'publish', mock.MagicMock())
+class RetentionTest(DbTestCase):
+
+    def setUp(self):
+        super(RetentionTest, self).setUp()
+        self.archive_dir = tempfile.mkdtemp()
+        now = datetime.datetime.utcnow()
+        for days, status in [(10, 'succeeded'), (10, 'running'), (1, 'failed')]:
+            ActionExecution.add_or_update(ActionExecutionDB(
+                action='core.local', status=status,
+                start_timestamp=now - datetime.timedelta(days=days)))
+            TriggerInstance.add_or_update(TriggerInstanceDB(
+                trigger='core.st2.webhook', payload={},
+                occurrence_time=now - datetime.timedelta(days=days)))
+
+    def tearDown(self):
+        shutil.rmtree(self.archive_dir)
+        cfg.CONF.clear_override('history_ttl', group='retention')
+        super(RetentionTest, self).tearDown()
+
+    def test_purge_by_age_and_status(self):
+        older_than = datetime.datetime.utcnow() - datetime.timedelta(days=5)
+        deleted = retention.purge(ActionExecution, 'start_timestamp', older_than,
+                                  status_field='status', statuses=['succeeded', 'failed'],
+                                  batch_size=1)
+        self.assertEqual(deleted, 1)
+        self.assertItemsEqual([execution.status for execution in ActionExecution.get_all()],
+                              ['running', 'failed'])
+
+    def test_purge_with_archive(self):
+        older_than = datetime.datetime.utcnow() - datetime.timedelta(days=5)
+        deleted = retention.purge(TriggerInstance, 'occurrence_time', older_than,
+                                  archive_dir=self.archive_dir)
+        self.assertEqual(deleted, 2)
+        self.assertEqual(len(TriggerInstance.get_all()), 1)
+
+        archives = os.listdir(self.archive_dir)
+        self.assertEqual(len(archives), 1)
+        with gzip.open(os.path.join(self.archive_dir, archives[0])) as archive:
+            docs = [json_util.loads(line) for line in archive]
+        self.assertEqual(len(docs), 2)
+        for doc in docs:
+            self.assertLess(doc['occurrence_time'].replace(tzinfo=None), older_than)
+
+    def test_purge_expired_history(self):
+        collection = ActionExecutionHistory._get_impl().model._get_collection()
+        for days in [10, 1]:
+            collection.insert({'action': {}, 'runner': {},
+                               'execution': {'id': str(days), 'status': 'succeeded',
+                                             'start_timestamp': _get_history_timestamp(days)}})
+        cfg.CONF.set_override('history_ttl', 5, group='retention')
+
+        deleted = retention.purge_expired()
+        self.assertEqual(deleted[collection.name], 1)
+        self.assertEqual([history.execution['id'] for history in ActionExecutionHistory.get_all()],
+                         ['1'])
+
+
+class RetentionPoliciesTest(unittest2.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        tests_config.parse_args()
+
+    def tearDown(self):
+        cfg.CONF.clear_override('history_ttl', group='retention')
+
+    @mock.patch.object(retention, 'purge', mock.MagicMock(return_value=0))
+    def test_history_cutoff_matches_stored_timestamps(self):
+        cfg.CONF.set_override('history_ttl', 5, group='retention')
+        with mock.patch.object(ActionExecutionHistory, '_get_impl'):
+            retention.purge_expired()
+
+        (access, timestamp_field, older_than), _ = retention.purge.call_args
+        self.assertEqual(access, ActionExecutionHistory)
+        self.assertEqual(timestamp_field, 'execution.start_timestamp')
+        # The cutoff is compared with the stored strings, which MongoDB compares as strings.
+        self.assertIsInstance(older_than, basestring)
+        self.assertLess(_get_history_timestamp(10), older_than)
+        self.assertGreater(_get_history_timestamp(1), older_than)
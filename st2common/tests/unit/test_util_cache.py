@@ -0,0 +1,71 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+
+from st2common.util.cache import ExpiringCache
+from unittest2 import TestCase
+
+
+class ExpiringCacheTestCase(TestCase):
+
+    def test_get_and_set(self):
+        cache = ExpiringCache()
+        self.assertEqual(cache.get('a'), None)
+        cache.set('a', 1)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get_stats(), {'size': 1, 'hits': 1, 'misses': 1})
+
+    @mock.patch('time.time', mock.MagicMock(return_value=100))
+    def test_expiry(self):
+        cache = ExpiringCache(ttl=10)
+        cache.set('a', 1)
+        self.assertEqual(cache.get('a'), 1)
+        with mock.patch('time.time', mock.MagicMock(return_value=111)):
+            self.assertEqual(cache.get('a'), None)
+        self.assertFalse('a' in cache)
+
+    def test_max_size_evicts_least_recently_used(self):
+        cache = ExpiringCache(max_size=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertTrue('a' in cache)
+        self.assertFalse('b' in cache)
+        self.assertTrue('c' in cache)
+        self.assertEqual(len(cache), 2)
+
+    def test_get_or_load(self):
+        cache = ExpiringCache()
+        loader = mock.MagicMock(return_value='value')
+        self.assertEqual(cache.get_or_load('a', loader), 'value')
+        self.assertEqual(cache.get_or_load('a', loader), 'value')
+        self.assertEqual(loader.call_count, 1)
+
+        # None is never cached.
+        loader = mock.MagicMock(return_value=None)
+        cache.get_or_load('b', loader)
+        cache.get_or_load('b', loader)
+        self.assertEqual(loader.call_count, 2)
+
+    def test_invalidate(self):
+        cache = ExpiringCache()
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.invalidate('a')
+        self.assertFalse('a' in cache)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
@@ -7,6 +7,7 @@ from oslo.config import cfg
 from st2common import log as logging
 from st2common.models.db import db_setup
 from st2common.models.db import db_teardown
+from st2common.services import metadata
 from st2common.constants.logging import DEFAULT_LOGGING_CONF_PATH
 from st2reactor.rules import config
 from st2reactor.rules import worker
@@ -33,6 +34,9 @@ def _setup():
     db_setup(cfg.CONF.database.db_name, cfg.CONF.database.host, cfg.CONF.database.port,
              username=username, password=password)
 
+    # 4. keep cached action and runner type metadata up to date.
+    metadata.start_watcher()
+
 
 def _teardown():
     db_teardown()
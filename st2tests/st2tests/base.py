@@ -26,6 +26,7 @@ import st2common.models.db.action as action_model
 import st2common.models.db.datastore as datastore_model
 import st2common.models.db.actionrunner as actionrunner_model
 import st2common.models.db.history as history_model
+from st2common.services import metadata
 
 __all__ = [
     'EventletTestCase',
@@ -102,6 +103,9 @@ class BaseDbTestCase(TestCase):
         for model in ALL_MODELS:
             model.drop_collection()
 
+        # Cached metadata refers to objects which no longer exist.
+        metadata.clear()
+
 
 class DbTestCase(BaseDbTestCase):
     """
@@ -51,6 +51,7 @@ def _register_config_opts():
     _register_auth_opts()
     _register_action_sensor_opts()
     _register_workflow_opts()
+    _register_mistral_opts()
 
 
 def _override_db_opts():
@@ -74,7 +75,22 @@ def _register_api_opts():
         cfg.ListOpt('allow_origin', default=['http://localhost:3000', 'http://dev'],
                     help='List of origins allowed'),
         cfg.IntOpt('heartbeat', default=25,
-                   help='Send empty message every N seconds to keep connection open')
+                   help='Send empty message every N seconds to keep connection open'),
+        cfg.IntOpt('history_filters_window', default=0,
+                   help='Seconds of history the values of the history filters are listed for. 0 '
+                        'lists the values of the whole history.'),
+        cfg.IntOpt('history_filters_refresh_interval', default=3600,
+                   help='Seconds after which the values of the history filters are recomputed '
+                        'from scratch.'),
+        cfg.BoolOpt('gzip', default=True,
+                    help='Compress the responses with gzip for the clients which accept it.'),
+        cfg.IntOpt('gzip_min_size', default=1024,
+                   help='Responses smaller than this number of bytes aren\'t compressed.'),
+        cfg.IntOpt('response_cache_size', default=100,
+                   help='Number of GET responses cached per content resource (actions, runner '
+                        'types, sensor types, trigger types and rules). 0 disables the cache.'),
+        cfg.IntOpt('response_cache_ttl', default=600,
+                   help='Seconds after which a cached response expires. 0 means never.')
     ]
     _register_opts(api_opts, group='api')
 
@@ -150,5 +166,13 @@ def _register_workflow_opts():
     _register_opts(workflow_opts, group='workflow')
 
 
+def _register_mistral_opts():
+    mistral_opts = [
+        cfg.StrOpt('v2_base_url', default='http://localhost:8989/v2/',
+                   help='Mistral v2 API server root endpoint.')
+    ]
+    _register_opts(mistral_opts, group='mistral')
+
+
 def _register_opts(opts, group=None):
     CONF.register_opts(opts, group)
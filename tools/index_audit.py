@@ -0,0 +1,61 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A utility script which merges the query shape reports written by the services when
+database.query_audit is enabled, e.g. ``index_audit.py /tmp/st2-queries.json.*`` since each
+process writes to database.query_audit_file suffixed with its pid, and lists the shapes, most
+frequent first. Shapes which scan
+their collection are flagged since they likely need an index.
+"""
+
+import argparse
+import json
+
+
+def merge_reports(paths):
+    shapes = {}
+    for path in paths:
+        with open(path, 'r') as fd:
+            for shape in json.load(fd):
+                key = json.dumps([shape['model'], shape['filters'], shape['order_by']],
+                                 sort_keys=True)
+                if key in shapes:
+                    shapes[key]['count'] += shape['count']
+                else:
+                    shapes[key] = shape
+    return sorted(shapes.values(), key=lambda shape: shape['count'], reverse=True)
+
+
+def main(paths, scans_only=False):
+    for shape in merge_reports(paths):
+        if scans_only and not shape['scan']:
+            continue
+        print('%s%8d  %s  filters=%s  order_by=%s' % ('SCAN ' if shape['scan'] else '     ',
+                                                      shape['count'], shape['model'],
+                                                      json.dumps(shape['filters'],
+                                                                 sort_keys=True),
+                                                      shape['order_by']))
+        print('               plan: %s' % shape['plan'])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Index audit')
+    parser.add_argument('reports', nargs='+',
+                        help='Query shape reports written by the services')
+    parser.add_argument('--scans-only', action='store_true',
+                        help='Only list the shapes which scan their collection')
+    args = parser.parse_args()
+    main(args.reports, scans_only=args.scans_only)
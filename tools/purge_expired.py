@@ -0,0 +1,42 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A utility script which purges the expired action executions, execution history records and
+trigger instances once, according to the retention section of the config file.
+"""
+
+from oslo.config import cfg
+
+from st2common import config
+from st2common.models.db import db_setup, db_teardown
+from st2common.services import retention
+
+
+def main():
+    username = cfg.CONF.database.username if hasattr(cfg.CONF.database, 'username') else None
+    password = cfg.CONF.database.password if hasattr(cfg.CONF.database, 'password') else None
+    db_setup(cfg.CONF.database.db_name, cfg.CONF.database.host, cfg.CONF.database.port,
+             username=username, password=password)
+    try:
+        for name, count in retention.purge_expired().items():
+            print('Purged %s documents from %s.' % (count, name))
+    finally:
+        db_teardown()
+
+
+if __name__ == '__main__':
+    config.parse_args()
+    main()